@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Compares concurrent Gemini calls made through the sync client in threads
+(asyncio.to_thread) with calls made through the async client (client.aio).
+
+For each mode it reports the wall time of the calls and how long other work
+waits for a default-executor thread meanwhile, which is what icon searches
+and file reads run on.
+
+Usage:
+  GOOGLE_API_KEY=... python3 scripts/benchmark_google_concurrency.py
+  python3 scripts/benchmark_google_concurrency.py --simulate 2.0
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Awaitable, Callable, List
+
+PROMPT = "Write one sentence about presentations."
+
+
+def get_google_calls(model: str) -> dict:
+    from google import genai
+
+    client = genai.Client()
+
+    async def thread_call():
+        await asyncio.to_thread(
+            client.models.generate_content, model=model, contents=PROMPT
+        )
+
+    async def async_call():
+        await client.aio.models.generate_content(model=model, contents=PROMPT)
+
+    return {"thread": thread_call, "async": async_call}
+
+
+def get_simulated_calls(latency: float) -> dict:
+    async def thread_call():
+        await asyncio.to_thread(time.sleep, latency)
+
+    async def async_call():
+        await asyncio.sleep(latency)
+
+    return {"thread": thread_call, "async": async_call}
+
+
+async def probe_executor(latencies: List[float], stop: asyncio.Event):
+    while not stop.is_set():
+        started_at = time.perf_counter()
+        await asyncio.to_thread(lambda: None)
+        latencies.append(time.perf_counter() - started_at)
+        await asyncio.sleep(0.05)
+
+
+async def run(call: Callable[[], Awaitable[None]], concurrency: int) -> dict:
+    latencies = []
+    stop = asyncio.Event()
+    probe = asyncio.create_task(probe_executor(latencies, stop))
+
+    started_at = time.perf_counter()
+    results = await asyncio.gather(
+        *[call() for _ in range(concurrency)], return_exceptions=True
+    )
+    wall_time = time.perf_counter() - started_at
+
+    stop.set()
+    await probe
+    return {
+        "wall_time": wall_time,
+        "errors": sum(isinstance(result, Exception) for result in results),
+        "executor_wait_p50": statistics.median(latencies) if latencies else 0,
+        "executor_wait_max": max(latencies, default=0),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--concurrency", type=int, default=40)
+    parser.add_argument("--model", default="gemini-2.5-flash")
+    parser.add_argument(
+        "--simulate",
+        type=float,
+        metavar="SECONDS",
+        help="Replace API calls with sleeps of this length",
+    )
+    args = parser.parse_args()
+
+    if args.simulate is not None:
+        calls = get_simulated_calls(args.simulate)
+    else:
+        calls = get_google_calls(args.model)
+
+    for mode, call in calls.items():
+        result = asyncio.run(run(call, args.concurrency))
+        print(
+            f"{mode:>6}: {args.concurrency} calls in {result['wall_time']:.2f}s, "
+            f"{result['errors']} errors, executor wait "
+            f"p50 {result['executor_wait_p50'] * 1000:.1f}ms "
+            f"max {result['executor_wait_max'] * 1000:.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
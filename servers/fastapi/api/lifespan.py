@@ -4,6 +4,8 @@ import os
 from fastapi import FastAPI
 
 from services.database import create_db_and_tables
+from services.http_client import HTTP_CLIENT
+from services.presentation_generation_queue import PRESENTATION_GENERATION_QUEUE
 from utils.get_env import get_app_data_directory_env
 from utils.model_availability import (
     check_llm_and_image_provider_api_or_model_availability,
@@ -14,10 +16,15 @@ from utils.model_availability import (
 async def app_lifespan(_: FastAPI):
     """
     Lifespan context manager for FastAPI application.
-    Initializes the application data directory and checks LLM model availability.
+    Initializes the application data directory, opens the shared HTTP client,
+    checks LLM model availability and runs the presentation generation workers.
 
     """
     os.makedirs(get_app_data_directory_env(), exist_ok=True)
     await create_db_and_tables()
+    await HTTP_CLIENT.start()
     await check_llm_and_image_provider_api_or_model_availability()
+    await PRESENTATION_GENERATION_QUEUE.start()
     yield
+    await PRESENTATION_GENERATION_QUEUE.stop()
+    await HTTP_CLIENT.close()
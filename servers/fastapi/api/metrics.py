@@ -0,0 +1,16 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from services.llm_metrics import LLM_METRICS
+from services.llm_response_cache import LLM_RESPONSE_CACHE
+
+METRICS_ROUTER = APIRouter(tags=["Metrics"])
+
+
+@METRICS_ROUTER.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """LLM call and response cache metrics in Prometheus text format."""
+    return PlainTextResponse(
+        LLM_METRICS.render() + LLM_RESPONSE_CACHE.render(),
+        media_type="text/plain; version=0.0.4",
+    )
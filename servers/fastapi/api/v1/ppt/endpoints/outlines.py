@@ -3,7 +3,6 @@ import json
 import math
 import traceback
 import uuid
-import dirtyjson
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -19,6 +18,7 @@ from models.sse_response import (
 from services.temp_file_service import TEMP_FILE_SERVICE
 from services.database import get_async_session
 from services.documents_loader import DocumentsLoader
+from utils.incremental_json_parser import IncrementalJsonParser
 from utils.llm_calls.generate_presentation_outlines import generate_ppt_outline
 from utils.ppt_utils import get_presentation_title_from_outlines
 
@@ -49,7 +49,7 @@ async def stream_outlines(
             if documents:
                 additional_context = "\n\n".join(documents)
 
-        presentation_outlines_text = ""
+        outlines_parser = IncrementalJsonParser(PresentationOutlineModel)
 
         n_slides_to_generate = presentation.n_slides
         if presentation.include_table_of_contents:
@@ -81,12 +81,10 @@ async def stream_outlines(
                 data=json.dumps({"type": "chunk", "chunk": chunk}),
             ).to_string()
 
-            presentation_outlines_text += chunk
+            outlines_parser.feed(chunk)
 
         try:
-            presentation_outlines_json = dict(
-                dirtyjson.loads(presentation_outlines_text)
-            )
+            presentation_outlines: PresentationOutlineModel = outlines_parser.get_result()
         except Exception as e:
             traceback.print_exc()
             yield SSEErrorResponse(
@@ -94,8 +92,6 @@ async def stream_outlines(
             ).to_string()
             return
 
-        presentation_outlines = PresentationOutlineModel(**presentation_outlines_json)
-
         presentation_outlines.slides = presentation_outlines.slides[
             :n_slides_to_generate
         ]
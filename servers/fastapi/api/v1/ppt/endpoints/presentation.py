@@ -1,23 +1,31 @@
-import asyncio
 from datetime import datetime
 import json
 import math
 import os
 import random
 import traceback
+from functools import partial
 from typing import Annotated, List, Literal, Optional, Tuple
-import dirtyjson
-from fastapi import APIRouter, BackgroundTasks, Body, Depends, HTTPException, Path
+from fastapi import APIRouter, Body, Depends, HTTPException, Path
 from fastapi.responses import StreamingResponse
 from sqlalchemy import delete
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
 from constants.presentation import DEFAULT_TEMPLATES
+from enums.llm_request_priority import LLMRequestPriority
 from enums.webhook_event import WebhookEvent
 from models.api_error_model import APIErrorModel
 from models.generate_presentation_request import GeneratePresentationRequest
+from models.presentation_generation_batch import (
+    GeneratePresentationBatchRequest,
+    PresentationGenerationBatchStatus,
+)
 from models.presentation_and_path import PresentationPathAndEditPath
 from models.presentation_from_template import EditPresentationRequest
+from models.presentation_generation_event import PresentationGenerationEvent
+from models.presentation_generation_task_status import (
+    PresentationGenerationTaskStatus,
+)
 from models.presentation_outline_model import (
     PresentationOutlineModel,
     SlideOutlineModel,
@@ -38,13 +46,25 @@ from utils.get_layout_by_name import get_layout_by_name
 from services.image_generation_service import ImageGenerationService
 from utils.dict_utils import deep_update
 from utils.export_utils import export_presentation
-from utils.llm_calls.generate_presentation_outlines import generate_ppt_outline
+from utils.llm_calls.generate_presentation_outlines import (
+    generate_ppt_outline_partial,
+)
+from models.sql.image_asset import ImageAsset
 from models.sql.slide import SlideModel
 from models.sse_response import SSECompleteResponse, SSEErrorResponse, SSEResponse
 
 from services.database import get_async_session
 from services.temp_file_service import TEMP_FILE_SERVICE
 from services.concurrent_service import CONCURRENT_SERVICE
+from services.llm_batch_service import is_llm_batch_api_supported
+from services.slide_generation_pipeline import SlideGenerationPipeline
+from services.presentation_generation_budget import PresentationGenerationBudget
+from services.llm_request_scheduler import llm_request_priority
+from services.presentation_generation_checkpoint import (
+    PresentationGenerationCheckpoint,
+)
+from services.presentation_generation_events import PRESENTATION_GENERATION_EVENTS
+from services.presentation_generation_queue import PRESENTATION_GENERATION_QUEUE
 from models.sql.presentation import PresentationModel
 from services.pptx_presentation_creator import PptxPresentationCreator
 from models.sql.async_presentation_generation_status import (
@@ -54,17 +74,11 @@ from utils.asset_directory_utils import get_exports_directory, get_images_direct
 from utils.llm_calls.generate_presentation_structure import (
     generate_presentation_structure,
 )
-from utils.llm_calls.generate_slide_content import (
-    get_slide_content_from_type_and_outline,
-)
 from utils.ppt_utils import (
     get_presentation_title_from_outlines,
     select_toc_or_list_slide_layout_index,
 )
-from utils.process_slides import (
-    process_slide_add_placeholder_assets,
-    process_slide_and_fetch_assets,
-)
+from utils.process_slides import process_slide_add_placeholder_assets
 import uuid
 
 
@@ -257,7 +271,9 @@ async def prepare_presentation(
 
 @PRESENTATION_ROUTER.get("/stream/{id}", response_model=PresentationWithSlides)
 async def stream_presentation(
-    id: uuid.UUID, sql_session: AsyncSession = Depends(get_async_session)
+    id: uuid.UUID,
+    use_cache: bool = True,
+    sql_session: AsyncSession = Depends(get_async_session),
 ):
     presentation = await sql_session.get(PresentationModel, id)
     if not presentation:
@@ -280,62 +296,68 @@ async def stream_presentation(
         layout = presentation.get_layout()
         outline = presentation.get_presentation_outline()
 
-        # These tasks will be gathered and awaited after all slides are generated
-        async_assets_generation_tasks = []
+        slide_layouts = [layout.slides[idx] for idx in structure.slides]
+
+        pipeline = SlideGenerationPipeline(
+            id,
+            layout,
+            image_generation_service,
+            presentation.language,
+            presentation.tone,
+            presentation.verbosity,
+            presentation.instructions,
+            use_cache=use_cache,
+        )
 
         slides: List[SlideModel] = []
-        yield SSEResponse(
-            event="response",
-            data=json.dumps({"type": "chunk", "chunk": '{ "slides": [ '}),
-        ).to_string()
-        for i, slide_layout_index in enumerate(structure.slides):
-            slide_layout = layout.slides[slide_layout_index]
+        # Assets still being fetched are not saved unless the stream completes
+        assets_fetched = False
+        try:
+            yield SSEResponse(
+                event="response",
+                data=json.dumps({"type": "chunk", "chunk": '{ "slides": [ '}),
+            ).to_string()
 
+            # Slide contents are generated concurrently but emitted in slide
+            # order, the pipeline limits how many generations are in flight
+            slide_contents = pipeline.iterate_slide_contents(
+                slide_layouts, outline.slides
+            )
             try:
-                slide_content = await get_slide_content_from_type_and_outline(
-                    slide_layout,
-                    outline.slides[i],
-                    presentation.language,
-                    presentation.tone,
-                    presentation.verbosity,
-                    presentation.instructions,
-                )
+                i = 0
+                async for slide_content in slide_contents:
+                    slide = pipeline.build_slide(i, slide_layouts[i], slide_content)
+                    slides.append(slide)
+                    i += 1
+
+                    # This will mutate slide and add placeholder assets
+                    process_slide_add_placeholder_assets(slide)
+
+                    # Starts fetching assets right away, this will mutate slide
+                    pipeline.fetch_assets(slide)
+
+                    yield SSEResponse(
+                        event="response",
+                        data=json.dumps(
+                            {"type": "chunk", "chunk": slide.model_dump_json()}
+                        ),
+                    ).to_string()
             except HTTPException as e:
                 yield SSEErrorResponse(detail=e.detail).to_string()
                 return
-
-            slide = SlideModel(
-                presentation=id,
-                layout_group=layout.name,
-                layout=slide_layout.id,
-                index=i,
-                speaker_note=slide_content.get("__speaker_note__", ""),
-                content=slide_content,
-            )
-            slides.append(slide)
-
-            # This will mutate slide and add placeholder assets
-            process_slide_add_placeholder_assets(slide)
-
-            # This will mutate slide
-            async_assets_generation_tasks.append(
-                process_slide_and_fetch_assets(image_generation_service, slide)
-            )
+            finally:
+                await slide_contents.aclose()
 
             yield SSEResponse(
                 event="response",
-                data=json.dumps({"type": "chunk", "chunk": slide.model_dump_json()}),
+                data=json.dumps({"type": "chunk", "chunk": " ] }"}),
             ).to_string()
 
-        yield SSEResponse(
-            event="response",
-            data=json.dumps({"type": "chunk", "chunk": " ] }"}),
-        ).to_string()
-
-        generated_assets_lists = await asyncio.gather(*async_assets_generation_tasks)
-        generated_assets = []
-        for assets_list in generated_assets_lists:
-            generated_assets.extend(assets_list)
+            generated_assets = await pipeline.wait_for_assets()
+            assets_fetched = True
+        finally:
+            if not assets_fetched:
+                pipeline.cancel()
 
         # Moved this here to make sure new slides are generated before deleting the old ones
         await sql_session.execute(
@@ -465,6 +487,13 @@ async def check_if_api_request_is_valid(
             detail="Number of slides must be greater than 0",
         )
 
+    # Making sure provider supports batch API
+    if request.use_batch_api and not is_llm_batch_api_supported():
+        raise HTTPException(
+            status_code=400,
+            detail="Batch API is only supported with OpenAI and Anthropic",
+        )
+
     # Checking if template is valid
     if request.template not in DEFAULT_TEMPLATES:
         request.template = request.template.lower()
@@ -487,28 +516,81 @@ async def check_if_api_request_is_valid(
     return (presentation_id,)
 
 
+async def update_async_status(
+    sql_session: AsyncSession,
+    async_status: Optional[AsyncPresentationGenerationTaskModel],
+    message: str,
+):
+    """Writes and publishes the stage of the task, when it is a new stage."""
+    if not async_status or async_status.message == message:
+        return
+    async_status.message = message
+    async_status.updated_at = datetime.now()
+    sql_session.add(async_status)
+    await sql_session.commit()
+    PRESENTATION_GENERATION_EVENTS.publish_status(async_status)
+
+
 async def generate_presentation_handler(
     request: GeneratePresentationRequest,
     presentation_id: uuid.UUID,
     async_status: Optional[AsyncPresentationGenerationTaskModel],
     sql_session: AsyncSession = Depends(get_async_session),
+    budget: Optional[PresentationGenerationBudget] = None,
 ):
+    pipeline = None
+    checkpoint = None
+    # Presentations of a batch share one budget for their LLM and asset calls
+    budget = budget or PresentationGenerationBudget()
+
+    def publish_event(event: PresentationGenerationEvent):
+        if async_status:
+            PRESENTATION_GENERATION_EVENTS.publish(async_status.id, event)
+
     try:
+        # Completed stages of a retried or resumed task are reused
+        checkpoint = (
+            PresentationGenerationCheckpoint.from_task(async_status)
+            if async_status
+            else None
+        )
         using_slides_markdown = False
 
         if request.slides_markdown:
             using_slides_markdown = True
             request.n_slides = len(request.slides_markdown)
 
-        if not using_slides_markdown:
+        # Parse Layouts
+        layout_model = await get_layout_by_name(request.template)
+        total_slide_layouts = len(layout_model.slides)
+
+        pipeline = SlideGenerationPipeline(
+            presentation_id,
+            layout_model,
+            ImageGenerationService(get_images_directory()),
+            request.language,
+            request.tone.value,
+            request.verbosity.value,
+            request.instructions,
+            budget=budget,
+            checkpoint=checkpoint,
+            use_cache=request.use_cache,
+            use_batch_api=request.use_batch_api,
+            on_event=publish_event,
+        )
+
+        saved_outlines = checkpoint and checkpoint.get_outlines()
+        if saved_outlines:
+            presentation_outlines, total_outlines = saved_outlines
+
+        elif not using_slides_markdown:
+            if checkpoint:
+                checkpoint.discard_slides()
             additional_context = ""
 
-            # Updating async status
-            if async_status:
-                async_status.message = "Generating presentation outlines"
-                async_status.updated_at = datetime.now()
-                sql_session.add(async_status)
-                await sql_session.commit()
+            await update_async_status(
+                sql_session, async_status, "Generating presentation outlines"
+            )
 
             if request.files:
                 documents_loader = DocumentsLoader(file_paths=request.files)
@@ -532,38 +614,63 @@ async def generate_presentation_handler(
                     (request.n_slides - needed_toc_count) / 10
                 )
 
-            presentation_outlines_text = ""
-            async for chunk in generate_ppt_outline(
-                request.content,
-                n_slides_to_generate,
-                request.language,
-                additional_context,
-                request.tone.value,
-                request.verbosity.value,
-                request.instructions,
-                request.include_title_slide,
-                request.web_search,
-            ):
-
-                if isinstance(chunk, HTTPException):
-                    raise chunk
+            # With ordered layouts and no table of contents, layout of a slide is
+            # known as soon as its outline is, so slides are generated while the
+            # remaining outlines are still streaming
+            streamed_layout_indices = []
+            streamed_indices: List[int] = []
+            streamed_outlines: List[SlideOutlineModel] = []
+            if layout_model.ordered and not request.include_table_of_contents:
+                ordered_structure = layout_model.to_presentation_structure()
+                streamed_layout_indices = ordered_structure.slides[
+                    :n_slides_to_generate
+                ]
 
-                presentation_outlines_text += chunk
+            async with budget.llm_limiter.acquire(presentation_id):
+                async for event in generate_ppt_outline_partial(
+                    request.content,
+                    n_slides_to_generate,
+                    request.language,
+                    additional_context,
+                    request.tone.value,
+                    request.verbosity.value,
+                    request.instructions,
+                    request.include_title_slide,
+                    request.web_search,
+                ):
+                    if isinstance(event, HTTPException):
+                        raise event
+
+                    if event.key is None:
+                        presentation_outlines: PresentationOutlineModel = event.value
+
+                    elif event.key == "slides" and event.index is not None:
+                        publish_event(
+                            PresentationGenerationEvent(
+                                type="outline",
+                                index=event.index,
+                                data=event.value.model_dump(mode="json"),
+                            )
+                        )
+                        if event.index >= len(streamed_layout_indices):
+                            continue
+                        streamed_indices.append(event.index)
+                        streamed_outlines.append(event.value)
+                        if len(streamed_indices) < pipeline.slides_per_call:
+                            continue
+                        pipeline.start_slides(
+                            streamed_indices,
+                            [
+                                layout_model.slides[streamed_layout_indices[index]]
+                                for index in streamed_indices
+                            ],
+                            streamed_outlines,
+                        )
+                        streamed_indices, streamed_outlines = [], []
 
-            try:
-                presentation_outlines_json = dict(
-                    dirtyjson.loads(presentation_outlines_text)
-                )
-            except Exception as e:
-                traceback.print_exc()
-                raise HTTPException(
-                    status_code=400,
-                    detail="Failed to generate presentation outlines. Please try again.",
-                )
-            presentation_outlines = PresentationOutlineModel(
-                **presentation_outlines_json
-            )
             total_outlines = n_slides_to_generate
+            if checkpoint:
+                await checkpoint.save_outlines(presentation_outlines, total_outlines)
 
         else:
             # Setting outlines to slides markdown
@@ -575,78 +682,88 @@ async def generate_presentation_handler(
             )
             total_outlines = len(request.slides_markdown)
 
-        # Updating async status
-        if async_status:
-            async_status.message = f"Selecting layout for each slide"
-            async_status.updated_at = datetime.now()
-            sql_session.add(async_status)
-            await sql_session.commit()
+        await update_async_status(
+            sql_session, async_status, "Selecting layout for each slide"
+        )
 
         print("-" * 40)
         print(f"Generated {total_outlines} outlines for the presentation")
 
-        # Parse Layouts
-        layout_model = await get_layout_by_name(request.template)
-        total_slide_layouts = len(layout_model.slides)
-
-        # Generate Structure
-        if layout_model.ordered:
-            presentation_structure = layout_model.to_presentation_structure()
+        saved_structure = checkpoint and checkpoint.get_structure()
+        if saved_structure:
+            presentation_outlines, presentation_structure = saved_structure
         else:
-            presentation_structure: PresentationStructureModel = (
-                await generate_presentation_structure(
-                    presentation_outlines,
-                    layout_model,
-                    request.instructions,
-                    using_slides_markdown,
+            # Generate Structure
+            if layout_model.ordered:
+                presentation_structure = layout_model.to_presentation_structure()
+            else:
+                presentation_structure: PresentationStructureModel = (
+                    await budget.llm_limiter.run(
+                        partial(
+                            generate_presentation_structure,
+                            presentation_outlines,
+                            layout_model,
+                            request.instructions,
+                            using_slides_markdown,
+                        ),
+                        key=presentation_id,
+                    )
                 )
-            )
 
-        presentation_structure.slides = presentation_structure.slides[:total_outlines]
-        for index in range(total_outlines):
-            random_slide_index = random.randint(0, total_slide_layouts - 1)
-            if index >= total_outlines:
-                presentation_structure.slides.append(random_slide_index)
-                continue
-            if presentation_structure.slides[index] >= total_slide_layouts:
-                presentation_structure.slides[index] = random_slide_index
-
-        # Injecting table of contents to the presentation structure and outlines
-        if request.include_table_of_contents and not using_slides_markdown:
-            n_toc_slides = request.n_slides - total_outlines
-            toc_slide_layout_index = select_toc_or_list_slide_layout_index(layout_model)
-            if toc_slide_layout_index != -1:
-                outline_index = 1 if request.include_title_slide else 0
-                for i in range(n_toc_slides):
-                    outlines_to = outline_index + 10
-                    if total_outlines == outlines_to:
-                        outlines_to -= 1
-
-                    presentation_structure.slides.insert(
-                        i + 1 if request.include_title_slide else i,
-                        toc_slide_layout_index,
-                    )
-                    toc_outline = f"Table of Contents\n\n"
-
-                    for outline in presentation_outlines.slides[
-                        outline_index:outlines_to
-                    ]:
-                        page_number = (
-                            outline_index - i + n_toc_slides + 1
-                            if request.include_title_slide
-                            else outline_index - i + n_toc_slides
+            presentation_structure.slides = presentation_structure.slides[
+                :total_outlines
+            ]
+            for index in range(total_outlines):
+                random_slide_index = random.randint(0, total_slide_layouts - 1)
+                if index >= total_outlines:
+                    presentation_structure.slides.append(random_slide_index)
+                    continue
+                if presentation_structure.slides[index] >= total_slide_layouts:
+                    presentation_structure.slides[index] = random_slide_index
+
+            # Injecting table of contents to the presentation structure and outlines
+            if request.include_table_of_contents and not using_slides_markdown:
+                n_toc_slides = request.n_slides - total_outlines
+                toc_slide_layout_index = select_toc_or_list_slide_layout_index(
+                    layout_model
+                )
+                if toc_slide_layout_index != -1:
+                    outline_index = 1 if request.include_title_slide else 0
+                    for i in range(n_toc_slides):
+                        outlines_to = outline_index + 10
+                        if total_outlines == outlines_to:
+                            outlines_to -= 1
+
+                        presentation_structure.slides.insert(
+                            i + 1 if request.include_title_slide else i,
+                            toc_slide_layout_index,
                         )
-                        toc_outline += f"Slide page number: {page_number}\n Slide Content: {outline.content[:100]}\n\n"
+                        toc_outline = f"Table of Contents\n\n"
+
+                        for outline in presentation_outlines.slides[
+                            outline_index:outlines_to
+                        ]:
+                            page_number = (
+                                outline_index - i + n_toc_slides + 1
+                                if request.include_title_slide
+                                else outline_index - i + n_toc_slides
+                            )
+                            toc_outline += f"Slide page number: {page_number}\n Slide Content: {outline.content[:100]}\n\n"
+                            outline_index += 1
+
                         outline_index += 1
 
-                    outline_index += 1
+                        presentation_outlines.slides.insert(
+                            i + 1 if request.include_title_slide else i,
+                            SlideOutlineModel(
+                                content=toc_outline,
+                            ),
+                        )
 
-                    presentation_outlines.slides.insert(
-                        i + 1 if request.include_title_slide else i,
-                        SlideOutlineModel(
-                            content=toc_outline,
-                        ),
-                    )
+            if checkpoint:
+                await checkpoint.save_structure(
+                    presentation_outlines, presentation_structure
+                )
 
         # Create PresentationModel
         presentation = PresentationModel(
@@ -663,88 +780,48 @@ async def generate_presentation_handler(
             instructions=request.instructions,
         )
 
-        # Updating async status
-        if async_status:
-            async_status.message = "Generating slides"
-            async_status.updated_at = datetime.now()
-            sql_session.add(async_status)
-            await sql_session.commit()
-
-        image_generation_service = ImageGenerationService(get_images_directory())
-        async_assets_generation_tasks = []
-
-        # 7. Generate slide content concurrently (batched), then build slides and fetch assets
-        slides: List[SlideModel] = []
+        await update_async_status(sql_session, async_status, "Generating slides")
 
+        # 7. Generate slide content concurrently, asset fetching for each slide
+        # starts as soon as its content is generated
         slide_layout_indices = presentation_structure.slides
         slide_layouts = [layout_model.slides[idx] for idx in slide_layout_indices]
 
-        # Schedule slide content generation and asset fetching in batches of 10
-        batch_size = 10
-        for start in range(0, len(slide_layouts), batch_size):
-            end = min(start + batch_size, len(slide_layouts))
-
-            print(f"Generating slides from {start} to {end}")
-
-            # Generate contents for this batch concurrently
-            content_tasks = [
-                get_slide_content_from_type_and_outline(
-                    slide_layouts[i],
-                    presentation_outlines.slides[i],
-                    request.language,
-                    request.tone.value,
-                    request.verbosity.value,
-                    request.instructions,
-                )
-                for i in range(start, end)
-            ]
-            batch_contents: List[dict] = await asyncio.gather(*content_tasks)
-
-            # Build slides for this batch
-            batch_slides: List[SlideModel] = []
-            for offset, slide_content in enumerate(batch_contents):
-                i = start + offset
-                slide_layout = slide_layouts[i]
-                slide = SlideModel(
-                    presentation=presentation_id,
-                    layout_group=layout_model.name,
-                    layout=slide_layout.id,
-                    index=i,
-                    speaker_note=slide_content.get("__speaker_note__"),
-                    content=slide_content,
-                )
-                slides.append(slide)
-                batch_slides.append(slide)
-
-            # Start asset fetch tasks for just-generated slides so they run while next batch is processed
-            asset_tasks = [
-                process_slide_and_fetch_assets(image_generation_service, slide)
-                for slide in batch_slides
-            ]
-            async_assets_generation_tasks.extend(asset_tasks)
+        slides = await pipeline.generate_slides(
+            slide_layouts, presentation_outlines.slides
+        )
 
-        if async_status:
-            async_status.message = "Fetching assets for slides"
-            async_status.updated_at = datetime.now()
-            sql_session.add(async_status)
-            await sql_session.commit()
+        await update_async_status(
+            sql_session, async_status, "Fetching assets for slides"
+        )
 
-        # Run all asset tasks concurrently while batches may still be generating content
-        generated_assets_list = await asyncio.gather(*async_assets_generation_tasks)
-        generated_assets = []
-        for assets_list in generated_assets_list:
-            generated_assets.extend(assets_list)
+        generated_assets = await pipeline.wait_for_assets()
+        if checkpoint:
+            await checkpoint.flush()
 
         # 8. Save PresentationModel and Slides
+        if checkpoint:
+            # A resumed task may have saved them before failing to export,
+            # restored assets keep their ids
+            await sql_session.execute(
+                delete(SlideModel).where(SlideModel.presentation == presentation_id)
+            )
+            await sql_session.execute(
+                delete(ImageAsset).where(
+                    ImageAsset.id.in_([asset.id for asset in generated_assets])
+                )
+            )
+            await sql_session.execute(
+                delete(PresentationModel).where(
+                    PresentationModel.id == presentation_id
+                )
+            )
         sql_session.add(presentation)
         sql_session.add_all(slides)
         sql_session.add_all(generated_assets)
         await sql_session.commit()
 
-        if async_status:
-            async_status.message = "Exporting presentation"
-            async_status.updated_at = datetime.now()
-            sql_session.add(async_status)
+        await update_async_status(sql_session, async_status, "Exporting presentation")
 
         # 9. Export
         presentation_and_path = await export_presentation(
@@ -760,9 +837,11 @@ async def generate_presentation_handler(
             async_status.message = "Presentation generation completed"
             async_status.status = "completed"
             async_status.data = response.model_dump(mode="json")
+            async_status.checkpoint = None
             async_status.updated_at = datetime.now()
             sql_session.add(async_status)
             await sql_session.commit()
+            PRESENTATION_GENERATION_EVENTS.publish_status(async_status)
 
         # Triggering webhook on success
         CONCURRENT_SERVICE.run_task(
@@ -775,6 +854,15 @@ async def generate_presentation_handler(
         return response
 
     except Exception as e:
+        if pipeline:
+            pipeline.cancel()
+        if checkpoint:
+            # Slides completed before the failure are reused by a retry
+            try:
+                await checkpoint.flush()
+            except Exception:
+                traceback.print_exc()
+
         if not isinstance(e, HTTPException):
             traceback.print_exc()
             e = HTTPException(status_code=500, detail="Presentation generation failed")
@@ -796,6 +884,7 @@ async def generate_presentation_handler(
             async_status.error = api_error_model.model_dump(mode="json")
             sql_session.add(async_status)
             await sql_session.commit()
+            PRESENTATION_GENERATION_EVENTS.publish_status(async_status)
 
         else:
             raise e
@@ -806,43 +895,65 @@ async def generate_presentation_sync(
     request: GeneratePresentationRequest,
     sql_session: AsyncSession = Depends(get_async_session),
 ):
+    if request.use_batch_api:
+        raise HTTPException(
+            status_code=400,
+            detail="Batch API can only be used with async generation",
+        )
+
     try:
         (presentation_id,) = await check_if_api_request_is_valid(request, sql_session)
-        return await generate_presentation_handler(
-            request, presentation_id, None, sql_session
-        )
+        with llm_request_priority(LLMRequestPriority.BULK):
+            return await generate_presentation_handler(
+                request, presentation_id, None, sql_session
+            )
     except Exception as e:
         traceback.print_exc()
         raise HTTPException(status_code=500, detail="Presentation generation failed")
 
 
 @PRESENTATION_ROUTER.post(
-    "/generate/async", response_model=AsyncPresentationGenerationTaskModel
+    "/generate/async", response_model=PresentationGenerationTaskStatus
 )
 async def generate_presentation_async(
     request: GeneratePresentationRequest,
-    background_tasks: BackgroundTasks,
     sql_session: AsyncSession = Depends(get_async_session),
 ):
     try:
         (presentation_id,) = await check_if_api_request_is_valid(request, sql_session)
 
-        async_status = AsyncPresentationGenerationTaskModel(
-            status="pending",
-            message="Queued for generation",
-            data=None,
+        async_status = await PRESENTATION_GENERATION_QUEUE.enqueue(
+            sql_session, request, presentation_id
         )
-        sql_session.add(async_status)
-        await sql_session.commit()
+        return PresentationGenerationTaskStatus.from_task(async_status)
 
-        background_tasks.add_task(
-            generate_presentation_handler,
-            request,
-            presentation_id,
-            async_status=async_status,
-            sql_session=sql_session,
+    except Exception as e:
+        if not isinstance(e, HTTPException):
+            print(e)
+            e = HTTPException(status_code=500, detail="Presentation generation failed")
+
+        raise e
+
+
+@PRESENTATION_ROUTER.post(
+    "/generate/batch", response_model=PresentationGenerationBatchStatus
+)
+async def generate_presentation_batch(
+    request: GeneratePresentationBatchRequest,
+    sql_session: AsyncSession = Depends(get_async_session),
+):
+    try:
+        requests = []
+        for presentation_request in request.presentations:
+            (presentation_id,) = await check_if_api_request_is_valid(
+                presentation_request, sql_session
+            )
+            requests.append((presentation_request, presentation_id))
+
+        batch_id, items = await PRESENTATION_GENERATION_QUEUE.enqueue_batch(
+            sql_session, requests
         )
-        return async_status
+        return PresentationGenerationBatchStatus.from_items(batch_id, items)
 
     except Exception as e:
         if not isinstance(e, HTTPException):
@@ -853,7 +964,27 @@ async def generate_presentation_async(
 
 
 @PRESENTATION_ROUTER.get(
-    "/status/{id}", response_model=AsyncPresentationGenerationTaskModel
+    "/generate/batch/{id}", response_model=PresentationGenerationBatchStatus
+)
+async def check_presentation_batch_generation_status(
+    id: str = Path(description="ID of the presentation generation batch"),
+    sql_session: AsyncSession = Depends(get_async_session),
+):
+    items = await sql_session.scalars(
+        select(AsyncPresentationGenerationTaskModel)
+        .where(AsyncPresentationGenerationTaskModel.batch_id == id)
+        .order_by(AsyncPresentationGenerationTaskModel.created_at)
+    )
+    items = list(items)
+    if not items:
+        raise HTTPException(
+            status_code=404, detail="No presentation generation batch found"
+        )
+    return PresentationGenerationBatchStatus.from_items(id, items)
+
+
+@PRESENTATION_ROUTER.get(
+    "/status/{id}", response_model=PresentationGenerationTaskStatus
 )
 async def check_async_presentation_generation_status(
     id: str = Path(description="ID of the presentation generation task"),
@@ -864,7 +995,55 @@ async def check_async_presentation_generation_status(
         raise HTTPException(
             status_code=404, detail="No presentation generation task found"
         )
-    return status
+    return PresentationGenerationTaskStatus.from_task(status)
+
+
+@PRESENTATION_ROUTER.get("/status/{id}/events")
+async def stream_async_presentation_generation_status(
+    id: str = Path(description="ID of the presentation generation task"),
+    sql_session: AsyncSession = Depends(get_async_session),
+):
+    """
+    Streams the status of the task and its progress (outlines, slides and
+    assets) as Server-Sent Events, until the task is completed or failed.
+    """
+    status = await sql_session.get(AsyncPresentationGenerationTaskModel, id)
+    if not status:
+        raise HTTPException(
+            status_code=404, detail="No presentation generation task found"
+        )
+
+    async def inner():
+        async for event in PRESENTATION_GENERATION_EVENTS.iterate(id):
+            yield event.to_string() if event else ": keep-alive\n\n"
+
+    return StreamingResponse(
+        inner(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@PRESENTATION_ROUTER.post(
+    "/status/{id}/resume", response_model=PresentationGenerationTaskStatus
+)
+async def resume_async_presentation_generation(
+    id: str = Path(description="ID of the presentation generation task"),
+    sql_session: AsyncSession = Depends(get_async_session),
+):
+    status = await sql_session.get(AsyncPresentationGenerationTaskModel, id)
+    if not status:
+        raise HTTPException(
+            status_code=404, detail="No presentation generation task found"
+        )
+    if status.status != "error" or not status.request:
+        raise HTTPException(
+            status_code=400,
+            detail="Only failed presentation generations can be resumed",
+        )
+
+    status = await PRESENTATION_GENERATION_QUEUE.requeue(sql_session, status)
+    return PresentationGenerationTaskStatus.from_task(status)
 
 
 @PRESENTATION_ROUTER.post("/edit", response_model=PresentationPathAndEditPath)
@@ -0,0 +1,7 @@
+# Shared HTTP client
+DEFAULT_HTTP_MAX_CONNECTIONS = 100
+DEFAULT_HTTP_MAX_CONNECTIONS_PER_HOST = 10
+DEFAULT_HTTP_KEEPALIVE_TIMEOUT = 30
+DEFAULT_HTTP_DNS_CACHE_TTL = 5 * 60
+DEFAULT_HTTP_CONNECT_TIMEOUT = 10
+DEFAULT_HTTP_TOTAL_TIMEOUT = 5 * 60
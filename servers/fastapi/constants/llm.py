@@ -4,3 +4,27 @@ OPENAI_URL = "https://api.openai.com/v1"
 DEFAULT_OPENAI_MODEL = "gpt-4.1"
 DEFAULT_GOOGLE_MODEL = "models/gemini-2.5-flash"
 DEFAULT_ANTHROPIC_MODEL = "claude-sonnet-4-20250514"
+
+# Concurrency
+DEFAULT_LLM_MAX_CONCURRENCY = 32
+
+# Response cache
+DEFAULT_LLM_RESPONSE_CACHE_TTL = 7 * 24 * 60 * 60
+DEFAULT_LLM_RESPONSE_CACHE_MAX_ENTRIES = 5000
+DEFAULT_LLM_RESPONSE_CACHE_MAX_BYTES = 100 * 1024 * 1024
+
+# Failover
+DEFAULT_LLM_MAX_RETRIES = 2
+LLM_RETRY_DELAY = 1.0
+LLM_CIRCUIT_BREAKER_FAILURES = 5
+LLM_CIRCUIT_BREAKER_COOLDOWN = 30
+
+# Hedging
+DEFAULT_LLM_HEDGING_MAX_PERCENT = 10
+LLM_HEDGING_PERCENTILE = 0.9
+LLM_HEDGING_MIN_SAMPLES = 20
+LLM_HEDGING_WINDOW = 200
+
+# Rate limits
+LLM_CHARACTERS_PER_TOKEN = 4
+DEFAULT_LLM_OUTPUT_TOKENS_ESTIMATE = 1000
@@ -1 +1,10 @@
 DEFAULT_TEMPLATES = ["general", "modern", "standard", "swift"]
+
+DEFAULT_SLIDE_GENERATION_CONCURRENCY = 10
+DEFAULT_ASSET_FETCH_CONCURRENCY = 16
+DEFAULT_SLIDES_PER_LLM_CALL = 1
+DEFAULT_PRESENTATION_GENERATION_WORKERS = 2
+MAX_PRESENTATION_GENERATION_BATCH_SIZE = 50
+DEFAULT_LAYOUT_CACHE_TTL = 60 * 60
+PRESENTATION_GENERATION_EVENTS_KEEP_ALIVE = 15
+PRESENTATION_GENERATION_CHECKPOINT_SLIDES = 5
@@ -0,0 +1,6 @@
+from enum import Enum
+
+
+class LLMRequestPriority(Enum):
+    INTERACTIVE = "interactive"
+    BULK = "bulk"
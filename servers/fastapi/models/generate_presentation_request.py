@@ -40,3 +40,11 @@ class GeneratePresentationRequest(BaseModel):
     trigger_webhook: bool = Field(
         default=False, description="Whether to trigger subscribed webhooks"
     )
+    use_cache: bool = Field(
+        default=True,
+        description="Whether to reuse cached slide content for identical prompts",
+    )
+    use_batch_api: bool = Field(
+        default=False,
+        description="Whether to generate slides through the LLM provider batch API, at lower cost and higher latency. Only for async generation",
+    )
@@ -0,0 +1,16 @@
+from pydantic import BaseModel
+
+
+class LLMUsage(BaseModel):
+    input_tokens: int = 0
+    output_tokens: int = 0
+    # Input tokens served from the provider prompt cache
+    cached_input_tokens: int = 0
+    # Input tokens written to the provider prompt cache (Anthropic)
+    cache_creation_input_tokens: int = 0
+
+    def add(self, usage: "LLMUsage"):
+        self.input_tokens += usage.input_tokens
+        self.output_tokens += usage.output_tokens
+        self.cached_input_tokens += usage.cached_input_tokens
+        self.cache_creation_input_tokens += usage.cache_creation_input_tokens
@@ -0,0 +1,45 @@
+from typing import List, Literal
+from pydantic import BaseModel, Field
+
+from constants.presentation import MAX_PRESENTATION_GENERATION_BATCH_SIZE
+from models.generate_presentation_request import GeneratePresentationRequest
+from models.presentation_generation_task_status import (
+    PresentationGenerationTaskStatus,
+)
+from models.sql.async_presentation_generation_status import (
+    AsyncPresentationGenerationTaskModel,
+)
+
+
+class GeneratePresentationBatchRequest(BaseModel):
+    presentations: List[GeneratePresentationRequest] = Field(
+        ...,
+        min_length=1,
+        max_length=MAX_PRESENTATION_GENERATION_BATCH_SIZE,
+        description="Presentations to generate",
+    )
+
+
+class PresentationGenerationBatchStatus(BaseModel):
+    id: str
+    status: Literal["processing", "completed", "completed_with_errors", "error"]
+    items: List[PresentationGenerationTaskStatus]
+
+    @classmethod
+    def from_items(
+        cls, id: str, items: List[AsyncPresentationGenerationTaskModel]
+    ) -> "PresentationGenerationBatchStatus":
+        statuses = {item.status for item in items}
+        if statuses & {"pending", "processing"}:
+            status = "processing"
+        elif statuses == {"completed"}:
+            status = "completed"
+        elif statuses == {"error"}:
+            status = "error"
+        else:
+            status = "completed_with_errors"
+        return cls(
+            id=id,
+            status=status,
+            items=[PresentationGenerationTaskStatus.from_task(item) for item in items],
+        )
@@ -0,0 +1,46 @@
+from typing import Literal, Optional
+
+from pydantic import BaseModel
+
+from models.sql.async_presentation_generation_status import (
+    AsyncPresentationGenerationTaskModel,
+)
+from models.sse_response import SSEResponse
+
+
+class PresentationGenerationEvent(BaseModel):
+    """
+    Progress of a presentation generation task.
+    status: stage transitions of the task, with its data or error once it ends
+    outline: an outline streamed by the LLM
+    slide: content of a slide was generated
+    assets: assets of a slide were fetched
+    """
+
+    type: Literal["status", "outline", "slide", "assets"]
+    status: Optional[str] = None
+    message: Optional[str] = None
+    index: Optional[int] = None
+    data: Optional[dict] = None
+    error: Optional[dict] = None
+
+    @classmethod
+    def from_task(
+        cls, task: AsyncPresentationGenerationTaskModel
+    ) -> "PresentationGenerationEvent":
+        return cls(
+            type="status",
+            status=task.status,
+            message=task.message,
+            data=task.data,
+            error=task.error,
+        )
+
+    @property
+    def is_final(self) -> bool:
+        return self.type == "status" and self.status in ("completed", "error")
+
+    def to_string(self):
+        return SSEResponse(
+            event="response", data=self.model_dump_json(exclude_none=True)
+        ).to_string()
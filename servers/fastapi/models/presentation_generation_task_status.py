@@ -0,0 +1,34 @@
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel
+
+from models.sql.async_presentation_generation_status import (
+    AsyncPresentationGenerationTaskModel,
+)
+
+
+class PresentationGenerationTaskStatus(BaseModel):
+    """Public status of an async presentation generation task."""
+
+    id: str
+    status: str
+    message: Optional[str] = None
+    error: Optional[dict] = None
+    created_at: datetime
+    updated_at: datetime
+    data: Optional[dict] = None
+
+    @classmethod
+    def from_task(
+        cls, task: AsyncPresentationGenerationTaskModel
+    ) -> "PresentationGenerationTaskStatus":
+        return cls(
+            id=task.id,
+            status=task.status,
+            message=task.message,
+            error=task.error,
+            created_at=task.created_at,
+            updated_at=task.updated_at,
+            data=task.data,
+        )
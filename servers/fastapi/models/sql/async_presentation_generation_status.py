@@ -14,9 +14,18 @@ class AsyncPresentationGenerationTaskModel(SQLModel, table=True):
     id: str = Field(
         default_factory=lambda: f"task-{secrets.token_hex(32)}", primary_key=True
     )
-    status: str
+    status: str = Field(index=True)
     message: Optional[str] = None
     error: Optional[dict] = Field(sa_column=Column(JSON), default=None)
     created_at: datetime = Field(default_factory=datetime.now)
     updated_at: datetime = Field(default_factory=datetime.now)
     data: Optional[dict] = Field(sa_column=Column(JSON), default=None)
+
+    # Job queue
+    presentation_id: Optional[uuid.UUID] = None
+    request: Optional[dict] = Field(sa_column=Column(JSON), default=None)
+    worker_id: Optional[str] = None
+    attempts: int = Field(default=0)
+    heartbeat_at: Optional[datetime] = None
+    checkpoint: Optional[dict] = Field(sa_column=Column(JSON), default=None)
+    batch_id: Optional[str] = Field(default=None, index=True)
@@ -0,0 +1,16 @@
+from datetime import datetime
+
+from sqlalchemy import JSON, Column
+from sqlmodel import Field, SQLModel
+
+
+class LLMResponseCacheModel(SQLModel, table=True):
+
+    __tablename__ = "llm_response_cache"
+
+    key: str = Field(primary_key=True)
+    model: str
+    response: dict = Field(sa_column=Column(JSON))
+    size: int = Field(default=0)
+    created_at: datetime = Field(default_factory=datetime.now, index=True)
+    accessed_at: datetime = Field(default_factory=datetime.now, index=True)
@@ -0,0 +1,121 @@
+import asyncio
+from collections import defaultdict
+from contextlib import asynccontextmanager
+import itertools
+import time
+from typing import Awaitable, Callable, Dict, Hashable, Optional, TypeVar
+
+from fastapi import HTTPException
+
+T = TypeVar("T")
+
+
+def is_overload_error(e: BaseException) -> bool:
+    if isinstance(e, asyncio.TimeoutError):
+        return True
+    if isinstance(e, HTTPException):
+        return e.status_code in (429, 503, 504)
+    return False
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Keeps up to `limit` calls in flight and adapts the limit with AIMD:
+    - every successful call grows the limit by 1 / limit (about +1 per full window)
+    - a rate limit or timeout error halves the limit, at most once per window
+    Calls are not retried here, retries of LLM calls are left to the failover
+    of LLMClient so an overloaded provider does not get more requests.
+
+    Calls can be tagged with a key (e.g. one per presentation) to share the
+    limiter fairly: a free slot goes to the waiting key with the fewest calls in
+    flight, so one large job can not starve the others.
+    """
+
+    def __init__(
+        self,
+        max_limit: int,
+        min_limit: int = 1,
+        initial_limit: Optional[int] = None,
+        decrease_factor: float = 0.5,
+    ):
+        self.max_limit = max(1, max_limit)
+        self.min_limit = max(1, min(min_limit, self.max_limit))
+        self.limit = float(
+            min(self.max_limit, max(self.min_limit, initial_limit or self.max_limit))
+        )
+        self.decrease_factor = decrease_factor
+
+        self._in_flight = 0
+        self._last_decrease_at = 0.0
+        self._condition = asyncio.Condition()
+
+        self._in_flight_by_key: Dict[Hashable, int] = defaultdict(int)
+        # Key -> sequence numbers of its waiting calls, oldest first
+        self._waiting: Dict[Hashable, list] = {}
+        self._sequence = itertools.count()
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def _next_key(self) -> Hashable:
+        return min(
+            self._waiting,
+            key=lambda key: (self._in_flight_by_key[key], self._waiting[key][0]),
+        )
+
+    async def _acquire(self, key: Hashable) -> float:
+        async with self._condition:
+            sequence = next(self._sequence)
+            self._waiting.setdefault(key, []).append(sequence)
+            try:
+                await self._condition.wait_for(
+                    lambda: self._in_flight < int(self.limit)
+                    and self._next_key() == key
+                    and self._waiting[key][0] == sequence
+                )
+            finally:
+                self._waiting[key].remove(sequence)
+                if not self._waiting[key]:
+                    del self._waiting[key]
+                # The next waiter may be allowed now
+                self._condition.notify_all()
+            self._in_flight += 1
+            self._in_flight_by_key[key] += 1
+        return time.monotonic()
+
+    async def _release(
+        self, key: Hashable, started_at: float, overloaded: Optional[bool]
+    ):
+        async with self._condition:
+            self._in_flight -= 1
+            self._in_flight_by_key[key] -= 1
+            if not self._in_flight_by_key[key]:
+                del self._in_flight_by_key[key]
+            if overloaded:
+                # Calls started before the last decrease saw the old limit
+                if started_at >= self._last_decrease_at:
+                    self.limit = max(self.min_limit, self.limit * self.decrease_factor)
+                    self._last_decrease_at = time.monotonic()
+                    print(f"Overloaded, concurrency limit is now {int(self.limit)}")
+            elif overloaded is False:
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            self._condition.notify_all()
+
+    @asynccontextmanager
+    async def acquire(self, key: Hashable = None):
+        """Holds a slot for the duration of the block."""
+        started_at = await self._acquire(key)
+        overloaded = None
+        try:
+            yield
+            overloaded = False
+        except Exception as e:
+            overloaded = is_overload_error(e)
+            raise
+        finally:
+            await self._release(key, started_at, overloaded)
+
+    async def run(self, func: Callable[[], Awaitable[T]], key: Hashable = None) -> T:
+        async with self.acquire(key):
+            return await func()
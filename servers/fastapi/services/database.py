@@ -13,13 +13,18 @@ from models.sql.async_presentation_generation_status import (
 )
 from models.sql.image_asset import ImageAsset
 from models.sql.key_value import KeyValueSqlModel
+from models.sql.llm_response_cache import LLMResponseCacheModel
 from models.sql.ollama_pull_status import OllamaPullStatus
 from models.sql.presentation import PresentationModel
 from models.sql.slide import SlideModel
 from models.sql.presentation_layout_code import PresentationLayoutCodeModel
 from models.sql.template import TemplateModel
 from models.sql.webhook_subscription import WebhookSubscription
-from utils.db_utils import get_database_url_and_connect_args
+from utils.db_utils import (
+    add_missing_columns,
+    add_missing_indexes,
+    get_database_url_and_connect_args,
+)
 
 
 database_url, connect_args = get_database_url_and_connect_args()
@@ -63,9 +68,22 @@ async def create_db_and_tables():
                     TemplateModel.__table__,
                     WebhookSubscription.__table__,
                     AsyncPresentationGenerationTaskModel.__table__,
+                    LLMResponseCacheModel.__table__,
                 ],
             )
         )
+        await conn.run_sync(
+            lambda sync_conn: add_missing_columns(
+                sync_conn,
+                tables=[AsyncPresentationGenerationTaskModel.__table__],
+            )
+        )
+        await conn.run_sync(
+            lambda sync_conn: add_missing_indexes(
+                sync_conn,
+                tables=[AsyncPresentationGenerationTaskModel.__table__],
+            )
+        )
 
     async with container_db_engine.begin() as conn:
         await conn.run_sync(
@@ -0,0 +1,86 @@
+import asyncio
+from typing import Dict, Optional, Tuple
+
+import aiohttp
+
+from constants.http import (
+    DEFAULT_HTTP_CONNECT_TIMEOUT,
+    DEFAULT_HTTP_DNS_CACHE_TTL,
+    DEFAULT_HTTP_KEEPALIVE_TIMEOUT,
+    DEFAULT_HTTP_MAX_CONNECTIONS,
+    DEFAULT_HTTP_MAX_CONNECTIONS_PER_HOST,
+    DEFAULT_HTTP_TOTAL_TIMEOUT,
+)
+from utils.get_env import get_http_max_connections_per_host_env
+from utils.parsers import parse_int_or_none
+
+
+class HttpClient:
+    """
+    Application scoped registry of pooled aiohttp sessions for outbound calls.
+    Connections are kept alive and DNS lookups are cached, so repeated calls to
+    the same host reuse a few connections instead of opening one per request.
+    Sessions that honour proxy environment variables (trust_env) are kept
+    separate from the ones used for internal calls.
+    Sessions are bound to the event loop they were created on, so each loop
+    gets its own and all of them are closed together.
+    Sessions are started and closed with the app, and created lazily when used
+    outside of it. Callers must not close the returned sessions.
+    """
+
+    def __init__(self, max_connections_per_host: Optional[int] = None):
+        self._max_connections_per_host = max_connections_per_host
+        self._sessions: Dict[
+            Tuple[asyncio.AbstractEventLoop, bool], aiohttp.ClientSession
+        ] = {}
+
+    @property
+    def max_connections_per_host(self) -> int:
+        if self._max_connections_per_host is not None:
+            return self._max_connections_per_host
+        limit = parse_int_or_none(get_http_max_connections_per_host_env())
+        return limit or DEFAULT_HTTP_MAX_CONNECTIONS_PER_HOST
+
+    def _create_session(self, trust_env: bool) -> aiohttp.ClientSession:
+        connector = aiohttp.TCPConnector(
+            limit=DEFAULT_HTTP_MAX_CONNECTIONS,
+            limit_per_host=self.max_connections_per_host,
+            keepalive_timeout=DEFAULT_HTTP_KEEPALIVE_TIMEOUT,
+            ttl_dns_cache=DEFAULT_HTTP_DNS_CACHE_TTL,
+        )
+        return aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(
+                total=DEFAULT_HTTP_TOTAL_TIMEOUT,
+                connect=DEFAULT_HTTP_CONNECT_TIMEOUT,
+            ),
+            trust_env=trust_env,
+        )
+
+    def get_session(self, trust_env: bool = False) -> aiohttp.ClientSession:
+        key = (asyncio.get_running_loop(), trust_env)
+        session = self._sessions.get(key)
+        if not session or session.closed:
+            session = self._create_session(trust_env)
+            self._sessions[key] = session
+        return session
+
+    async def start(self):
+        self.get_session()
+        self.get_session(trust_env=True)
+
+    async def close(self):
+        loop = asyncio.get_running_loop()
+        sessions = self._sessions
+        self._sessions = {}
+        for (session_loop, _), session in sessions.items():
+            if session.closed or session_loop.is_closed():
+                continue
+            if session_loop is loop:
+                await session.close()
+            else:
+                # Sessions can only be closed on their own loop
+                asyncio.run_coroutine_threadsafe(session.close(), session_loop)
+
+
+HTTP_CLIENT = HttpClient()
@@ -1,11 +1,10 @@
-import asyncio
 import os
-import aiohttp
 from google import genai
 from google.genai.types import GenerateContentConfig
 from openai import AsyncOpenAI
 from models.image_prompt import ImagePrompt
 from models.sql.image_asset import ImageAsset
+from services.http_client import HTTP_CLIENT
 from utils.download_helpers import download_file
 from utils.get_env import get_pexels_api_key_env
 from utils.get_env import get_pixabay_api_key_env
@@ -94,8 +93,7 @@ class ImageGenerationService:
 
     async def generate_image_google(self, prompt: str, output_directory: str) -> str:
         client = genai.Client()
-        response = await asyncio.to_thread(
-            client.models.generate_content,
+        response = await client.aio.models.generate_content(
             model="gemini-2.5-flash-image-preview",
             contents=[prompt],
             config=GenerateContentConfig(response_modalities=["TEXT", "IMAGE"]),
@@ -112,20 +110,20 @@ class ImageGenerationService:
         return image_path
 
     async def get_image_from_pexels(self, prompt: str) -> str:
-        async with aiohttp.ClientSession(trust_env=True) as session:
-            response = await session.get(
-                f"https://api.pexels.com/v1/search?query={prompt}&per_page=1",
-                headers={"Authorization": f"{get_pexels_api_key_env()}"},
-            )
+        session = HTTP_CLIENT.get_session(trust_env=True)
+        async with session.get(
+            f"https://api.pexels.com/v1/search?query={prompt}&per_page=1",
+            headers={"Authorization": f"{get_pexels_api_key_env()}"},
+        ) as response:
             data = await response.json()
-            image_url = data["photos"][0]["src"]["large"]
-            return image_url
+        image_url = data["photos"][0]["src"]["large"]
+        return image_url
 
     async def get_image_from_pixabay(self, prompt: str) -> str:
-        async with aiohttp.ClientSession(trust_env=True) as session:
-            response = await session.get(
-                f"https://pixabay.com/api/?key={get_pixabay_api_key_env()}&q={prompt}&image_type=photo&per_page=3"
-            )
+        session = HTTP_CLIENT.get_session(trust_env=True)
+        async with session.get(
+            f"https://pixabay.com/api/?key={get_pixabay_api_key_env()}&q={prompt}&image_type=photo&per_page=3"
+        ) as response:
             data = await response.json()
-            image_url = data["hits"][0]["largeImageURL"]
-            return image_url
+        image_url = data["hits"][0]["largeImageURL"]
+        return image_url
@@ -0,0 +1,114 @@
+import asyncio
+import time
+from typing import Any, Callable, Dict, Optional
+
+from fastapi import HTTPException
+
+from constants.presentation import DEFAULT_LAYOUT_CACHE_TTL
+from models.presentation_layout import PresentationLayoutModel
+from services.http_client import HTTP_CLIENT
+from utils.get_env import get_layout_cache_ttl_env
+from utils.parsers import parse_int_or_none
+
+LAYOUTS_KEY = "__layouts__"
+
+
+class CachedLayoutEntry:
+    def __init__(self, value: Any, etag: Optional[str]):
+        self.value = value
+        self.etag = etag
+        self.fetched_at = time.monotonic()
+
+
+class LayoutCache:
+    """
+    In-process cache of the layouts served by the Next.js server.
+    Entries are served from memory for the TTL and then revalidated, with their
+    ETag if the server sent one. Custom templates are invalidated when they are
+    saved or deleted. Cached layouts are shared and must not be mutated.
+    """
+
+    layout_url = "http://localhost/api/template?group={}"
+    layouts_url = "http://localhost:3000/api/layouts"
+
+    def __init__(self, ttl: Optional[int] = None):
+        self._ttl = ttl
+        self._entries: Dict[str, CachedLayoutEntry] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._version = 0
+
+    @property
+    def ttl(self) -> int:
+        if self._ttl is not None:
+            return self._ttl
+        ttl = parse_int_or_none(get_layout_cache_ttl_env())
+        return DEFAULT_LAYOUT_CACHE_TTL if ttl is None else ttl
+
+    def invalidate(self, layout_name: Optional[str] = None):
+        """Invalidates the layout, or every layout if no name is given."""
+        self._version += 1
+        if layout_name is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(layout_name, None)
+        self._entries.pop(LAYOUTS_KEY, None)
+
+    async def _get(
+        self,
+        key: str,
+        url: str,
+        parse: Callable[[Any], Any],
+        get_error: Callable[[int, str], HTTPException],
+    ) -> Any:
+        entry = self._entries.get(key)
+        if entry and time.monotonic() - entry.fetched_at < self.ttl:
+            return entry.value
+
+        # Concurrent requests for the same layout share a single fetch
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            entry = self._entries.get(key)
+            if entry and time.monotonic() - entry.fetched_at < self.ttl:
+                return entry.value
+
+            version = self._version
+            headers = {"If-None-Match": entry.etag} if entry and entry.etag else {}
+            session = HTTP_CLIENT.get_session()
+            async with session.get(url, headers=headers) as response:
+                if response.status == 304 and entry:
+                    entry.fetched_at = time.monotonic()
+                    return entry.value
+                if response.status != 200:
+                    raise get_error(response.status, await response.text())
+                value = parse(await response.json())
+                etag = response.headers.get("ETag")
+
+            # Layout may have changed while it was being fetched
+            if version == self._version and self.ttl > 0:
+                self._entries[key] = CachedLayoutEntry(value, etag)
+            return value
+
+    async def get_layout(self, layout_name: str) -> PresentationLayoutModel:
+        return await self._get(
+            layout_name,
+            self.layout_url.format(layout_name),
+            lambda layout_json: PresentationLayoutModel(**layout_json),
+            lambda _, error_text: HTTPException(
+                status_code=404,
+                detail=f"Template '{layout_name}' not found: {error_text}",
+            ),
+        )
+
+    async def get_layouts(self) -> Any:
+        return await self._get(
+            LAYOUTS_KEY,
+            self.layouts_url,
+            lambda layouts_json: layouts_json,
+            lambda status, error_text: HTTPException(
+                status_code=status,
+                detail=f"Failed to fetch layouts: {error_text}",
+            ),
+        )
+
+
+LAYOUT_CACHE = LayoutCache()
@@ -0,0 +1,187 @@
+import asyncio
+import hashlib
+import math
+import re
+from typing import Callable, Dict, List, Optional, Tuple
+
+from models.presentation_layout import PresentationLayoutModel, SlideLayoutModel
+from models.presentation_outline_model import PresentationOutlineModel
+from models.presentation_structure_model import PresentationStructureModel
+from utils.get_env import get_local_layout_selector_env
+from utils.parsers import parse_bool_or_none
+
+LIST_ITEM_PATTERN = re.compile(r"^\s*(?:[-*+]|\d+[.)])\s+", re.MULTILINE)
+
+
+def use_local_layout_selector() -> bool:
+    return parse_bool_or_none(get_local_layout_selector_env()) or False
+
+
+def get_array_item_range(schema: dict) -> Optional[Tuple[int, int]]:
+    """Returns item count range of the largest top-level array of the schema."""
+    item_range = None
+    for property_schema in schema.get("properties", {}).values():
+        if property_schema.get("type") != "array":
+            continue
+        min_items = property_schema.get("minItems", 0)
+        max_items = property_schema.get("maxItems", min_items)
+        if not item_range or max_items > item_range[1]:
+            item_range = (min_items, max_items)
+    return item_range
+
+
+def get_slide_layout_text(slide_layout: SlideLayoutModel) -> str:
+    schema = slide_layout.json_schema
+    fields = []
+    for name, property_schema in schema.get("properties", {}).items():
+        if property_schema.get("type") == "array":
+            min_items = property_schema.get("minItems", 0)
+            max_items = property_schema.get("maxItems", min_items)
+            fields.append(f"{name} (list of {min_items} to {max_items} items)")
+        else:
+            fields.append(name)
+
+    schema_text = str(schema)
+    if "__image_prompt__" in schema_text:
+        fields.append("image")
+    if "__icon_query__" in schema_text:
+        fields.append("icons")
+
+    return " ".join(
+        [
+            slide_layout.id.replace("-", " ").replace("_", " "),
+            slide_layout.name or schema.get("title", ""),
+            slide_layout.description or schema.get("description", ""),
+            f"Fields: {', '.join(fields)}",
+        ]
+    )
+
+
+def cosine_similarity(a: List[float], b: List[float]) -> float:
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
+
+
+class LayoutSelectorService:
+    """
+    Picks a layout for each outline locally, without an LLM call.
+    Layout names, descriptions and schema shapes are embedded once per template
+    with the MiniLM model already used for icon search. Each outline gets the
+    most similar layout, adjusted by how well its number of list items fits the
+    layout. Returns None when too many picks have low similarity, so callers
+    can fall back to the LLM.
+    """
+
+    min_similarity = 0.25
+    max_low_confidence_ratio = 0.25
+    item_count_bonus = 0.05
+    item_count_penalty = 0.05
+    repeat_penalty = 0.05
+    max_cached_templates = 64
+
+    def __init__(self, embedding_function: Optional[Callable] = None):
+        self._embedding_function = embedding_function
+        self._layout_embeddings: Dict[str, List[List[float]]] = {}
+
+    @property
+    def embedding_function(self) -> Callable:
+        if not self._embedding_function:
+            # Imported here so the model is only loaded when the selector is used
+            from services.icon_finder_service import ICON_FINDER_SERVICE
+
+            self._embedding_function = ICON_FINDER_SERVICE.embedding_function
+        return self._embedding_function
+
+    def _embed(self, texts: List[str]) -> List[List[float]]:
+        return [list(map(float, each)) for each in self.embedding_function(texts)]
+
+    def _get_layout_embeddings(
+        self, layout: PresentationLayoutModel
+    ) -> List[List[float]]:
+        cache_key = hashlib.sha256(layout.model_dump_json().encode()).hexdigest()
+        if cache_key not in self._layout_embeddings:
+            if len(self._layout_embeddings) >= self.max_cached_templates:
+                self._layout_embeddings.clear()
+            self._layout_embeddings[cache_key] = self._embed(
+                [get_slide_layout_text(slide) for slide in layout.slides]
+            )
+        return self._layout_embeddings[cache_key]
+
+    def _score(
+        self,
+        similarity: float,
+        slide_layout: SlideLayoutModel,
+        n_items: int,
+        repeated: bool,
+    ) -> float:
+        score = similarity
+        item_range = get_array_item_range(slide_layout.json_schema)
+        if n_items and item_range:
+            min_items, max_items = item_range
+            if min_items <= n_items <= max_items:
+                score += self.item_count_bonus
+            else:
+                distance = min(abs(n_items - min_items), abs(n_items - max_items))
+                score -= min(4, distance) * self.item_count_penalty
+        if repeated:
+            score -= self.repeat_penalty
+        return score
+
+    def select_layouts_sync(
+        self,
+        outline: PresentationOutlineModel,
+        layout: PresentationLayoutModel,
+    ) -> Optional[PresentationStructureModel]:
+        if not outline.slides or not layout.slides:
+            return None
+
+        layout_embeddings = self._get_layout_embeddings(layout)
+        outline_embeddings = self._embed([slide.content for slide in outline.slides])
+
+        selected = []
+        low_confidence = 0
+        for slide, outline_embedding in zip(outline.slides, outline_embeddings):
+            n_items = len(LIST_ITEM_PATTERN.findall(slide.content))
+            similarities = [
+                cosine_similarity(outline_embedding, layout_embedding)
+                for layout_embedding in layout_embeddings
+            ]
+            scores = [
+                self._score(
+                    similarity,
+                    slide_layout,
+                    n_items,
+                    repeated=bool(selected) and selected[-1] == index,
+                )
+                for index, (similarity, slide_layout) in enumerate(
+                    zip(similarities, layout.slides)
+                )
+            ]
+            best_index = max(range(len(scores)), key=scores.__getitem__)
+            if similarities[best_index] < self.min_similarity:
+                low_confidence += 1
+            selected.append(best_index)
+
+        if low_confidence > len(selected) * self.max_low_confidence_ratio:
+            print(
+                f"Local layout selector is not confident for {low_confidence} "
+                f"of {len(selected)} slides"
+            )
+            return None
+
+        return PresentationStructureModel(slides=selected)
+
+    async def select_layouts(
+        self,
+        outline: PresentationOutlineModel,
+        layout: PresentationLayoutModel,
+    ) -> Optional[PresentationStructureModel]:
+        try:
+            return await asyncio.to_thread(self.select_layouts_sync, outline, layout)
+        except Exception as e:
+            print(f"Local layout selector failed: {e}")
+            return None
+
+
+LAYOUT_SELECTOR_SERVICE = LayoutSelectorService()
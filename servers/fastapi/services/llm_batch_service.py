@@ -0,0 +1,275 @@
+import asyncio
+import itertools
+import json
+import time
+from typing import Dict, List, Optional
+
+from anthropic import AsyncAnthropic
+import dirtyjson
+from fastapi import HTTPException
+from openai import AsyncOpenAI
+
+from enums.llm_provider import LLMProvider
+from models.llm_message import LLMMessage, LLMSystemMessage
+from services.llm_client_pool import LLM_CLIENT_POOL
+from utils.get_env import get_anthropic_api_key_env, get_openai_api_key_env
+from utils.llm_provider import get_llm_provider
+
+
+class LLMBatchRequest:
+    def __init__(
+        self,
+        custom_id: str,
+        model: str,
+        messages: List[LLMMessage],
+        response_format: dict,
+        future: asyncio.Future,
+    ):
+        self.custom_id = custom_id
+        self.model = model
+        self.messages = messages
+        self.response_format = response_format
+        self.future = future
+
+
+class OpenAIBatchBackend:
+    """Runs structured requests through the OpenAI Batch API."""
+
+    endpoint = "/v1/chat/completions"
+
+    def __init__(self, client: Optional[AsyncOpenAI] = None):
+        # Pooled clients leave retries to LLMFailover, batch calls retry here
+        self.client = client or LLM_CLIENT_POOL.get_client(
+            LLMProvider.OPENAI,
+            None,
+            get_openai_api_key_env(),
+            lambda: AsyncOpenAI(timeout=180.0, max_retries=0),
+        ).with_options(max_retries=2)
+
+    def _get_request_line(self, request: LLMBatchRequest) -> str:
+        return json.dumps(
+            {
+                "custom_id": request.custom_id,
+                "method": "POST",
+                "url": self.endpoint,
+                "body": {
+                    "model": request.model,
+                    "messages": [message.model_dump() for message in request.messages],
+                    "response_format": {
+                        "type": "json_schema",
+                        "json_schema": {
+                            "name": "ResponseSchema",
+                            "strict": False,
+                            "schema": request.response_format,
+                        },
+                    },
+                },
+            }
+        )
+
+    async def submit(self, requests: List[LLMBatchRequest]) -> str:
+        content = "\n".join(self._get_request_line(request) for request in requests)
+        batch_file = await self.client.files.create(
+            file=("batch.jsonl", content.encode()), purpose="batch"
+        )
+        batch = await self.client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint=self.endpoint,
+            completion_window="24h",
+        )
+        return batch.id
+
+    def _parse_result(self, item: dict) -> dict | Exception:
+        response = item.get("response") or {}
+        if item.get("error") or response.get("status_code") != 200:
+            return Exception(item.get("error") or response.get("body"))
+        content = response["body"]["choices"][0]["message"]["content"]
+        return dict(dirtyjson.loads(content))
+
+    async def get_results(self, batch_id: str) -> Optional[Dict[str, dict | Exception]]:
+        batch = await self.client.batches.retrieve(batch_id)
+        if batch.status in ("validating", "in_progress", "finalizing", "cancelling"):
+            return None
+
+        results = {}
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if not file_id:
+                continue
+            content = await self.client.files.content(file_id)
+            for line in content.text.splitlines():
+                if line.strip():
+                    item = json.loads(line)
+                    results[item["custom_id"]] = self._parse_result(item)
+        return results
+
+    async def cancel(self, batch_id: str):
+        await self.client.batches.cancel(batch_id)
+
+
+class AnthropicBatchBackend:
+    """Runs structured requests through Anthropic Message Batches."""
+
+    def __init__(self, client: Optional[AsyncAnthropic] = None):
+        self.client = client or LLM_CLIENT_POOL.get_client(
+            LLMProvider.ANTHROPIC,
+            None,
+            get_anthropic_api_key_env(),
+            lambda: AsyncAnthropic(max_retries=0),
+        ).with_options(max_retries=2)
+
+    def _get_request(self, request: LLMBatchRequest) -> dict:
+        system_prompt = ""
+        messages = []
+        for message in request.messages:
+            if isinstance(message, LLMSystemMessage):
+                system_prompt = message.content
+            else:
+                messages.append(message.model_dump())
+        return {
+            "custom_id": request.custom_id,
+            "params": {
+                "model": request.model,
+                "system": system_prompt,
+                "messages": messages,
+                "max_tokens": 4000,
+                "tools": [
+                    {
+                        "name": "ResponseSchema",
+                        "description": "A response to the user's message",
+                        "input_schema": request.response_format,
+                    }
+                ],
+                "tool_choice": {"type": "tool", "name": "ResponseSchema"},
+            },
+        }
+
+    async def submit(self, requests: List[LLMBatchRequest]) -> str:
+        batch = await self.client.messages.batches.create(
+            requests=[self._get_request(request) for request in requests]
+        )
+        return batch.id
+
+    async def get_results(self, batch_id: str) -> Optional[Dict[str, dict | Exception]]:
+        batch = await self.client.messages.batches.retrieve(batch_id)
+        if batch.processing_status != "ended":
+            return None
+
+        results = {}
+        async for item in await self.client.messages.batches.results(batch_id):
+            result = Exception(f"Batch request {item.result.type}")
+            if item.result.type == "succeeded":
+                for content in item.result.message.content:
+                    if content.type == "tool_use" and content.name == "ResponseSchema":
+                        result = content.input
+            results[item.custom_id] = result
+        return results
+
+    async def cancel(self, batch_id: str):
+        await self.client.messages.batches.cancel(batch_id)
+
+
+def is_llm_batch_api_supported() -> bool:
+    return get_llm_provider() in (LLMProvider.OPENAI, LLMProvider.ANTHROPIC)
+
+
+def get_llm_batch_backend():
+    match get_llm_provider():
+        case LLMProvider.OPENAI:
+            return OpenAIBatchBackend()
+        case LLMProvider.ANTHROPIC:
+            return AnthropicBatchBackend()
+    raise HTTPException(
+        status_code=400,
+        detail="Batch API is only supported with OpenAI and Anthropic",
+    )
+
+
+class LLMBatchService:
+    """
+    Collects structured LLM requests and runs them through the provider batch
+    API, which is cheaper but can take hours to complete.
+    Requests made within the collect interval are submitted as one batch, which
+    is polled until it ends. Each caller waits for its own result, so the
+    slide generation path stays the same as with regular calls.
+    """
+
+    collect_interval = 10
+    poll_interval = 60
+    max_batch_size = 1000
+
+    def __init__(self, backend=None):
+        self._backend = backend
+        self._pending: List[LLMBatchRequest] = []
+        self._request_ids = itertools.count()
+        self._collector: Optional[asyncio.Task] = None
+        self._batches = set()
+
+    async def generate_structured(
+        self, model: str, messages: List[LLMMessage], response_format: dict
+    ) -> dict:
+        request = LLMBatchRequest(
+            f"request-{next(self._request_ids)}",
+            model,
+            messages,
+            response_format,
+            asyncio.get_running_loop().create_future(),
+        )
+        self._pending.append(request)
+        if not self._collector or self._collector.done():
+            self._collector = asyncio.create_task(self._collect())
+        return await request.future
+
+    async def _collect(self):
+        while self._pending:
+            started_at = time.monotonic()
+            while (
+                len(self._pending) < self.max_batch_size
+                and time.monotonic() - started_at < self.collect_interval
+            ):
+                await asyncio.sleep(min(1, self.collect_interval))
+
+            requests = self._pending[: self.max_batch_size]
+            self._pending = self._pending[self.max_batch_size :]
+            requests = [request for request in requests if not request.future.done()]
+            if requests:
+                task = asyncio.create_task(self._run_batch(requests))
+                self._batches.add(task)
+                task.add_done_callback(self._batches.discard)
+
+    async def _run_batch(self, requests: List[LLMBatchRequest]):
+        try:
+            backend = self._backend or get_llm_batch_backend()
+            batch_id = await backend.submit(requests)
+            print(f"Submitted LLM batch {batch_id} with {len(requests)} requests")
+
+            results = None
+            while results is None:
+                await asyncio.sleep(self.poll_interval)
+                if all(request.future.done() for request in requests):
+                    # Nobody is waiting for the results anymore
+                    await backend.cancel(batch_id)
+                    return
+                results = await backend.get_results(batch_id)
+        except Exception as e:
+            print(f"LLM batch failed: {e}")
+            for request in requests:
+                if not request.future.done():
+                    request.future.set_exception(e)
+            return
+
+        for request in requests:
+            if request.future.done():
+                continue
+            result = results.get(request.custom_id)
+            if isinstance(result, dict):
+                request.future.set_result(result)
+            else:
+                request.future.set_exception(
+                    HTTPException(
+                        status_code=400,
+                        detail=f"LLM batch {batch_id} did not return a result: {result}",
+                    )
+                )
+
+
+LLM_BATCH_SERVICE = LLMBatchService()
@@ -1,9 +1,22 @@
 import asyncio
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
 import dirtyjson
 import json
-from typing import AsyncGenerator, List, Optional
+import time
+import traceback
+from typing import (
+    AsyncGenerator,
+    Awaitable,
+    Callable,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+)
 from fastapi import HTTPException
-from openai import AsyncOpenAI
+from openai import NOT_GIVEN, AsyncOpenAI
+from pydantic import BaseModel
 from openai.types.chat.chat_completion_chunk import (
     ChatCompletionChunk as OpenAIChatCompletionChunk,
 )
@@ -39,8 +52,23 @@ from models.llm_tool_call import (
     OpenAIToolCallFunction,
 )
 from models.llm_tools import LLMDynamicTool, LLMTool
+from models.llm_usage import LLMUsage
+from services.llm_client_pool import LLM_CLIENT_POOL
+from services.llm_failover import LLM_FAILOVER
+from services.llm_hedging import LLM_HEDGING
+from services.llm_metrics import LLM_METRICS
+from services.llm_rate_limiter import (
+    LLM_RATE_LIMITER,
+    estimate_tokens,
+    record_llm_rate_limit_usage,
+)
+from services.llm_request_coalescer import (
+    LLM_REQUEST_COALESCER,
+    get_llm_request_key,
+)
+from services.llm_request_scheduler import LLM_REQUEST_SCHEDULER
 from services.llm_tool_calls_handler import LLMToolCallsHandler
-from utils.async_iterator import iterator_to_async
+from utils.incremental_json_parser import IncrementalJsonParser, JsonStreamEvent
 from utils.dummy_functions import do_nothing_async
 from utils.get_env import (
     get_anthropic_api_key_env,
@@ -53,20 +81,45 @@ from utils.get_env import (
     get_tool_calls_env,
     get_web_grounding_env,
 )
-from utils.llm_provider import get_llm_provider, get_model
+from utils.llm_provider import (
+    get_llm_failover_providers,
+    get_llm_provider,
+    get_model_for_provider,
+)
 from utils.parsers import parse_bool_or_none
+from utils.schema_cache import get_strict_json_schema
 from utils.schema_utils import (
-    ensure_strict_json_schema,
     flatten_json_schema,
+    is_valid_for_schema,
     remove_titles_from_schema,
 )
 
+T = TypeVar("T")
+
+# Usage of the coalesced call running in the current context
+_llm_call_usage: ContextVar[Optional[LLMUsage]] = ContextVar(
+    "llm_call_usage", default=None
+)
+
 
 class LLMClient:
-    def __init__(self):
-        self.llm_provider = get_llm_provider()
+    def __init__(
+        self,
+        llm_provider: Optional[LLMProvider] = None,
+        call_type: Optional[str] = None,
+        coalesce_key: Optional[str] = None,
+    ):
+        self.llm_provider = llm_provider or get_llm_provider()
+        # Groups calls with similar latency, e.g. slide content calls
+        self.call_type = call_type
+        # Identical in-flight calls share one request, calls that need their
+        # own response to the same prompt (e.g. variants) set distinct keys
+        self.coalesce_key = coalesce_key
         self._client = self._get_client()
         self.tool_calls_handler = LLMToolCallsHandler(self)
+        self.usage = LLMUsage()
+        # Provider and model that served the last call
+        self.served_by: Optional[str] = None
 
     # ? Use tool calls
     def use_tool_calls_for_structured_output(self) -> bool:
@@ -107,46 +160,274 @@ class LLMClient:
                 )
 
     def _get_openai_client(self):
-        if not get_openai_api_key_env():
+        api_key = get_openai_api_key_env()
+        if not api_key:
             raise HTTPException(
                 status_code=400,
                 detail="OpenAI API Key is not set",
             )
-        return AsyncOpenAI(timeout=180.0)
+        return LLM_CLIENT_POOL.get_client(
+            self.llm_provider,
+            None,
+            api_key,
+            lambda: AsyncOpenAI(timeout=180.0, max_retries=0),
+        )
 
     def _get_google_client(self):
-        if not get_google_api_key_env():
+        api_key = get_google_api_key_env()
+        if not api_key:
             raise HTTPException(
                 status_code=400,
                 detail="Google API Key is not set",
             )
-        return genai.Client()
+        return LLM_CLIENT_POOL.get_client(
+            self.llm_provider, None, api_key, lambda: genai.Client()
+        )
 
     def _get_anthropic_client(self):
-        if not get_anthropic_api_key_env():
+        api_key = get_anthropic_api_key_env()
+        if not api_key:
             raise HTTPException(
                 status_code=400,
                 detail="Anthropic API Key is not set",
             )
-        return AsyncAnthropic()
+        return LLM_CLIENT_POOL.get_client(
+            self.llm_provider, None, api_key, lambda: AsyncAnthropic(max_retries=0)
+        )
 
     def _get_ollama_client(self):
-        return AsyncOpenAI(
-            base_url=(get_ollama_url_env() or "http://localhost:11434") + "/v1",
-            api_key="ollama",
+        base_url = (get_ollama_url_env() or "http://localhost:11434") + "/v1"
+        return LLM_CLIENT_POOL.get_client(
+            self.llm_provider,
+            base_url,
+            None,
+            lambda: AsyncOpenAI(base_url=base_url, api_key="ollama", max_retries=0),
         )
 
     def _get_custom_client(self):
-        if not get_custom_llm_url_env():
+        base_url = get_custom_llm_url_env()
+        if not base_url:
             raise HTTPException(
                 status_code=400,
                 detail="Custom LLM URL is not set",
             )
-        return AsyncOpenAI(
-            base_url=get_custom_llm_url_env(),
-            api_key=get_custom_llm_api_key_env() or "null",
+        api_key = get_custom_llm_api_key_env() or "null"
+        return LLM_CLIENT_POOL.get_client(
+            self.llm_provider,
+            base_url,
+            api_key,
+            lambda: AsyncOpenAI(base_url=base_url, api_key=api_key, max_retries=0),
+        )
+
+    # ? Failover
+    def _get_failover_client(
+        self, llm_provider: LLMProvider, model: str
+    ) -> Tuple["LLMClient", str]:
+        if llm_provider == self.llm_provider:
+            return self, model
+        provider_model = get_model_for_provider(llm_provider)
+        if not provider_model:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Model for {llm_provider.value} is not set",
+            )
+        client = LLMClient(llm_provider, self.call_type)
+        client.usage = self.usage
+        return client, provider_model
+
+    @asynccontextmanager
+    async def _observe_call(self, method: str, model: str):
+        started_at = time.monotonic()
+        status = "error"
+        try:
+            yield
+            status = "success"
+        except (asyncio.CancelledError, GeneratorExit):
+            status = "cancelled"
+            raise
+        finally:
+            LLM_METRICS.observe_call(
+                self.llm_provider.value,
+                model,
+                self.call_type,
+                method,
+                status,
+                time.monotonic() - started_at,
+            )
+
+    def _observe_attempt(self, attempt: int, client: "LLMClient", model: str):
+        if attempt > 1:
+            LLM_METRICS.retries.inc(
+                client.llm_provider.value, model, self.call_type or "other"
+            )
+
+    def _observe_tool_call_depth(self, client: "LLMClient", model: str, depth: int):
+        LLM_METRICS.tool_call_depth.observe(
+            client.llm_provider.value, model, self.call_type or "other", value=depth
+        )
+
+    async def _run_with_failover(
+        self,
+        method: str,
+        model: str,
+        call: Callable[["LLMClient", str], Awaitable[T]],
+        llm_providers: Optional[List[LLMProvider]] = None,
+        estimated_tokens: int = 0,
+    ) -> T:
+        attempt = 0
+
+        async def run(llm_provider: LLMProvider) -> T:
+            nonlocal attempt
+            attempt += 1
+            client, provider_model = self._get_failover_client(llm_provider, model)
+            self._observe_attempt(attempt, client, provider_model)
+            tool_call_rounds = client.tool_calls_handler.tool_call_rounds
+            async with LLM_RATE_LIMITER.acquire(
+                llm_provider.value, provider_model, estimated_tokens
+            ):
+                async with client._observe_call(method, provider_model):
+                    result = await call(client, provider_model)
+            self._observe_tool_call_depth(
+                client,
+                provider_model,
+                client.tool_calls_handler.tool_call_rounds - tool_call_rounds,
+            )
+            self.served_by = f"{llm_provider.value}/{provider_model}"
+            return result
+
+        return await LLM_FAILOVER.run(
+            llm_providers or self._get_failover_providers(), run
+        )
+
+    async def _run_with_hedging(
+        self,
+        method: str,
+        model: str,
+        call: Callable[["LLMClient", str], Awaitable[T]],
+        is_valid: Callable[[T], bool] = lambda result: result is not None,
+        estimated_tokens: int = 0,
+    ) -> T:
+        # Slow calls are hedged on the first fallback provider, if there is one
+        llm_providers = self._get_failover_providers()
+        call_type = f"{method}:{self.call_type}" if self.call_type else method
+
+        async def hedge() -> T:
+            LLM_METRICS.hedged_calls.inc(self.call_type or "other")
+            if len(llm_providers) > 1:
+                return await self._run_with_failover(
+                    method, model, call, llm_providers[1:], estimated_tokens
+                )
+            # Both calls would run on this client and share its tool call state,
+            # so the hedge gets a client of its own
+            client = LLMClient(self.llm_provider, self.call_type)
+            client.usage = self.usage
+            result = await client._run_with_failover(
+                method, model, call, llm_providers, estimated_tokens
+            )
+            self.served_by = client.served_by
+            return result
+
+        return await LLM_HEDGING.run(
+            call_type,
+            lambda: self._run_with_failover(
+                method, model, call, llm_providers, estimated_tokens
+            ),
+            hedge,
+            is_valid,
         )
 
+    async def _stream_with_failover(
+        self,
+        method: str,
+        model: str,
+        open_stream: Callable[["LLMClient", str], AsyncGenerator[str, None]],
+        estimated_tokens: int = 0,
+    ) -> AsyncGenerator[str, None]:
+        attempt = 0
+
+        async def stream(llm_provider: LLMProvider) -> AsyncGenerator[str, None]:
+            nonlocal attempt
+            attempt += 1
+            client, provider_model = self._get_failover_client(llm_provider, model)
+            self._observe_attempt(attempt, client, provider_model)
+            tool_call_rounds = client.tool_calls_handler.tool_call_rounds
+            started_at = time.monotonic()
+            first_chunk = True
+            async with LLM_RATE_LIMITER.acquire(
+                llm_provider.value, provider_model, estimated_tokens
+            ):
+                async with client._observe_call(method, provider_model):
+                    async for chunk in open_stream(client, provider_model):
+                        if first_chunk:
+                            first_chunk = False
+                            LLM_METRICS.time_to_first_token.observe(
+                                llm_provider.value,
+                                provider_model,
+                                self.call_type or "other",
+                                value=time.monotonic() - started_at,
+                            )
+                        yield chunk
+            self._observe_tool_call_depth(
+                client,
+                provider_model,
+                client.tool_calls_handler.tool_call_rounds - tool_call_rounds,
+            )
+            self.served_by = f"{llm_provider.value}/{provider_model}"
+
+        llm_providers = self._get_failover_providers()
+        async for chunk in LLM_FAILOVER.stream(llm_providers, stream):
+            yield chunk
+
+    def _get_request_key(
+        self,
+        method: str,
+        model: str,
+        messages: List[LLMMessage],
+        response_format: Optional[dict] = None,
+        tools: Optional[List[type[LLMTool] | LLMDynamicTool]] = None,
+        **options,
+    ) -> str:
+        return get_llm_request_key(
+            method,
+            self.llm_provider.value,
+            model,
+            messages,
+            response_format,
+            tools,
+            coalesce_key=self.coalesce_key,
+            **options,
+        )
+
+    async def _run_coalesced(self, key: str, call: Callable[[], Awaitable[T]]) -> T:
+        """
+        Runs the call once for identical in-flight calls. Callers that waited on
+        the call of another client get its provider and usage, as if they had
+        sent the request themselves.
+        """
+
+        async def run() -> Tuple[T, int, Optional[str], LLMUsage]:
+            usage = LLMUsage()
+            token = _llm_call_usage.set(usage)
+            try:
+                result = await call()
+            finally:
+                _llm_call_usage.reset(token)
+            return result, id(self), self.served_by, usage
+
+        result, client_id, served_by, usage = await LLM_REQUEST_COALESCER.run(
+            key, run
+        )
+        if client_id != id(self):
+            self.served_by = served_by
+            self.usage.add(usage)
+        return result
+
+    def _get_failover_providers(self) -> List[LLMProvider]:
+        llm_providers = get_llm_failover_providers()
+        if self.llm_provider not in llm_providers:
+            return [self.llm_provider]
+        return llm_providers[llm_providers.index(self.llm_provider) :]
+
     # ? Prompts
     def _get_system_prompt(self, messages: List[LLMMessage]) -> str:
         for message in messages:
@@ -186,6 +467,80 @@ class LLMClient:
             message for message in messages if not isinstance(message, LLMSystemMessage)
         ]
 
+    def _get_anthropic_system_prompt(self, messages: List[LLMMessage]) -> str | list:
+        system_prompt = self._get_system_prompt(messages)
+        if not system_prompt:
+            return system_prompt
+        # Cache breakpoint after the tools and system prompt, which are the
+        # stable prefix of every call
+        return [
+            {
+                "type": "text",
+                "text": system_prompt,
+                "cache_control": {"type": "ephemeral"},
+            }
+        ]
+
+    # ? Usage
+    def _record_usage(self, model: str, usage: LLMUsage):
+        self.usage.add(usage)
+        call_usage = _llm_call_usage.get()
+        if call_usage is not None:
+            call_usage.add(usage)
+        record_llm_rate_limit_usage(usage.input_tokens + usage.output_tokens)
+        LLM_METRICS.observe_usage(self.llm_provider.value, model, self.call_type, usage)
+
+    def _record_openai_usage(self, model: str, usage):
+        if not usage:
+            return
+        prompt_tokens_details = getattr(usage, "prompt_tokens_details", None)
+        self._record_usage(
+            model,
+            LLMUsage(
+                input_tokens=usage.prompt_tokens or 0,
+                output_tokens=usage.completion_tokens or 0,
+                cached_input_tokens=(
+                    getattr(prompt_tokens_details, "cached_tokens", None) or 0
+                ),
+            ),
+        )
+
+    def _record_google_usage(self, model: str, usage_metadata):
+        if not usage_metadata:
+            return
+        self._record_usage(
+            model,
+            LLMUsage(
+                input_tokens=usage_metadata.prompt_token_count or 0,
+                output_tokens=usage_metadata.candidates_token_count or 0,
+                cached_input_tokens=usage_metadata.cached_content_token_count or 0,
+            ),
+        )
+
+    def _record_anthropic_usage(self, model: str, usage):
+        if not usage:
+            return
+        cached_input_tokens = usage.cache_read_input_tokens or 0
+        cache_creation_input_tokens = usage.cache_creation_input_tokens or 0
+        self._record_usage(
+            model,
+            LLMUsage(
+                # Anthropic input tokens exclude tokens read from or written to cache
+                input_tokens=usage.input_tokens
+                + cached_input_tokens
+                + cache_creation_input_tokens,
+                output_tokens=usage.output_tokens or 0,
+                cached_input_tokens=cached_input_tokens,
+                cache_creation_input_tokens=cache_creation_input_tokens,
+            ),
+        )
+
+    def _get_openai_stream_options(self):
+        # Compatible servers may not support stream options
+        if self.llm_provider != LLMProvider.OPENAI:
+            return NOT_GIVEN
+        return {"include_usage": True}
+
     # ? Generate Unstructured Content
     async def _generate_openai(
         self,
@@ -204,6 +559,7 @@ class LLMClient:
             tools=tools,
             extra_body=extra_body,
         )
+        self._record_openai_usage(model, response.usage)
         tool_calls = response.choices[0].message.tool_calls
         if tool_calls:
             parsed_tool_calls = [
@@ -255,8 +611,7 @@ class LLMClient:
         if tools:
             google_tools = [GoogleTool(function_declarations=[tool]) for tool in tools]
 
-        response = await asyncio.to_thread(
-            client.models.generate_content,
+        response = await client.aio.models.generate_content(
             model=model,
             contents=self._get_google_messages(messages),
             config=GenerateContentConfig(
@@ -267,6 +622,7 @@ class LLMClient:
             ),
         )
 
+        self._record_google_usage(model, response.usage_metadata)
         content = response.candidates[0].content
         response_parts = content.parts
 
@@ -321,7 +677,7 @@ class LLMClient:
 
         response: AnthropicMessage = await client.messages.create(
             model=model,
-            system=self._get_system_prompt(messages),
+            system=self._get_anthropic_system_prompt(messages),
             messages=[
                 message.model_dump()
                 for message in self._get_anthropic_messages(messages)
@@ -329,6 +685,7 @@ class LLMClient:
             tools=tools,
             max_tokens=max_tokens or 4000,
         )
+        self._record_anthropic_usage(model, response.usage)
         text_content = None
         tool_calls: List[AnthropicToolCall] = []
         for content in response.content:
@@ -397,46 +754,67 @@ class LLMClient:
             depth=depth,
         )
 
-    async def generate(
+    async def _generate(
         self,
         model: str,
         messages: List[LLMMessage],
         max_tokens: Optional[int] = None,
         tools: Optional[List[type[LLMTool] | LLMDynamicTool]] = None,
-    ):
+    ) -> str | None:
         parsed_tools = self.tool_calls_handler.parse_tools(tools)
 
-        content = None
-        match self.llm_provider:
-            case LLMProvider.OPENAI:
-                content = await self._generate_openai(
-                    model=model,
-                    messages=messages,
-                    max_tokens=max_tokens,
-                    tools=parsed_tools,
-                )
-            case LLMProvider.GOOGLE:
-                content = await self._generate_google(
-                    model=model,
-                    messages=messages,
-                    max_tokens=max_tokens,
-                    tools=parsed_tools,
-                )
-            case LLMProvider.ANTHROPIC:
-                content = await self._generate_anthropic(
-                    model=model,
-                    messages=messages,
-                    max_tokens=max_tokens,
-                    tools=parsed_tools,
-                )
-            case LLMProvider.OLLAMA:
-                content = await self._generate_ollama(
-                    model=model, messages=messages, max_tokens=max_tokens
-                )
-            case LLMProvider.CUSTOM:
-                content = await self._generate_custom(
-                    model=model, messages=messages, max_tokens=max_tokens
-                )
+        async with LLM_REQUEST_SCHEDULER.slot():
+            match self.llm_provider:
+                case LLMProvider.OPENAI:
+                    return await self._generate_openai(
+                        model=model,
+                        messages=messages,
+                        max_tokens=max_tokens,
+                        tools=parsed_tools,
+                    )
+                case LLMProvider.GOOGLE:
+                    return await self._generate_google(
+                        model=model,
+                        messages=messages,
+                        max_tokens=max_tokens,
+                        tools=parsed_tools,
+                    )
+                case LLMProvider.ANTHROPIC:
+                    return await self._generate_anthropic(
+                        model=model,
+                        messages=messages,
+                        max_tokens=max_tokens,
+                        tools=parsed_tools,
+                    )
+                case LLMProvider.OLLAMA:
+                    return await self._generate_ollama(
+                        model=model, messages=messages, max_tokens=max_tokens
+                    )
+                case LLMProvider.CUSTOM:
+                    return await self._generate_custom(
+                        model=model, messages=messages, max_tokens=max_tokens
+                    )
+
+    async def generate(
+        self,
+        model: str,
+        messages: List[LLMMessage],
+        max_tokens: Optional[int] = None,
+        tools: Optional[List[type[LLMTool] | LLMDynamicTool]] = None,
+    ):
+        content = await self._run_coalesced(
+            self._get_request_key(
+                "generate", model, messages, tools=tools, max_tokens=max_tokens
+            ),
+            lambda: self._run_with_hedging(
+                "generate",
+                model,
+                lambda client, provider_model: client._generate(
+                    provider_model, messages, max_tokens, tools
+                ),
+                estimated_tokens=estimate_tokens(messages, max_tokens=max_tokens),
+            ),
+        )
         if content is None:
             raise HTTPException(
                 status_code=400,
@@ -464,11 +842,7 @@ class LLMClient:
             self.use_tool_calls_for_structured_output()
         )
         if strict and depth == 0:
-            response_schema = ensure_strict_json_schema(
-                response_schema,
-                path=(),
-                root=response_schema,
-            )
+            response_schema = get_strict_json_schema(response_schema)
         if use_tool_calls_for_structured_output and depth == 0:
             if all_tools is None:
                 all_tools = []
@@ -505,6 +879,7 @@ class LLMClient:
             tools=all_tools,
             extra_body=extra_body,
         )
+        self._record_openai_usage(model, response.usage)
 
         content = response.choices[0].message.content
 
@@ -587,8 +962,7 @@ class LLMClient:
                 )
             )
 
-        response = await asyncio.to_thread(
-            client.models.generate_content,
+        response = await client.aio.models.generate_content(
             model=model,
             contents=self._get_google_messages(messages),
             config=GenerateContentConfig(
@@ -609,6 +983,7 @@ class LLMClient:
             ),
         )
 
+        self._record_google_usage(model, response.usage_metadata)
         content = response.candidates[0].content
         response_parts = content.parts
         text_content = None
@@ -671,7 +1046,7 @@ class LLMClient:
         client: AsyncAnthropic = self._client
         response: AnthropicMessage = await client.messages.create(
             model=model,
-            system=self._get_system_prompt(messages),
+            system=self._get_anthropic_system_prompt(messages),
             messages=[
                 message.model_dump()
                 for message in self._get_anthropic_messages(messages)
@@ -686,6 +1061,7 @@ class LLMClient:
                 *(tools or []),
             ],
         )
+        self._record_anthropic_usage(model, response.usage)
         tool_calls: List[AnthropicToolCall] = []
         for content in response.content:
             if content.type == "tool_use":
@@ -766,7 +1142,7 @@ class LLMClient:
             depth=depth,
         )
 
-    async def generate_structured(
+    async def _generate_structured(
         self,
         model: str,
         messages: List[LLMMessage],
@@ -774,52 +1150,87 @@ class LLMClient:
         strict: bool = False,
         tools: Optional[List[type[LLMTool] | LLMDynamicTool]] = None,
         max_tokens: Optional[int] = None,
-    ) -> dict:
+    ) -> dict | None:
         parsed_tools = self.tool_calls_handler.parse_tools(tools)
 
-        content = None
-        match self.llm_provider:
-            case LLMProvider.OPENAI:
-                content = await self._generate_openai_structured(
-                    model=model,
-                    messages=messages,
-                    response_format=response_format,
-                    strict=strict,
-                    tools=parsed_tools,
-                    max_tokens=max_tokens,
-                )
-            case LLMProvider.GOOGLE:
-                content = await self._generate_google_structured(
-                    model=model,
-                    messages=messages,
-                    response_format=response_format,
-                    tools=parsed_tools,
-                    max_tokens=max_tokens,
-                )
-            case LLMProvider.ANTHROPIC:
-                content = await self._generate_anthropic_structured(
-                    model=model,
-                    messages=messages,
-                    response_format=response_format,
-                    tools=parsed_tools,
-                    max_tokens=max_tokens,
-                )
-            case LLMProvider.OLLAMA:
-                content = await self._generate_ollama_structured(
-                    model=model,
-                    messages=messages,
-                    response_format=response_format,
-                    strict=strict,
-                    max_tokens=max_tokens,
-                )
-            case LLMProvider.CUSTOM:
-                content = await self._generate_custom_structured(
-                    model=model,
-                    messages=messages,
-                    response_format=response_format,
+        async with LLM_REQUEST_SCHEDULER.slot():
+            match self.llm_provider:
+                case LLMProvider.OPENAI:
+                    return await self._generate_openai_structured(
+                        model=model,
+                        messages=messages,
+                        response_format=response_format,
+                        strict=strict,
+                        tools=parsed_tools,
+                        max_tokens=max_tokens,
+                    )
+                case LLMProvider.GOOGLE:
+                    return await self._generate_google_structured(
+                        model=model,
+                        messages=messages,
+                        response_format=response_format,
+                        tools=parsed_tools,
+                        max_tokens=max_tokens,
+                    )
+                case LLMProvider.ANTHROPIC:
+                    return await self._generate_anthropic_structured(
+                        model=model,
+                        messages=messages,
+                        response_format=response_format,
+                        tools=parsed_tools,
+                        max_tokens=max_tokens,
+                    )
+                case LLMProvider.OLLAMA:
+                    return await self._generate_ollama_structured(
+                        model=model,
+                        messages=messages,
+                        response_format=response_format,
+                        strict=strict,
+                        max_tokens=max_tokens,
+                    )
+                case LLMProvider.CUSTOM:
+                    return await self._generate_custom_structured(
+                        model=model,
+                        messages=messages,
+                        response_format=response_format,
+                        strict=strict,
+                        max_tokens=max_tokens,
+                    )
+
+    async def generate_structured(
+        self,
+        model: str,
+        messages: List[LLMMessage],
+        response_format: dict,
+        strict: bool = False,
+        tools: Optional[List[type[LLMTool] | LLMDynamicTool]] = None,
+        max_tokens: Optional[int] = None,
+    ) -> dict:
+        content = await self._run_coalesced(
+            self._get_request_key(
+                "generate_structured",
+                model,
+                messages,
+                response_format,
+                tools,
+                strict=strict,
+                max_tokens=max_tokens,
+            ),
+            lambda: self._run_with_hedging(
+                "generate_structured",
+                model,
+                lambda client, provider_model: client._generate_structured(
+                    provider_model,
+                    messages,
+                    response_format,
                     strict=strict,
+                    tools=tools,
                     max_tokens=max_tokens,
-                )
+                ),
+                lambda content: is_valid_for_schema(content, response_format),
+                estimate_tokens(messages, response_format, max_tokens),
+            ),
+        )
         if content is None:
             raise HTTPException(
                 status_code=400,
@@ -828,6 +1239,12 @@ class LLMClient:
         return content
 
     # ? Stream Unstructured Content
+    async def _schedule_stream(self, stream: AsyncGenerator[str, None]):
+        # Holds a scheduler slot while the stream is being consumed
+        async with LLM_REQUEST_SCHEDULER.slot():
+            async for chunk in stream:
+                yield chunk
+
     async def _stream_openai(
         self,
         model: str,
@@ -851,8 +1268,11 @@ class LLMClient:
             tools=tools,
             extra_body=extra_body,
             stream=True,
+            stream_options=self._get_openai_stream_options(),
         ):
             event: OpenAIChatCompletionChunk = event
+            if event.usage:
+                self._record_openai_usage(model, event.usage)
             if not event.choices:
                 continue
 
@@ -941,7 +1361,8 @@ class LLMClient:
 
         generated_contents = []
         tool_calls: List[GoogleToolCall] = []
-        async for event in iterator_to_async(client.models.generate_content_stream)(
+        usage_metadata = None
+        async for event in await client.aio.models.generate_content_stream(
             model=model,
             contents=self._get_google_messages(messages),
             config=GenerateContentConfig(
@@ -951,6 +1372,8 @@ class LLMClient:
                 max_output_tokens=max_tokens,
             ),
         ):
+            # Usage metadata is cumulative, the last event holds the totals
+            usage_metadata = event.usage_metadata or usage_metadata
             if not (
                 event.candidates
                 and event.candidates[0].content
@@ -972,6 +1395,7 @@ class LLMClient:
                             arguments=each_part.function_call.args,
                         )
                     )
+        self._record_google_usage(model, usage_metadata)
 
         if tool_calls:
             tool_call_messages = await self.tool_calls_handler.handle_tool_calls_google(
@@ -1010,7 +1434,7 @@ class LLMClient:
         tool_calls: List[AnthropicToolCall] = []
         async with client.messages.stream(
             model=model,
-            system=self._get_system_prompt(messages),
+            system=self._get_anthropic_system_prompt(messages),
             messages=[
                 message.model_dump()
                 for message in self._get_anthropic_messages(messages)
@@ -1037,6 +1461,9 @@ class LLMClient:
                         )
                     )
 
+            final_message = await stream.get_final_message()
+            self._record_anthropic_usage(model, final_message.usage)
+
         if tool_calls:
             tool_call_messages = (
                 await self.tool_calls_handler.handle_tool_calls_anthropic(tool_calls)
@@ -1088,7 +1515,7 @@ class LLMClient:
             depth=depth,
         )
 
-    def stream(
+    def _stream(
         self,
         model: str,
         messages: List[LLMMessage],
@@ -1099,35 +1526,58 @@ class LLMClient:
 
         match self.llm_provider:
             case LLMProvider.OPENAI:
-                return self._stream_openai(
+                stream = self._stream_openai(
                     model=model,
                     messages=messages,
                     max_tokens=max_tokens,
                     tools=parsed_tools,
                 )
             case LLMProvider.GOOGLE:
-                return self._stream_google(
+                stream = self._stream_google(
                     model=model,
                     messages=messages,
                     max_tokens=max_tokens,
                     tools=parsed_tools,
                 )
             case LLMProvider.ANTHROPIC:
-                return self._stream_anthropic(
+                stream = self._stream_anthropic(
                     model=model,
                     messages=messages,
                     max_tokens=max_tokens,
                     tools=parsed_tools,
                 )
             case LLMProvider.OLLAMA:
-                return self._stream_ollama(
+                stream = self._stream_ollama(
                     model=model, messages=messages, max_tokens=max_tokens
                 )
             case LLMProvider.CUSTOM:
-                return self._stream_custom(
+                stream = self._stream_custom(
                     model=model, messages=messages, max_tokens=max_tokens
                 )
 
+        return self._schedule_stream(stream)
+
+    def stream(
+        self,
+        model: str,
+        messages: List[LLMMessage],
+        max_tokens: Optional[int] = None,
+        tools: Optional[List[type[LLMTool] | LLMDynamicTool]] = None,
+    ):
+        return LLM_REQUEST_COALESCER.stream(
+            self._get_request_key(
+                "stream", model, messages, tools=tools, max_tokens=max_tokens
+            ),
+            lambda: self._stream_with_failover(
+                "stream",
+                model,
+                lambda client, provider_model: client._stream(
+                    provider_model, messages, max_tokens, tools
+                ),
+                estimate_tokens(messages, max_tokens=max_tokens),
+            ),
+        )
+
     # ? Stream Structured Content
     async def _stream_openai_structured(
         self,
@@ -1149,11 +1599,7 @@ class LLMClient:
             self.use_tool_calls_for_structured_output()
         )
         if strict and depth == 0:
-            response_schema = ensure_strict_json_schema(
-                response_schema,
-                path=(),
-                root=response_schema,
-            )
+            response_schema = get_strict_json_schema(response_schema)
 
         if use_tool_calls_for_structured_output and depth == 0:
             if all_tools is None:
@@ -1198,8 +1644,11 @@ class LLMClient:
             ),
             extra_body=extra_body,
             stream=True,
+            stream_options=self._get_openai_stream_options(),
         ):
             event: OpenAIChatCompletionChunk = event
+            if event.usage:
+                self._record_openai_usage(model, event.usage)
             if not event.choices:
                 continue
 
@@ -1313,7 +1762,8 @@ class LLMClient:
         generated_contents = []
         tool_calls: List[GoogleToolCall] = []
         has_response_schema_tool_call = False
-        async for event in iterator_to_async(client.models.generate_content_stream)(
+        usage_metadata = None
+        async for event in await client.aio.models.generate_content_stream(
             model=model,
             contents=parsed_messages,
             config=GenerateContentConfig(
@@ -1333,6 +1783,8 @@ class LLMClient:
                 max_output_tokens=max_tokens,
             ),
         ):
+            # Usage metadata is cumulative, the last event holds the totals
+            usage_metadata = event.usage_metadata or usage_metadata
             if not (
                 event.candidates
                 and event.candidates[0].content
@@ -1359,6 +1811,7 @@ class LLMClient:
                             arguments=each_part.function_call.args,
                         )
                     )
+        self._record_google_usage(model, usage_metadata)
 
         if tool_calls and not has_response_schema_tool_call:
             tool_call_messages = await self.tool_calls_handler.handle_tool_calls_google(
@@ -1400,7 +1853,7 @@ class LLMClient:
         has_response_schema_tool_call = False
         async with client.messages.stream(
             model=model,
-            system=self._get_system_prompt(messages),
+            system=self._get_anthropic_system_prompt(messages),
             messages=[
                 message.model_dump()
                 for message in self._get_anthropic_messages(messages)
@@ -1447,6 +1900,9 @@ class LLMClient:
                         )
                     )
 
+            final_message = await stream.get_final_message()
+            self._record_anthropic_usage(model, final_message.usage)
+
         if tool_calls and not has_response_schema_tool_call:
             tool_call_messages = (
                 await self.tool_calls_handler.handle_tool_calls_anthropic(tool_calls)
@@ -1510,7 +1966,7 @@ class LLMClient:
             depth=depth,
         )
 
-    def stream_structured(
+    def _stream_structured(
         self,
         model: str,
         messages: List[LLMMessage],
@@ -1523,7 +1979,7 @@ class LLMClient:
 
         match self.llm_provider:
             case LLMProvider.OPENAI:
-                return self._stream_openai_structured(
+                stream = self._stream_openai_structured(
                     model=model,
                     messages=messages,
                     response_format=response_format,
@@ -1532,7 +1988,7 @@ class LLMClient:
                     max_tokens=max_tokens,
                 )
             case LLMProvider.GOOGLE:
-                return self._stream_google_structured(
+                stream = self._stream_google_structured(
                     model=model,
                     messages=messages,
                     response_format=response_format,
@@ -1540,7 +1996,7 @@ class LLMClient:
                     max_tokens=max_tokens,
                 )
             case LLMProvider.ANTHROPIC:
-                return self._stream_anthropic_structured(
+                stream = self._stream_anthropic_structured(
                     model=model,
                     messages=messages,
                     response_format=response_format,
@@ -1548,7 +2004,7 @@ class LLMClient:
                     max_tokens=max_tokens,
                 )
             case LLMProvider.OLLAMA:
-                return self._stream_ollama_structured(
+                stream = self._stream_ollama_structured(
                     model=model,
                     messages=messages,
                     response_format=response_format,
@@ -1556,7 +2012,7 @@ class LLMClient:
                     max_tokens=max_tokens,
                 )
             case LLMProvider.CUSTOM:
-                return self._stream_custom_structured(
+                stream = self._stream_custom_structured(
                     model=model,
                     messages=messages,
                     response_format=response_format,
@@ -1564,18 +2020,94 @@ class LLMClient:
                     max_tokens=max_tokens,
                 )
 
+        return self._schedule_stream(stream)
+
+    def stream_structured(
+        self,
+        model: str,
+        messages: List[LLMMessage],
+        response_format: dict,
+        strict: bool = False,
+        tools: Optional[List[type[LLMTool] | LLMDynamicTool]] = None,
+        max_tokens: Optional[int] = None,
+    ):
+        return LLM_REQUEST_COALESCER.stream(
+            self._get_request_key(
+                "stream_structured",
+                model,
+                messages,
+                response_format,
+                tools,
+                strict=strict,
+                max_tokens=max_tokens,
+            ),
+            lambda: self._stream_with_failover(
+                "stream_structured",
+                model,
+                lambda client, provider_model: client._stream_structured(
+                    provider_model,
+                    messages,
+                    response_format,
+                    strict=strict,
+                    tools=tools,
+                    max_tokens=max_tokens,
+                ),
+                estimate_tokens(messages, response_format, max_tokens),
+            ),
+        )
+
+    async def stream_structured_partial(
+        self,
+        model: str,
+        messages: List[LLMMessage],
+        response_format: dict,
+        strict: bool = False,
+        tools: Optional[List[type[LLMTool] | LLMDynamicTool]] = None,
+        max_tokens: Optional[int] = None,
+        response_model: Optional[type[BaseModel]] = None,
+    ) -> AsyncGenerator[JsonStreamEvent, None]:
+        """
+        Streams structured output as partial results instead of text chunks.
+        Yields every completed element of a top-level array and every completed
+        top-level field, validated with response model if given.
+        The last event has no key and holds the whole response.
+        """
+        parser = IncrementalJsonParser(response_model)
+        async for chunk in self.stream_structured(
+            model,
+            messages,
+            response_format,
+            strict=strict,
+            tools=tools,
+            max_tokens=max_tokens,
+        ):
+            for event in parser.feed(chunk):
+                yield event
+
+        try:
+            result = parser.get_result()
+        except Exception:
+            traceback.print_exc()
+            raise HTTPException(
+                status_code=400,
+                detail="LLM did not return valid structured output. Please try again.",
+            )
+        yield JsonStreamEvent(None, None, result)
+
     # ? Web search
     async def _search_openai(self, query: str) -> str:
         client: AsyncOpenAI = self._client
-        response = await client.responses.create(
-            model=get_model(),
-            tools=[
-                {
-                    "type": "web_search_preview",
-                }
-            ],
-            input=query,
-        )
+        model = get_model_for_provider(self.llm_provider)
+        async with self._observe_call("search", model):
+            response = await client.responses.create(
+                model=model,
+                tools=[
+                    {
+                        "type": "web_search_preview",
+                    }
+                ],
+                input=query,
+            )
         return response.output_text
 
     async def _search_google(self, query: str) -> str:
@@ -1583,25 +2115,28 @@ class LLMClient:
         grounding_tool = GoogleTool(google_search=GoogleSearch())
         config = GenerateContentConfig(tools=[grounding_tool])
 
-        response = await asyncio.to_thread(
-            client.models.generate_content,
-            model=get_model(),
-            contents=query,
-            config=config,
-        )
+        model = get_model_for_provider(self.llm_provider)
+        async with self._observe_call("search", model):
+            response = await client.aio.models.generate_content(
+                model=model,
+                contents=query,
+                config=config,
+            )
         return response.text
 
     async def _search_anthropic(self, query: str) -> str:
         client: AsyncAnthropic = self._client
 
-        response = await client.messages.create(
-            model=get_model(),
-            max_tokens=4000,
-            messages=[{"role": "user", "content": query}],
-            tools=[
-                {"type": "web_search_20250305", "name": "web_search", "max_uses": 1}
-            ],
-        )
+        model = get_model_for_provider(self.llm_provider)
+        async with self._observe_call("search", model):
+            response = await client.messages.create(
+                model=model,
+                max_tokens=4000,
+                messages=[{"role": "user", "content": query}],
+                tools=[
+                    {"type": "web_search_20250305", "name": "web_search", "max_uses": 1}
+                ],
+            )
         result = "\n".join(
             [each.text for each in response.content if each.type == "text"]
         )
@@ -0,0 +1,54 @@
+import asyncio
+import hashlib
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from enums.llm_provider import LLMProvider
+
+
+def get_api_key_hash(api_key: Optional[str]) -> Optional[str]:
+    if not api_key:
+        return None
+    return hashlib.sha256(api_key.encode()).hexdigest()
+
+
+def get_running_loop_or_none() -> Optional[asyncio.AbstractEventLoop]:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+class LLMClientPool:
+    """
+    Process wide pool of provider SDK clients, so calls reuse their connection
+    pools instead of opening new connections for every slide.
+    One client is kept per provider, keyed by its base URL and a hash of its
+    API key. It is rebuilt when the user config changes, and replaced clients
+    are left to in-flight calls instead of being closed.
+    """
+
+    def __init__(self):
+        self._clients: Dict[LLMProvider, Tuple[tuple, Any]] = {}
+
+    def get_client(
+        self,
+        provider: LLMProvider,
+        base_url: Optional[str],
+        api_key: Optional[str],
+        create_client: Callable[[], Any],
+    ) -> Any:
+        # Async clients are bound to the loop their connections were opened on
+        key = (base_url, get_api_key_hash(api_key), get_running_loop_or_none())
+        cached = self._clients.get(provider)
+        if cached and cached[0] == key:
+            return cached[1]
+
+        client = create_client()
+        self._clients[provider] = (key, client)
+        return client
+
+    def clear(self):
+        self._clients.clear()
+
+
+LLM_CLIENT_POOL = LLMClientPool()
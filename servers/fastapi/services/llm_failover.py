@@ -0,0 +1,192 @@
+import asyncio
+import random
+import time
+from typing import AsyncGenerator, Awaitable, Callable, Dict, List, Optional, TypeVar
+
+from fastapi import HTTPException
+
+from constants.llm import (
+    DEFAULT_LLM_MAX_RETRIES,
+    LLM_CIRCUIT_BREAKER_COOLDOWN,
+    LLM_CIRCUIT_BREAKER_FAILURES,
+    LLM_RETRY_DELAY,
+)
+from enums.llm_provider import LLMProvider
+from utils.get_env import get_llm_max_retries_env
+from utils.llm_client_error_handler import is_transient_llm_error
+from utils.parsers import parse_int_or_none
+
+T = TypeVar("T")
+
+
+class LLMCircuitBreaker:
+    """
+    Opens after `max_failures` consecutive transient failures and skips the
+    provider for `cooldown` seconds. After the cooldown calls are let through
+    again, a success closes the breaker and a failure opens it again.
+    """
+
+    def __init__(
+        self,
+        max_failures: int = LLM_CIRCUIT_BREAKER_FAILURES,
+        cooldown: float = LLM_CIRCUIT_BREAKER_COOLDOWN,
+    ):
+        self.max_failures = max_failures
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+
+    @property
+    def is_open(self) -> bool:
+        if self.opened_at is None:
+            return False
+        return time.monotonic() - self.opened_at < self.cooldown
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+
+    def record_failure(self):
+        self.failures += 1
+        if self.failures >= self.max_failures:
+            self.opened_at = time.monotonic()
+
+
+class LLMFailover:
+    """
+    Runs LLM calls over an ordered chain of providers.
+    Transient errors are retried on the same provider with jittered exponential
+    backoff, then the next provider is tried. Any other error moves on to the
+    next provider at once. Providers whose circuit breaker is open are skipped,
+    unless every provider is skipped, then the one whose breaker opened first is
+    tried anyway. The last provider tried keeps being retried while its breaker
+    is open, as there is nothing left to fail over to.
+    Streams only fail over until their first chunk, after that the error is
+    raised as the chunks can not be taken back.
+    """
+
+    def __init__(
+        self,
+        max_retries: Optional[int] = None,
+        retry_delay: float = LLM_RETRY_DELAY,
+    ):
+        self._max_retries = max_retries
+        self.retry_delay = retry_delay
+        self._breakers: Dict[LLMProvider, LLMCircuitBreaker] = {}
+
+    @property
+    def max_retries(self) -> int:
+        if self._max_retries is not None:
+            return self._max_retries
+        max_retries = parse_int_or_none(get_llm_max_retries_env())
+        if max_retries is None or max_retries < 0:
+            return DEFAULT_LLM_MAX_RETRIES
+        return max_retries
+
+    def get_breaker(self, llm_provider: LLMProvider) -> LLMCircuitBreaker:
+        if llm_provider not in self._breakers:
+            self._breakers[llm_provider] = LLMCircuitBreaker()
+        return self._breakers[llm_provider]
+
+    async def _should_retry(
+        self,
+        llm_provider: LLMProvider,
+        attempt: int,
+        e: Exception,
+        can_fail_over: bool = True,
+    ) -> bool:
+        """Records the failure and returns whether to retry the same provider."""
+        print(f"LLM call to {llm_provider.value} failed: {e}")
+        if not is_transient_llm_error(e):
+            return False
+        breaker = self.get_breaker(llm_provider)
+        breaker.record_failure()
+        if attempt >= self.max_retries or (can_fail_over and breaker.is_open):
+            return False
+        backoff = self.retry_delay * (2**attempt)
+        await asyncio.sleep(backoff * random.uniform(0.5, 1.5))
+        return True
+
+    def _get_available_providers(
+        self, llm_providers: List[LLMProvider]
+    ) -> List[LLMProvider]:
+        available = []
+        for llm_provider in llm_providers:
+            if self.get_breaker(llm_provider).is_open:
+                print(f"Skipping {llm_provider.value}, its circuit breaker is open")
+            else:
+                available.append(llm_provider)
+        if not available and llm_providers:
+            # Failing every call without contacting a provider does not let any
+            # of them recover, so the one closest to the end of its cooldown is
+            # tried anyway
+            llm_provider = min(
+                llm_providers, key=lambda each: self.get_breaker(each).opened_at
+            )
+            print(f"Trying {llm_provider.value}, every circuit breaker is open")
+            available.append(llm_provider)
+        return available
+
+    def _get_error(self, last_error: Optional[Exception]) -> Exception:
+        return last_error or HTTPException(
+            status_code=503,
+            detail="All LLM providers are unavailable. Please try again later.",
+        )
+
+    async def run(
+        self,
+        llm_providers: List[LLMProvider],
+        call: Callable[[LLMProvider], Awaitable[T]],
+    ) -> T:
+        last_error = None
+        available = self._get_available_providers(llm_providers)
+        for index, llm_provider in enumerate(available):
+            can_fail_over = index < len(available) - 1
+            attempt = 0
+            while True:
+                try:
+                    result = await call(llm_provider)
+                except Exception as e:
+                    last_error = e
+                    if await self._should_retry(
+                        llm_provider, attempt, e, can_fail_over
+                    ):
+                        attempt += 1
+                        continue
+                    break
+                self.get_breaker(llm_provider).record_success()
+                return result
+        raise self._get_error(last_error)
+
+    async def stream(
+        self,
+        llm_providers: List[LLMProvider],
+        open_stream: Callable[[LLMProvider], AsyncGenerator[T, None]],
+    ) -> AsyncGenerator[T, None]:
+        last_error = None
+        available = self._get_available_providers(llm_providers)
+        for index, llm_provider in enumerate(available):
+            can_fail_over = index < len(available) - 1
+            attempt = 0
+            while True:
+                started = False
+                try:
+                    async for chunk in open_stream(llm_provider):
+                        started = True
+                        yield chunk
+                except Exception as e:
+                    if started:
+                        raise
+                    last_error = e
+                    if await self._should_retry(
+                        llm_provider, attempt, e, can_fail_over
+                    ):
+                        attempt += 1
+                        continue
+                    break
+                self.get_breaker(llm_provider).record_success()
+                return
+        raise self._get_error(last_error)
+
+
+LLM_FAILOVER = LLMFailover()
@@ -0,0 +1,137 @@
+import asyncio
+from collections import defaultdict, deque
+import math
+import time
+from typing import Awaitable, Callable, Deque, Dict, Optional, TypeVar
+
+from constants.llm import (
+    DEFAULT_LLM_HEDGING_MAX_PERCENT,
+    LLM_HEDGING_MIN_SAMPLES,
+    LLM_HEDGING_PERCENTILE,
+    LLM_HEDGING_WINDOW,
+)
+from utils.get_env import get_llm_hedging_env, get_llm_hedging_max_percent_env
+from utils.parsers import parse_bool_or_none, parse_int_or_none
+
+T = TypeVar("T")
+
+
+class LLMHedging:
+    """
+    Opt-in hedging of slow LLM calls.
+    Latencies are tracked per call type. When a call runs longer than the
+    observed p90 of its type, a duplicate call is started and the first valid
+    response wins, the other call is cancelled. Hedged calls are capped to a
+    percentage of the recent calls to bound the extra spend.
+    """
+
+    def __init__(
+        self,
+        enabled: Optional[bool] = None,
+        max_percent: Optional[int] = None,
+        percentile: float = LLM_HEDGING_PERCENTILE,
+        min_samples: int = LLM_HEDGING_MIN_SAMPLES,
+        window: int = LLM_HEDGING_WINDOW,
+    ):
+        self._enabled = enabled
+        self._max_percent = max_percent
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self._latencies: Dict[str, Deque[float]] = defaultdict(
+            lambda: deque(maxlen=window)
+        )
+        # Calls and hedges made lately, True for hedges, so the cap follows the
+        # current load instead of every call made since start up
+        self._history: Deque[bool] = deque(maxlen=window)
+        self.calls = 0
+        self.hedged_calls = 0
+
+    @property
+    def enabled(self) -> bool:
+        if self._enabled is not None:
+            return self._enabled
+        return parse_bool_or_none(get_llm_hedging_env()) or False
+
+    @property
+    def max_percent(self) -> int:
+        if self._max_percent is not None:
+            return self._max_percent
+        max_percent = parse_int_or_none(get_llm_hedging_max_percent_env())
+        if max_percent is None or max_percent < 0:
+            return DEFAULT_LLM_HEDGING_MAX_PERCENT
+        return max_percent
+
+    def get_hedge_delay(self, call_type: str) -> Optional[float]:
+        """Returns the latency after which calls of this type are hedged."""
+        latencies = self._latencies[call_type]
+        if len(latencies) < self.min_samples:
+            return None
+        ordered = sorted(latencies)
+        index = min(len(ordered) - 1, math.ceil(len(ordered) * self.percentile) - 1)
+        return ordered[index]
+
+    def _can_hedge(self) -> bool:
+        hedges = sum(self._history)
+        return hedges < (len(self._history) - hedges) * self.max_percent / 100
+
+    async def run(
+        self,
+        call_type: str,
+        call: Callable[[], Awaitable[T]],
+        hedge: Callable[[], Awaitable[T]],
+        is_valid: Callable[[T], bool] = lambda result: result is not None,
+    ) -> T:
+        if not self.enabled:
+            return await call()
+
+        self.calls += 1
+        self._history.append(False)
+        started_at = time.monotonic()
+        hedge_delay = self.get_hedge_delay(call_type)
+        tasks = [asyncio.ensure_future(call())]
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=hedge_delay)
+            if not done and self._can_hedge():
+                self.hedged_calls += 1
+                self._history.append(True)
+                print(f"Hedging {call_type} call after {hedge_delay:.1f}s")
+                tasks.append(asyncio.ensure_future(hedge()))
+
+            result = await self._get_first_valid_result(tasks, is_valid)
+            self._latencies[call_type].append(time.monotonic() - started_at)
+            return result
+        finally:
+            for task in tasks:
+                task.cancel()
+                # Errors of the losing call are not raised, retrieving them
+                # keeps asyncio from logging them as never retrieved
+                task.add_done_callback(self._retrieve_exception)
+
+    @staticmethod
+    def _retrieve_exception(task: asyncio.Future):
+        if not task.cancelled():
+            task.exception()
+
+    async def _get_first_valid_result(self, tasks, is_valid: Callable[[T], bool]):
+        """
+        Returns the first valid result. If no result is valid, the first result
+        is returned, and if every call failed the first error is raised.
+        """
+        pending = set(tasks)
+        completed = []
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in sorted(done, key=tasks.index):
+                if not task.exception() and is_valid(task.result()):
+                    return task.result()
+                completed.append(task)
+
+        for task in completed:
+            if not task.exception():
+                return task.result()
+        raise completed[0].exception()
+
+
+LLM_HEDGING = LLMHedging()
@@ -0,0 +1,101 @@
+from typing import Optional
+
+from models.llm_usage import LLMUsage
+from utils.metrics import Counter, Histogram
+
+LATENCY_BUCKETS = (0.25, 0.5, 1, 2, 5, 10, 20, 30, 60, 120, 300)
+TIME_TO_FIRST_TOKEN_BUCKETS = (0.1, 0.25, 0.5, 1, 2, 5, 10, 30, 60)
+TOOL_CALL_DEPTH_BUCKETS = (0, 1, 2, 3, 5, 10)
+
+CALL_LABELS = ("provider", "model", "call_site", "method")
+STREAM_LABELS = ("provider", "model", "call_site")
+
+
+class LLMMetrics:
+    """
+    Process wide LLM call metrics, labelled by provider, model and call site.
+    Every provider attempt is recorded, so retries, failovers and hedged calls
+    show up as separate calls.
+    """
+
+    def __init__(self):
+        self.calls = Counter(
+            "presenton_llm_calls_total",
+            "LLM calls by outcome (success, error or cancelled)",
+            (*CALL_LABELS, "status"),
+        )
+        self.duration = Histogram(
+            "presenton_llm_call_duration_seconds",
+            "Total latency of LLM calls",
+            CALL_LABELS,
+            LATENCY_BUCKETS,
+        )
+        self.time_to_first_token = Histogram(
+            "presenton_llm_time_to_first_token_seconds",
+            "Time until the first chunk of streamed LLM calls",
+            STREAM_LABELS,
+            TIME_TO_FIRST_TOKEN_BUCKETS,
+        )
+        self.tokens = Counter(
+            "presenton_llm_tokens_total",
+            "LLM tokens by type (input, output, cached_input, cache_creation)",
+            (*STREAM_LABELS, "type"),
+        )
+        self.retries = Counter(
+            "presenton_llm_retries_total",
+            "LLM calls retried on the same or a fallback provider",
+            STREAM_LABELS,
+        )
+        self.hedged_calls = Counter(
+            "presenton_llm_hedged_calls_total",
+            "LLM calls duplicated by hedging",
+            ("call_site",),
+        )
+        self.tool_call_depth = Histogram(
+            "presenton_llm_tool_call_depth",
+            "Rounds of tool calls made by a single LLM call",
+            STREAM_LABELS,
+            TOOL_CALL_DEPTH_BUCKETS,
+        )
+
+    def observe_call(
+        self,
+        provider: str,
+        model: str,
+        call_site: Optional[str],
+        method: str,
+        status: str,
+        duration: float,
+    ):
+        labels = (provider, model or "", call_site or "other", method)
+        self.calls.inc(*labels, status)
+        if status != "cancelled":
+            self.duration.observe(*labels, value=duration)
+
+    def observe_usage(
+        self, provider: str, model: str, call_site: Optional[str], usage: LLMUsage
+    ):
+        labels = (provider, model or "", call_site or "other")
+        self.tokens.inc(*labels, "input", amount=usage.input_tokens)
+        self.tokens.inc(*labels, "output", amount=usage.output_tokens)
+        self.tokens.inc(*labels, "cached_input", amount=usage.cached_input_tokens)
+        self.tokens.inc(
+            *labels, "cache_creation", amount=usage.cache_creation_input_tokens
+        )
+
+    def render(self) -> str:
+        lines = []
+        for metric in (
+            self.calls,
+            self.duration,
+            self.time_to_first_token,
+            self.tokens,
+            self.retries,
+            self.hedged_calls,
+            self.tool_call_depth,
+        ):
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+LLM_METRICS = LLMMetrics()
@@ -0,0 +1,259 @@
+import asyncio
+from collections import deque
+from contextlib import asynccontextmanager, suppress
+from contextvars import ContextVar
+import json
+import time
+from typing import Deque, Dict, List, Optional, Tuple
+
+from constants.llm import (
+    DEFAULT_LLM_OUTPUT_TOKENS_ESTIMATE,
+    LLM_CHARACTERS_PER_TOKEN,
+)
+from enums.llm_request_priority import LLMRequestPriority
+from models.llm_message import LLMMessage
+from services.llm_request_scheduler import get_llm_request_priority
+from utils.get_env import (
+    get_llm_requests_per_minute_env,
+    get_llm_tokens_per_minute_env,
+)
+from utils.parsers import parse_int_or_none
+
+
+def parse_rate_limits(value: Optional[str]) -> Dict[str, int]:
+    """
+    Parses "500" (applies to every provider) or per provider or model limits
+    like "openai=500,anthropic/claude-sonnet-4-20250514=50".
+    """
+    limits = {}
+    for item in (value or "").split(","):
+        key, _, limit = item.strip().rpartition("=")
+        limit = parse_int_or_none(limit.strip())
+        if limit and limit > 0:
+            limits[key.strip().lower()] = limit
+    return limits
+
+
+def get_rate_limit(
+    limits: Dict[str, int], provider: str, model: str
+) -> Optional[int]:
+    for key in (f"{provider}/{model}".lower(), provider.lower(), ""):
+        if key in limits:
+            return limits[key]
+    return None
+
+
+def estimate_tokens(
+    messages: List[LLMMessage],
+    response_format: Optional[dict] = None,
+    max_tokens: Optional[int] = None,
+) -> int:
+    """Rough token count of a request, including its expected output."""
+    characters = 0
+    for message in messages:
+        try:
+            characters += len(json.dumps(message.model_dump(mode="json")))
+        except Exception:
+            characters += len(str(message))
+    if response_format:
+        characters += len(json.dumps(response_format))
+    output_tokens = max_tokens or DEFAULT_LLM_OUTPUT_TOKENS_ESTIMATE
+    return characters // LLM_CHARACTERS_PER_TOKEN + output_tokens
+
+
+class TokenBucket:
+    """Bucket refilled continuously up to `per_minute`, which can go into debt."""
+
+    def __init__(self, per_minute: int):
+        self.per_minute = per_minute
+        self.tokens = float(per_minute)
+        self.updated_at = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        elapsed = now - self.updated_at
+        self.tokens = min(self.per_minute, self.tokens + elapsed * self.per_minute / 60)
+        self.updated_at = now
+
+    def get_wait_time(self, amount: float) -> float:
+        self._refill()
+        amount = min(amount, self.per_minute)
+        if self.tokens >= amount:
+            return 0
+        return (amount - self.tokens) * 60 / self.per_minute
+
+    def take(self, amount: float):
+        """Takes tokens, a negative amount gives them back up to the capacity."""
+        self._refill()
+        self.tokens = min(self.per_minute, self.tokens - amount)
+
+
+class LLMRateLimitBuckets:
+    """
+    Requests and tokens buckets of a provider and model, with the calls waiting
+    for them in one queue per priority.
+    """
+
+    def __init__(self, rpm: Optional[int], tpm: Optional[int]):
+        self.requests = TokenBucket(rpm) if rpm else None
+        self.tokens = TokenBucket(tpm) if tpm else None
+        self.condition = asyncio.Condition()
+        self.waiting: Dict[LLMRequestPriority, Deque[object]] = {
+            priority: deque() for priority in LLMRequestPriority
+        }
+
+    def is_next(self, waiter: object) -> bool:
+        # Priorities are declared from the most to the least urgent
+        for waiters in self.waiting.values():
+            if waiters:
+                return waiters[0] is waiter
+        return False
+
+    def get_wait_time(self, estimated_tokens: int) -> float:
+        return max(
+            self.requests.get_wait_time(1) if self.requests else 0,
+            self.tokens.get_wait_time(estimated_tokens) if self.tokens else 0,
+        )
+
+    def take(self, estimated_tokens: int):
+        if self.requests:
+            self.requests.take(1)
+        if self.tokens:
+            self.tokens.take(estimated_tokens)
+
+
+class LLMRateLimitReservation:
+    def __init__(self, estimated_tokens: int):
+        self.estimated_tokens = estimated_tokens
+        self.used_tokens: Optional[int] = None
+
+    def add_usage(self, tokens: int):
+        self.used_tokens = (self.used_tokens or 0) + tokens
+
+
+_llm_rate_limit_reservation: ContextVar[Optional[LLMRateLimitReservation]] = (
+    ContextVar("llm_rate_limit_reservation", default=None)
+)
+
+
+def record_llm_rate_limit_usage(tokens: int):
+    """Reports tokens used by the current call, to reconcile its estimate."""
+    reservation = _llm_rate_limit_reservation.get()
+    if reservation:
+        reservation.add_usage(tokens)
+
+
+class LLMRateLimiter:
+    """
+    Shared requests per minute and tokens per minute budgets per provider and
+    model, enforced with token buckets.
+    Calls wait for capacity instead of failing with rate limit errors, in the
+    order they arrived, interactive calls before bulk calls. Tokens are taken
+    from the estimate of the request and reconciled with the usage reported by
+    the provider when the call ends.
+    Limits are read from LLM_REQUESTS_PER_MINUTE and LLM_TOKENS_PER_MINUTE,
+    providers and models without a limit are not limited.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: Optional[Dict[str, int]] = None,
+        tokens_per_minute: Optional[Dict[str, int]] = None,
+    ):
+        self._requests_per_minute = requests_per_minute
+        self._tokens_per_minute = tokens_per_minute
+        self._buckets: Dict[
+            Tuple[str, str, Optional[int], Optional[int]], LLMRateLimitBuckets
+        ] = {}
+
+    @property
+    def requests_per_minute(self) -> Dict[str, int]:
+        if self._requests_per_minute is not None:
+            return self._requests_per_minute
+        return parse_rate_limits(get_llm_requests_per_minute_env())
+
+    @property
+    def tokens_per_minute(self) -> Dict[str, int]:
+        if self._tokens_per_minute is not None:
+            return self._tokens_per_minute
+        return parse_rate_limits(get_llm_tokens_per_minute_env())
+
+    def _get_buckets(
+        self, provider: str, model: str
+    ) -> Optional[LLMRateLimitBuckets]:
+        rpm = get_rate_limit(self.requests_per_minute, provider, model)
+        tpm = get_rate_limit(self.tokens_per_minute, provider, model)
+        if not rpm and not tpm:
+            return None
+        # Buckets are rebuilt when the limits change
+        key = (provider, model, rpm, tpm)
+        if key not in self._buckets:
+            self._buckets[key] = LLMRateLimitBuckets(rpm, tpm)
+        return self._buckets[key]
+
+    @asynccontextmanager
+    async def acquire(
+        self,
+        provider: str,
+        model: str,
+        estimated_tokens: int,
+        priority: Optional[LLMRequestPriority] = None,
+    ):
+        buckets = self._get_buckets(provider, model)
+        if not buckets:
+            yield
+            return
+
+        await self._wait(buckets, estimated_tokens, priority)
+        token_bucket = buckets.tokens
+
+        reservation = LLMRateLimitReservation(estimated_tokens)
+        token = _llm_rate_limit_reservation.set(reservation)
+        try:
+            yield
+        except BaseException:
+            # Failed calls give back their tokens unless usage was reported
+            if token_bucket and reservation.used_tokens is None:
+                token_bucket.take(-estimated_tokens)
+            raise
+        finally:
+            # Streams closed by the garbage collector finish in another context
+            with suppress(ValueError):
+                _llm_rate_limit_reservation.reset(token)
+
+        if token_bucket and reservation.used_tokens is not None:
+            token_bucket.take(reservation.used_tokens - estimated_tokens)
+
+    async def _wait(
+        self,
+        buckets: LLMRateLimitBuckets,
+        estimated_tokens: int,
+        priority: Optional[LLMRequestPriority] = None,
+    ):
+        """
+        Waits until the call is next in line and the buckets have capacity.
+        Only the next call waits for capacity, so large requests are not
+        starved, and it steps back when a more urgent call arrives.
+        """
+        waiter = object()
+        waiters = buckets.waiting[priority or get_llm_request_priority()]
+        async with buckets.condition:
+            waiters.append(waiter)
+            buckets.condition.notify_all()
+            try:
+                while True:
+                    if not buckets.is_next(waiter):
+                        await buckets.condition.wait()
+                        continue
+                    wait_time = buckets.get_wait_time(estimated_tokens)
+                    if not wait_time:
+                        break
+                    with suppress(asyncio.TimeoutError):
+                        await asyncio.wait_for(buckets.condition.wait(), wait_time)
+                buckets.take(estimated_tokens)
+            finally:
+                waiters.remove(waiter)
+                buckets.condition.notify_all()
+
+
+LLM_RATE_LIMITER = LLMRateLimiter()
@@ -0,0 +1,186 @@
+import asyncio
+import copy
+import hashlib
+import json
+from typing import (
+    Any,
+    AsyncGenerator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    TypeVar,
+)
+
+from models.llm_message import LLMMessage
+from models.llm_tools import LLMDynamicTool, LLMTool
+from utils.get_env import get_llm_request_coalescing_env
+from utils.parsers import parse_bool_or_none
+
+T = TypeVar("T")
+
+
+def get_tool_key(tool: type[LLMTool] | LLMDynamicTool) -> Any:
+    if isinstance(tool, LLMDynamicTool):
+        # Handlers are closures over request state, so only the same handler
+        # makes two calls identical
+        return [tool.model_dump(exclude={"handler"}), id(tool.handler)]
+    return f"{tool.__module__}.{tool.__qualname__}"
+
+
+def get_llm_request_key(
+    method: str,
+    provider: str,
+    model: str,
+    messages: List[LLMMessage],
+    response_format: Optional[dict] = None,
+    tools: Optional[List[type[LLMTool] | LLMDynamicTool]] = None,
+    **options,
+) -> str:
+    payload = json.dumps(
+        {
+            "method": method,
+            "provider": provider,
+            "model": model,
+            "messages": [message.model_dump(mode="json") for message in messages],
+            "response_format": response_format,
+            "tools": [get_tool_key(tool) for tool in tools or []],
+            "options": options,
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class _InFlightCall:
+    def __init__(self, task: asyncio.Future):
+        self.task = task
+        self.waiters = 0
+
+
+class _InFlightStream:
+    def __init__(self):
+        self.chunks: List[Any] = []
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self.changed = asyncio.Event()
+        self.subscribers = 0
+        self.task: Optional[asyncio.Future] = None
+
+    def notify(self):
+        self.changed.set()
+        self.changed = asyncio.Event()
+
+
+class LLMRequestCoalescer:
+    """
+    Single-flight coalescing of identical in-flight LLM calls.
+    While a call is running, identical calls wait for it instead of sending
+    their own request and get a copy of its response. Streams are fanned out,
+    callers joining late get the chunks sent so far first. The upstream call
+    is only cancelled when every caller waiting on it has gone away.
+    """
+
+    def __init__(self, enabled: Optional[bool] = None):
+        self._enabled = enabled
+        self._calls: Dict[str, _InFlightCall] = {}
+        self._streams: Dict[str, _InFlightStream] = {}
+        self.coalesced_calls = 0
+
+    @property
+    def enabled(self) -> bool:
+        if self._enabled is not None:
+            return self._enabled
+        enabled = parse_bool_or_none(get_llm_request_coalescing_env())
+        return True if enabled is None else enabled
+
+    async def run(self, key: str, call: Callable[[], Awaitable[T]]) -> T:
+        if not self.enabled:
+            return await call()
+
+        in_flight = self._calls.get(key)
+        leader = in_flight is None
+        if leader:
+            in_flight = _InFlightCall(asyncio.ensure_future(call()))
+            self._calls[key] = in_flight
+            in_flight.task.add_done_callback(
+                lambda _: self._remove(self._calls, key, in_flight)
+            )
+        else:
+            self.coalesced_calls += 1
+
+        in_flight.waiters += 1
+        try:
+            result = await asyncio.shield(in_flight.task)
+        finally:
+            in_flight.waiters -= 1
+            if not in_flight.waiters and not in_flight.task.done():
+                in_flight.task.cancel()
+        # Callers may modify the response they get
+        return result if leader else copy.deepcopy(result)
+
+    async def stream(
+        self, key: str, open_stream: Callable[[], AsyncGenerator[T, None]]
+    ) -> AsyncGenerator[T, None]:
+        if not self.enabled:
+            async for chunk in open_stream():
+                yield chunk
+            return
+
+        in_flight = self._streams.get(key)
+        if in_flight is None:
+            in_flight = _InFlightStream()
+            self._streams[key] = in_flight
+            in_flight.task = asyncio.ensure_future(
+                self._produce(key, in_flight, open_stream)
+            )
+        else:
+            self.coalesced_calls += 1
+
+        in_flight.subscribers += 1
+        index = 0
+        try:
+            while True:
+                changed = in_flight.changed
+                while index < len(in_flight.chunks):
+                    yield in_flight.chunks[index]
+                    index += 1
+                if in_flight.done:
+                    if in_flight.error:
+                        raise in_flight.error
+                    return
+                await changed.wait()
+        finally:
+            in_flight.subscribers -= 1
+            if not in_flight.subscribers and not in_flight.done:
+                in_flight.task.cancel()
+
+    async def _produce(
+        self,
+        key: str,
+        in_flight: _InFlightStream,
+        open_stream: Callable[[], AsyncGenerator[T, None]],
+    ):
+        try:
+            async for chunk in open_stream():
+                in_flight.chunks.append(chunk)
+                in_flight.notify()
+        except BaseException as e:
+            in_flight.error = e
+            if not isinstance(e, Exception):
+                raise
+        finally:
+            # Calls made from now on start a new stream
+            self._remove(self._streams, key, in_flight)
+            in_flight.done = True
+            in_flight.notify()
+
+    def _remove(self, in_flight_calls: dict, key: str, in_flight):
+        if in_flight_calls.get(key) is in_flight:
+            del in_flight_calls[key]
+
+
+LLM_REQUEST_COALESCER = LLMRequestCoalescer()
@@ -0,0 +1,105 @@
+import asyncio
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+from constants.llm import DEFAULT_LLM_MAX_CONCURRENCY
+from enums.llm_request_priority import LLMRequestPriority
+from utils.get_env import get_llm_max_concurrency_env
+from utils.parsers import parse_int_or_none
+
+_llm_request_priority: ContextVar[LLMRequestPriority] = ContextVar(
+    "llm_request_priority", default=LLMRequestPriority.INTERACTIVE
+)
+
+
+def get_llm_request_priority() -> LLMRequestPriority:
+    return _llm_request_priority.get()
+
+
+@contextmanager
+def llm_request_priority(priority: LLMRequestPriority):
+    """
+    Sets the priority of LLM calls made in this block, including calls made by
+    tasks created in it.
+    """
+    token = _llm_request_priority.set(priority)
+    try:
+        yield
+    finally:
+        _llm_request_priority.reset(token)
+
+
+class LLMRequestScheduler:
+    """
+    Process wide scheduler in front of LLMClient calls with two priority lanes.
+    Interactive calls (editor requests) are always served first. Bulk calls
+    (presentation generation) only start when no interactive call is waiting
+    and never take the slots reserved for interactive calls.
+    """
+
+    def __init__(self, max_concurrency: Optional[int] = None):
+        self._max_concurrency = max_concurrency
+        self._in_flight: Dict[LLMRequestPriority, int] = {
+            priority: 0 for priority in LLMRequestPriority
+        }
+        self._waiting: Dict[LLMRequestPriority, int] = {
+            priority: 0 for priority in LLMRequestPriority
+        }
+        self._condition: Optional[asyncio.Condition] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def max_concurrency(self) -> int:
+        if self._max_concurrency:
+            return self._max_concurrency
+        concurrency = parse_int_or_none(get_llm_max_concurrency_env())
+        if not concurrency or concurrency < 1:
+            return DEFAULT_LLM_MAX_CONCURRENCY
+        return concurrency
+
+    @property
+    def interactive_reserved(self) -> int:
+        return max(1, self.max_concurrency // 4)
+
+    def _get_condition(self) -> asyncio.Condition:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._condition = asyncio.Condition()
+        return self._condition
+
+    def _can_start(self, priority: LLMRequestPriority) -> bool:
+        if sum(self._in_flight.values()) >= self.max_concurrency:
+            return False
+        if priority == LLMRequestPriority.INTERACTIVE:
+            return True
+        if self._waiting[LLMRequestPriority.INTERACTIVE]:
+            return False
+        bulk_limit = max(1, self.max_concurrency - self.interactive_reserved)
+        return self._in_flight[LLMRequestPriority.BULK] < bulk_limit
+
+    @asynccontextmanager
+    async def slot(self, priority: Optional[LLMRequestPriority] = None):
+        priority = priority or get_llm_request_priority()
+        condition = self._get_condition()
+
+        async with condition:
+            self._waiting[priority] += 1
+            try:
+                await condition.wait_for(lambda: self._can_start(priority))
+            finally:
+                self._waiting[priority] -= 1
+                # Bulk calls may have been held back by this call
+                condition.notify_all()
+            self._in_flight[priority] += 1
+
+        try:
+            yield
+        finally:
+            async with condition:
+                self._in_flight[priority] -= 1
+                condition.notify_all()
+
+
+LLM_REQUEST_SCHEDULER = LLMRequestScheduler()
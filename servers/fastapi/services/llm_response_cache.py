@@ -0,0 +1,189 @@
+from datetime import datetime, timedelta
+import hashlib
+import json
+from typing import List, Optional
+
+from sqlalchemy import delete, func
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlmodel import select
+
+from constants.llm import (
+    DEFAULT_LLM_RESPONSE_CACHE_MAX_BYTES,
+    DEFAULT_LLM_RESPONSE_CACHE_MAX_ENTRIES,
+    DEFAULT_LLM_RESPONSE_CACHE_TTL,
+)
+from models.llm_message import LLMMessage
+from models.sql.llm_response_cache import LLMResponseCacheModel
+from services.database import async_session_maker
+from utils.get_env import (
+    get_llm_response_cache_max_bytes_env,
+    get_llm_response_cache_max_entries_env,
+    get_llm_response_cache_ttl_env,
+)
+from utils.metrics import Counter
+from utils.parsers import parse_int_or_none
+
+
+def get_llm_response_cache_key(
+    model: str, messages: List[LLMMessage], response_format: dict
+) -> str:
+    payload = json.dumps(
+        {
+            "model": model,
+            "messages": [message.model_dump(mode="json") for message in messages],
+            "response_format": response_format,
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class LLMResponseCache:
+    """
+    Persistent cache of structured LLM responses, keyed by a hash of the final
+    messages, response schema and model. Entries expire after the TTL and the
+    least recently used entries are evicted above the max number of entries or
+    the max total size of the responses. Setting the TTL to 0 disables the cache.
+    Hits and misses are counted for /metrics.
+    """
+
+    def __init__(
+        self,
+        session_maker: async_sessionmaker = async_session_maker,
+        ttl: Optional[int] = None,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+    ):
+        self.session_maker = session_maker
+        self._ttl = ttl
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._hits = Counter(
+            "presenton_llm_response_cache_hits_total",
+            "Slide content LLM responses served from the cache",
+            (),
+        )
+        self._misses = Counter(
+            "presenton_llm_response_cache_misses_total",
+            "Slide content LLM responses not found in the cache",
+            (),
+        )
+        self._hits.inc(amount=0)
+        self._misses.inc(amount=0)
+
+    @property
+    def hits(self) -> int:
+        return int(self._hits.get())
+
+    @property
+    def misses(self) -> int:
+        return int(self._misses.get())
+
+    @property
+    def ttl(self) -> int:
+        if self._ttl is not None:
+            return self._ttl
+        ttl = parse_int_or_none(get_llm_response_cache_ttl_env())
+        return DEFAULT_LLM_RESPONSE_CACHE_TTL if ttl is None else ttl
+
+    @property
+    def max_entries(self) -> int:
+        if self._max_entries is not None:
+            return self._max_entries
+        max_entries = parse_int_or_none(get_llm_response_cache_max_entries_env())
+        return max_entries or DEFAULT_LLM_RESPONSE_CACHE_MAX_ENTRIES
+
+    @property
+    def max_bytes(self) -> int:
+        if self._max_bytes is not None:
+            return self._max_bytes
+        max_bytes = parse_int_or_none(get_llm_response_cache_max_bytes_env())
+        return max_bytes or DEFAULT_LLM_RESPONSE_CACHE_MAX_BYTES
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.max_entries > 0
+
+    async def get(self, key: str) -> Optional[dict]:
+        if not self.enabled:
+            return None
+        try:
+            async with self.session_maker() as session:
+                entry = await session.get(LLMResponseCacheModel, key)
+                if entry and entry.created_at < datetime.now() - timedelta(
+                    seconds=self.ttl
+                ):
+                    await session.delete(entry)
+                    await session.commit()
+                    entry = None
+                if not entry:
+                    self._misses.inc()
+                    return None
+
+                entry.accessed_at = datetime.now()
+                session.add(entry)
+                await session.commit()
+                self._hits.inc()
+                return entry.response
+        except Exception as e:
+            print(f"LLM response cache lookup failed: {e}")
+            self._misses.inc()
+            return None
+
+    async def set(self, key: str, model: str, response: dict):
+        if not self.enabled:
+            return
+        try:
+            async with self.session_maker() as session:
+                entry = await session.get(LLMResponseCacheModel, key)
+                if not entry:
+                    entry = LLMResponseCacheModel(key=key, model=model, response={})
+                entry.model = model
+                entry.response = response
+                entry.size = len(json.dumps(response))
+                entry.created_at = datetime.now()
+                entry.accessed_at = entry.created_at
+                session.add(entry)
+                await session.commit()
+                await self._evict(session)
+        except Exception as e:
+            print(f"LLM response cache update failed: {e}")
+
+    async def _evict(self, session):
+        await session.execute(
+            delete(LLMResponseCacheModel).where(
+                LLMResponseCacheModel.created_at
+                < datetime.now() - timedelta(seconds=self.ttl)
+            )
+        )
+        totals_query = select(
+            func.count(), func.coalesce(func.sum(LLMResponseCacheModel.size), 0)
+        ).select_from(LLMResponseCacheModel)
+        count, size = (await session.execute(totals_query)).one()
+        if count <= self.max_entries and size <= self.max_bytes:
+            await session.commit()
+            return
+
+        # Least recently used entries are evicted until both limits are met
+        oldest = select(LLMResponseCacheModel.key, LLMResponseCacheModel.size).order_by(
+            LLMResponseCacheModel.accessed_at
+        )
+        keys = []
+        for key, entry_size in await session.execute(oldest):
+            if count <= self.max_entries and size <= self.max_bytes:
+                break
+            keys.append(key)
+            count -= 1
+            size -= entry_size or 0
+        await session.execute(
+            delete(LLMResponseCacheModel).where(LLMResponseCacheModel.key.in_(keys))
+        )
+        await session.commit()
+
+    def render(self) -> str:
+        lines = [*self._hits.render(), *self._misses.render()]
+        return "\n".join(lines) + "\n"
+
+
+LLM_RESPONSE_CACHE = LLMResponseCache()
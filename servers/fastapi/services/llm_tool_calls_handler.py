@@ -11,11 +11,8 @@ from models.llm_message import (
 )
 from models.llm_tool_call import AnthropicToolCall, GoogleToolCall, OpenAIToolCall
 from models.llm_tools import LLMDynamicTool, LLMTool, SearchWebTool
-from utils.schema_utils import (
-    ensure_strict_json_schema,
-    flatten_json_schema,
-    remove_titles_from_schema,
-)
+from utils.schema_cache import get_strict_json_schema
+from utils.schema_utils import flatten_json_schema, remove_titles_from_schema
 
 
 class LLMToolCallsHandler:
@@ -29,6 +26,8 @@ class LLMToolCallsHandler:
             "GetCurrentDatetimeTool": self.get_current_datetime_tool_call_handler,
         }
         self.dynamic_tools: List[LLMDynamicTool] = []
+        # Rounds of tool calls handled, used as the tool call depth of a call
+        self.tool_call_rounds = 0
 
     def get_tool_handler(
         self, tool_name: str
@@ -79,7 +78,7 @@ class LLMToolCallsHandler:
             parameters = tool.model_json_schema()
 
         if strict:
-            parameters = ensure_strict_json_schema(parameters, path=(), root=parameters)
+            parameters = get_strict_json_schema(parameters)
 
         return {
             "type": "function",
@@ -119,6 +118,7 @@ class LLMToolCallsHandler:
         self,
         tool_calls: List[OpenAIToolCall],
     ) -> List[OpenAIToolCallMessage]:
+        self.tool_call_rounds += 1
         async_tool_calls_tasks = []
         for tool_call in tool_calls:
             tool_name = tool_call.function.name
@@ -139,6 +139,7 @@ class LLMToolCallsHandler:
         self,
         tool_calls: List[GoogleToolCall],
     ) -> List[GoogleToolCallMessage]:
+        self.tool_call_rounds += 1
         async_tool_calls_tasks = []
         for tool_call in tool_calls:
             tool_name = tool_call.name
@@ -161,6 +162,7 @@ class LLMToolCallsHandler:
         self,
         tool_calls: List[AnthropicToolCall],
     ) -> List[AnthropicToolCallMessage]:
+        self.tool_call_rounds += 1
         async_tool_calls_tasks = []
         for tool_call in tool_calls:
             tool_name = tool_call.name
@@ -0,0 +1,28 @@
+from typing import Optional
+
+from services.adaptive_concurrency_limiter import AdaptiveConcurrencyLimiter
+from utils.ppt_utils import (
+    get_asset_fetch_concurrency,
+    get_slide_generation_concurrency,
+)
+
+
+class PresentationGenerationBudget:
+    """
+    Concurrency budget for the LLM and asset calls of presentation generation.
+    A single presentation gets its own budget, presentations of a batch share
+    one so they do not compete for provider rate limits. Calls are keyed by
+    presentation, which keeps the budget fair between them.
+    """
+
+    def __init__(
+        self,
+        llm_concurrency: Optional[int] = None,
+        asset_concurrency: Optional[int] = None,
+    ):
+        self.llm_limiter = AdaptiveConcurrencyLimiter(
+            llm_concurrency or get_slide_generation_concurrency()
+        )
+        self.asset_limiter = AdaptiveConcurrencyLimiter(
+            asset_concurrency or get_asset_fetch_concurrency()
+        )
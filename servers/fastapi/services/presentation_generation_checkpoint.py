@@ -0,0 +1,159 @@
+import asyncio
+import copy
+from typing import List, Optional, Tuple
+import uuid
+
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from constants.presentation import PRESENTATION_GENERATION_CHECKPOINT_SLIDES
+from models.presentation_outline_model import PresentationOutlineModel
+from models.presentation_structure_model import PresentationStructureModel
+from models.sql.async_presentation_generation_status import (
+    AsyncPresentationGenerationTaskModel,
+)
+from models.sql.image_asset import ImageAsset
+from services.database import async_session_maker
+
+
+class PresentationGenerationCheckpoint:
+    """
+    Persists every completed stage of a presentation generation task
+    (outlines, structure, slide content and fetched assets) on the task row,
+    so a retried or resumed task continues from the last completed unit.
+    Stages are saved as they complete. Every save writes the whole checkpoint,
+    so completed slides are saved together once `slides_per_save` of them are
+    pending, and the rest when the slide stage ends or fails (see `flush`).
+    """
+
+    def __init__(
+        self,
+        task_id: str,
+        data: Optional[dict] = None,
+        session_maker: async_sessionmaker = async_session_maker,
+        slides_per_save: int = PRESENTATION_GENERATION_CHECKPOINT_SLIDES,
+    ):
+        self.task_id = task_id
+        self.data = copy.deepcopy(data) if data else {}
+        self.session_maker = session_maker
+        self.slides_per_save = slides_per_save
+        self._unsaved_slides = 0
+        self._lock = asyncio.Lock()
+
+    @classmethod
+    def from_task(
+        cls, task: AsyncPresentationGenerationTaskModel
+    ) -> "PresentationGenerationCheckpoint":
+        return cls(task.id, task.checkpoint)
+
+    def get_outlines(self) -> Optional[Tuple[PresentationOutlineModel, int]]:
+        outlines = self.data.get("outlines")
+        if not outlines:
+            return None
+        return (
+            PresentationOutlineModel(**outlines["outlines"]),
+            outlines["total_outlines"],
+        )
+
+    async def save_outlines(self, outlines: PresentationOutlineModel, total: int):
+        self.data["outlines"] = {
+            "outlines": outlines.model_dump(mode="json"),
+            "total_outlines": total,
+        }
+        await self._save()
+
+    def get_structure(
+        self,
+    ) -> Optional[Tuple[PresentationOutlineModel, PresentationStructureModel]]:
+        structure = self.data.get("structure")
+        if not structure:
+            return None
+        return (
+            PresentationOutlineModel(**structure["outlines"]),
+            PresentationStructureModel(**structure["structure"]),
+        )
+
+    async def save_structure(
+        self,
+        outlines: PresentationOutlineModel,
+        structure: PresentationStructureModel,
+    ):
+        """Saves the final outlines and structure, table of contents included."""
+        self.data["structure"] = {
+            "outlines": outlines.model_dump(mode="json"),
+            "structure": structure.model_dump(mode="json"),
+        }
+        await self._save()
+
+    def get_slide_content(self, index: int) -> Optional[dict]:
+        slide = self.data.get("slides", {}).get(str(index))
+        if not slide:
+            return None
+        return copy.deepcopy(slide["content"])
+
+    def get_slide_assets(self, index: int) -> Optional[List[ImageAsset]]:
+        """Returns None if assets of the slide were not fetched yet."""
+        slide = self.data.get("slides", {}).get(str(index))
+        if not slide or slide["assets"] is None:
+            return None
+        return [
+            ImageAsset(
+                id=uuid.UUID(asset["id"]),
+                path=asset["path"],
+                is_uploaded=asset["is_uploaded"],
+                extras=asset["extras"],
+            )
+            for asset in slide["assets"]
+        ]
+
+    def discard_slides(self):
+        """Slides saved for outlines that are being generated again are stale."""
+        self.data.pop("slides", None)
+
+    async def save_slide_content(self, index: int, content: dict):
+        await self._save_slide(
+            index, {"content": copy.deepcopy(content), "assets": None}
+        )
+
+    async def save_slide_assets(
+        self, index: int, content: dict, assets: List[ImageAsset]
+    ):
+        """Saves slide content with asset urls filled in and the fetched assets."""
+        slide = {
+            "content": copy.deepcopy(content),
+            "assets": [
+                {
+                    "id": str(asset.id),
+                    "path": asset.path,
+                    "is_uploaded": asset.is_uploaded,
+                    "extras": asset.extras,
+                }
+                for asset in assets
+            ],
+        }
+        await self._save_slide(index, slide)
+
+    async def _save_slide(self, index: int, slide: dict):
+        self.data.setdefault("slides", {})[str(index)] = slide
+        self._unsaved_slides += 1
+        if self._unsaved_slides >= self.slides_per_save:
+            await self._save()
+
+    async def flush(self):
+        """Saves the slides completed since the last save."""
+        if self._unsaved_slides:
+            await self._save()
+
+    async def _save(self):
+        # Slides finish concurrently, so writes are serialized and always
+        # store a full snapshot
+        async with self._lock:
+            self._unsaved_slides = 0
+            data = copy.deepcopy(self.data)
+            async with self.session_maker() as session:
+                await session.execute(
+                    update(AsyncPresentationGenerationTaskModel)
+                    .where(AsyncPresentationGenerationTaskModel.id == self.task_id)
+                    .values(checkpoint=data)
+                )
+                await session.commit()
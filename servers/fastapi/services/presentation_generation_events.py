@@ -0,0 +1,86 @@
+import asyncio
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import AsyncGenerator, Dict, Optional, Set
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from constants.presentation import PRESENTATION_GENERATION_EVENTS_KEEP_ALIVE
+from models.presentation_generation_event import PresentationGenerationEvent
+from models.sql.async_presentation_generation_status import (
+    AsyncPresentationGenerationTaskModel,
+)
+from services.database import async_session_maker
+
+
+class PresentationGenerationEvents:
+    """
+    In-process pub/sub of progress events of presentation generation tasks.
+    Events are only delivered to subscribers in the process running the task
+    and are not stored, the status row of the task holds the current stage.
+    Tasks run by another process are followed by reading their status row
+    when no event arrived for `keep_alive` seconds.
+    """
+
+    def __init__(
+        self,
+        session_maker: async_sessionmaker = async_session_maker,
+        keep_alive: float = PRESENTATION_GENERATION_EVENTS_KEEP_ALIVE,
+    ):
+        self.session_maker = session_maker
+        self.keep_alive = keep_alive
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = defaultdict(set)
+
+    def publish(self, task_id: str, event: PresentationGenerationEvent):
+        for queue in self._subscribers.get(task_id, ()):
+            queue.put_nowait(event)
+
+    def publish_status(self, task: AsyncPresentationGenerationTaskModel):
+        self.publish(task.id, PresentationGenerationEvent.from_task(task))
+
+    @contextmanager
+    def subscribe(self, task_id: str):
+        queue: asyncio.Queue[PresentationGenerationEvent] = asyncio.Queue()
+        self._subscribers[task_id].add(queue)
+        try:
+            yield queue
+        finally:
+            self._subscribers[task_id].discard(queue)
+            if not self._subscribers[task_id]:
+                del self._subscribers[task_id]
+
+    async def _get_status(self, task_id: str) -> Optional[PresentationGenerationEvent]:
+        async with self.session_maker() as session:
+            task = await session.get(AsyncPresentationGenerationTaskModel, task_id)
+            return task and PresentationGenerationEvent.from_task(task)
+
+    async def iterate(
+        self, task_id: str
+    ) -> AsyncGenerator[Optional[PresentationGenerationEvent], None]:
+        """
+        Yields the current status of the task, then its events until it ends.
+        None is yielded when nothing changed for `keep_alive` seconds.
+        """
+        with self.subscribe(task_id) as events:
+            status = await self._get_status(task_id)
+            if not status:
+                return
+            yield status
+
+            while not status.is_final:
+                try:
+                    event = await asyncio.wait_for(events.get(), self.keep_alive)
+                except asyncio.TimeoutError:
+                    event = await self._get_status(task_id)
+                    if not event:
+                        return
+                    if event == status:
+                        yield None
+                        continue
+
+                if event.type == "status":
+                    status = event
+                yield event
+
+
+PRESENTATION_GENERATION_EVENTS = PresentationGenerationEvents()
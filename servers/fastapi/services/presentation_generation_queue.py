@@ -0,0 +1,363 @@
+import asyncio
+from asyncio import Task
+from datetime import datetime, timedelta
+import secrets
+import traceback
+from typing import Dict, List, Optional, Tuple
+import uuid
+from weakref import WeakValueDictionary
+
+from sqlalchemy import or_, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlmodel import select
+
+from constants.presentation import DEFAULT_PRESENTATION_GENERATION_WORKERS
+from enums.llm_request_priority import LLMRequestPriority
+from models.generate_presentation_request import GeneratePresentationRequest
+from models.sql.async_presentation_generation_status import (
+    AsyncPresentationGenerationTaskModel,
+)
+from services.database import async_session_maker
+from services.llm_request_scheduler import llm_request_priority
+from services.presentation_generation_budget import PresentationGenerationBudget
+from services.presentation_generation_events import PRESENTATION_GENERATION_EVENTS
+from utils.get_env import get_presentation_generation_workers_env
+from utils.parsers import parse_int_or_none
+
+
+class PresentationGenerationQueue:
+    """
+    Durable presentation generation job queue backed by the
+    async_presentation_generation_tasks table.
+
+    A pool of workers claims pending jobs atomically, so several API nodes can
+    share one queue. Running jobs keep a heartbeat and jobs whose heartbeat
+    expires (the node died or restarted) are put back in the queue.
+
+    Jobs of a batch are queued like any other job and the jobs of a batch that
+    run at the same time on a node share one generation budget.
+    """
+
+    poll_interval = 2.0
+    heartbeat_interval = 30.0
+    lease_timeout = timedelta(minutes=3)
+    max_attempts = 3
+
+    def __init__(self, session_maker: async_sessionmaker = async_session_maker):
+        self.session_maker = session_maker
+        self.worker_id = f"worker-{secrets.token_hex(8)}"
+        self._workers: List[Task] = []
+        # Budgets are dropped once no job of their batch is running
+        self._batch_budgets: Dict[str, PresentationGenerationBudget] = (
+            WeakValueDictionary()
+        )
+        self._wakeup: Optional[asyncio.Event] = None
+
+    def get_worker_count(self) -> int:
+        workers = parse_int_or_none(get_presentation_generation_workers_env())
+        if workers is None or workers < 0:
+            return DEFAULT_PRESENTATION_GENERATION_WORKERS
+        return workers
+
+    async def enqueue(
+        self,
+        sql_session: AsyncSession,
+        request: GeneratePresentationRequest,
+        presentation_id,
+    ) -> AsyncPresentationGenerationTaskModel:
+        task = AsyncPresentationGenerationTaskModel(
+            status="pending",
+            message="Queued for generation",
+            data=None,
+            presentation_id=presentation_id,
+            request=request.model_dump(mode="json"),
+        )
+        sql_session.add(task)
+        await sql_session.commit()
+        self.notify()
+        return task
+
+    async def requeue(
+        self, sql_session: AsyncSession, task: AsyncPresentationGenerationTaskModel
+    ) -> AsyncPresentationGenerationTaskModel:
+        """Queues a failed task again, it continues from its checkpoint."""
+        task.status = "pending"
+        task.message = "Queued for generation"
+        task.error = None
+        task.worker_id = None
+        task.attempts = 0
+        task.updated_at = datetime.now()
+        sql_session.add(task)
+        await sql_session.commit()
+        PRESENTATION_GENERATION_EVENTS.publish_status(task)
+        self.notify()
+        return task
+
+    async def enqueue_batch(
+        self,
+        sql_session: AsyncSession,
+        requests: List[Tuple[GeneratePresentationRequest, uuid.UUID]],
+    ) -> Tuple[str, List[AsyncPresentationGenerationTaskModel]]:
+        batch_id = f"batch-{secrets.token_hex(16)}"
+        tasks = [
+            AsyncPresentationGenerationTaskModel(
+                status="pending",
+                message="Queued for generation",
+                data=None,
+                presentation_id=presentation_id,
+                request=request.model_dump(mode="json"),
+                batch_id=batch_id,
+            )
+            for request, presentation_id in requests
+        ]
+        sql_session.add_all(tasks)
+        await sql_session.commit()
+        self.notify()
+        return batch_id, tasks
+
+    def get_batch_budget(self, batch_id: str) -> PresentationGenerationBudget:
+        """Returns the budget shared by the running jobs of the batch."""
+        budget = self._batch_budgets.get(batch_id)
+        if budget is None:
+            budget = PresentationGenerationBudget()
+            self._batch_budgets[batch_id] = budget
+        return budget
+
+    def notify(self):
+        if self._wakeup:
+            self._wakeup.set()
+
+    async def start(self):
+        worker_count = self.get_worker_count()
+        if self._workers or worker_count == 0:
+            return
+
+        self._wakeup = asyncio.Event()
+        await self.recover_orphaned_jobs()
+        self._workers = [
+            asyncio.create_task(self._worker_loop()) for _ in range(worker_count)
+        ]
+        print(f"Started {worker_count} presentation generation workers")
+
+    async def stop(self):
+        running = list(self._workers)
+        for task in running:
+            task.cancel()
+        await asyncio.gather(*running, return_exceptions=True)
+        self._workers = []
+
+        # Hand jobs interrupted by shutdown back to the queue right away
+        async with self.session_maker() as session:
+            await session.execute(
+                update(AsyncPresentationGenerationTaskModel)
+                .where(
+                    AsyncPresentationGenerationTaskModel.worker_id == self.worker_id,
+                    AsyncPresentationGenerationTaskModel.status == "processing",
+                )
+                .values(
+                    status="pending",
+                    worker_id=None,
+                    message="Queued for generation",
+                    updated_at=datetime.now(),
+                )
+            )
+            await session.commit()
+
+    async def recover_orphaned_jobs(self):
+        expired_before = datetime.now() - self.lease_timeout
+        orphaned = (
+            AsyncPresentationGenerationTaskModel.status == "processing",
+            or_(
+                AsyncPresentationGenerationTaskModel.heartbeat_at.is_(None),
+                AsyncPresentationGenerationTaskModel.heartbeat_at < expired_before,
+            ),
+        )
+        async with self.session_maker() as session:
+            await session.execute(
+                update(AsyncPresentationGenerationTaskModel)
+                .where(
+                    *orphaned,
+                    AsyncPresentationGenerationTaskModel.attempts >= self.max_attempts,
+                )
+                .values(
+                    status="error",
+                    worker_id=None,
+                    message="Presentation generation failed",
+                    error={
+                        "status_code": 500,
+                        "detail": "Presentation generation was interrupted too many times",
+                    },
+                    updated_at=datetime.now(),
+                )
+            )
+            result = await session.execute(
+                update(AsyncPresentationGenerationTaskModel)
+                .where(*orphaned)
+                .values(
+                    status="pending",
+                    worker_id=None,
+                    message="Queued for generation",
+                    updated_at=datetime.now(),
+                )
+            )
+            await session.commit()
+
+        if result.rowcount:
+            print(f"Recovered {result.rowcount} orphaned presentation generation jobs")
+
+    async def claim_next_job(
+        self, session: AsyncSession
+    ) -> Optional[AsyncPresentationGenerationTaskModel]:
+        query = (
+            select(AsyncPresentationGenerationTaskModel)
+            .where(AsyncPresentationGenerationTaskModel.status == "pending")
+            .order_by(AsyncPresentationGenerationTaskModel.created_at)
+        )
+
+        if session.bind.dialect.name in ("postgresql", "mysql"):
+            task = await session.scalar(
+                query.limit(1).with_for_update(skip_locked=True)
+            )
+            if not task:
+                await session.commit()
+                return None
+            self._mark_claimed(task)
+            await session.commit()
+            return task
+
+        # SQLite has no row locks, but writes are serialized, so a conditional
+        # update on the pending status claims a job atomically
+        candidate_ids = list(
+            await session.scalars(
+                query.with_only_columns(AsyncPresentationGenerationTaskModel.id).limit(
+                    5
+                )
+            )
+        )
+        for candidate_id in candidate_ids:
+            result = await session.execute(
+                update(AsyncPresentationGenerationTaskModel)
+                .where(
+                    AsyncPresentationGenerationTaskModel.id == candidate_id,
+                    AsyncPresentationGenerationTaskModel.status == "pending",
+                )
+                .values(
+                    status="processing",
+                    worker_id=self.worker_id,
+                    heartbeat_at=datetime.now(),
+                    updated_at=datetime.now(),
+                    attempts=AsyncPresentationGenerationTaskModel.attempts + 1,
+                )
+            )
+            await session.commit()
+            if result.rowcount == 1:
+                return await session.get(
+                    AsyncPresentationGenerationTaskModel,
+                    candidate_id,
+                    populate_existing=True,
+                )
+        return None
+
+    def _mark_claimed(self, task: AsyncPresentationGenerationTaskModel):
+        task.status = "processing"
+        task.worker_id = self.worker_id
+        task.heartbeat_at = datetime.now()
+        task.updated_at = datetime.now()
+        task.attempts = (task.attempts or 0) + 1
+
+    async def _worker_loop(self):
+        last_recovery = datetime.now()
+        while True:
+            try:
+                if datetime.now() - last_recovery > self.lease_timeout:
+                    await self.recover_orphaned_jobs()
+                    last_recovery = datetime.now()
+
+                async with self.session_maker() as session:
+                    task = await self.claim_next_job(session)
+                    if task:
+                        await self._run_job(session, task)
+                        continue
+
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                traceback.print_exc()
+
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _heartbeat(self, task_id: str, job: asyncio.Future):
+        """
+        Keeps the lease of a running job. If the job was handed to another
+        worker in the meantime, the local job is cancelled so it does not run
+        twice.
+        """
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            async with self.session_maker() as session:
+                result = await session.execute(
+                    update(AsyncPresentationGenerationTaskModel)
+                    .where(
+                        AsyncPresentationGenerationTaskModel.id == task_id,
+                        AsyncPresentationGenerationTaskModel.worker_id
+                        == self.worker_id,
+                        AsyncPresentationGenerationTaskModel.status == "processing",
+                    )
+                    .values(heartbeat_at=datetime.now())
+                )
+                await session.commit()
+            if not result.rowcount:
+                print(f"Lost the lease of presentation generation job {task_id}")
+                job.cancel()
+                return
+
+    async def _run_job(
+        self,
+        session: AsyncSession,
+        task: AsyncPresentationGenerationTaskModel,
+    ):
+        # Imported here to avoid a circular import with the presentation router
+        from api.v1.ppt.endpoints.presentation import generate_presentation_handler
+
+        if not task.request or not task.presentation_id:
+            task.status = "error"
+            task.message = "Presentation generation failed"
+            task.error = {"status_code": 400, "detail": "Task has no request"}
+            task.updated_at = datetime.now()
+            await session.commit()
+            PRESENTATION_GENERATION_EVENTS.publish_status(task)
+            return
+
+        task.message = "Starting presentation generation"
+        await session.commit()
+        PRESENTATION_GENERATION_EVENTS.publish_status(task)
+
+        # Jobs of a batch share one budget, other jobs get their own
+        budget = self.get_batch_budget(task.batch_id) if task.batch_id else None
+        with llm_request_priority(LLMRequestPriority.BULK):
+            job = asyncio.ensure_future(
+                generate_presentation_handler(
+                    GeneratePresentationRequest(**task.request),
+                    task.presentation_id,
+                    async_status=task,
+                    sql_session=session,
+                    budget=budget,
+                )
+            )
+        heartbeat = asyncio.create_task(self._heartbeat(task.id, job))
+        try:
+            await job
+        except asyncio.CancelledError:
+            # Only the heartbeat cancels the job without cancelling this worker
+            if not heartbeat.done():
+                raise
+        finally:
+            heartbeat.cancel()
+            job.cancel()
+
+
+PRESENTATION_GENERATION_QUEUE = PresentationGenerationQueue()
@@ -0,0 +1,322 @@
+import asyncio
+from functools import partial
+from typing import AsyncGenerator, Callable, Dict, List, Optional
+import uuid
+
+from models.presentation_generation_event import PresentationGenerationEvent
+from models.presentation_layout import PresentationLayoutModel, SlideLayoutModel
+from models.presentation_outline_model import SlideOutlineModel
+from models.sql.image_asset import ImageAsset
+from models.sql.slide import SlideModel
+from services.image_generation_service import ImageGenerationService
+from services.presentation_generation_budget import PresentationGenerationBudget
+from services.presentation_generation_checkpoint import (
+    PresentationGenerationCheckpoint,
+)
+from utils.async_iterator import iterate_concurrently_in_order
+from utils.llm_calls.generate_slide_content import (
+    get_slide_content_from_type_and_outline,
+    get_slide_contents_from_types_and_outlines,
+)
+from utils.ppt_utils import get_slides_per_llm_call
+from utils.process_slides import process_slide_and_fetch_assets
+
+
+class SlideGenerationPipeline:
+    """
+    Two stage slide generation pipeline.
+    Content generation runs behind the adaptive LLM limit of the generation
+    budget and asset fetching for a slide starts as soon as its content is
+    generated, behind the asset limit, so asset latency overlaps with LLM latency.
+    With a checkpoint, completed slide content and assets are saved as they
+    finish and reused instead of being generated again.
+    With more than one slide per call, consecutive slides are generated together
+    in a single LLM call and invalid slides are generated again one by one.
+    With the batch API, slide content calls are sent to the provider batch API
+    and are not limited by the budget, as they only wait for the batch.
+    Completed slides and assets are reported to `on_event` as progress events.
+    """
+
+    def __init__(
+        self,
+        presentation_id: uuid.UUID,
+        layout: PresentationLayoutModel,
+        image_generation_service: ImageGenerationService,
+        language: str,
+        tone: Optional[str] = None,
+        verbosity: Optional[str] = None,
+        instructions: Optional[str] = None,
+        budget: Optional[PresentationGenerationBudget] = None,
+        checkpoint: Optional[PresentationGenerationCheckpoint] = None,
+        use_cache: bool = True,
+        slides_per_call: Optional[int] = None,
+        use_batch_api: bool = False,
+        on_event: Optional[Callable[[PresentationGenerationEvent], None]] = None,
+    ):
+        self.presentation_id = presentation_id
+        self.layout = layout
+        self.image_generation_service = image_generation_service
+        self.language = language
+        self.tone = tone
+        self.verbosity = verbosity
+        self.instructions = instructions
+        self.checkpoint = checkpoint
+        self.use_cache = use_cache
+        self.slides_per_call = slides_per_call or get_slides_per_llm_call()
+        self.use_batch_api = use_batch_api
+        self.on_event = on_event
+
+        self.budget = budget or PresentationGenerationBudget()
+        self._slide_tasks: Dict[int, asyncio.Task] = {}
+        self._group_tasks: List[asyncio.Task] = []
+        self._asset_tasks: List[asyncio.Task] = []
+        self._restored_assets: List[ImageAsset] = []
+
+    def _report(self, event_type: str, index: int):
+        if self.on_event:
+            self.on_event(PresentationGenerationEvent(type=event_type, index=index))
+
+    async def _run_llm_call(self, func):
+        if self.use_batch_api:
+            return await func()
+        return await self.budget.llm_limiter.run(func, key=self.presentation_id)
+
+    async def generate_slide_content(
+        self, slide_layout: SlideLayoutModel, outline: SlideOutlineModel
+    ) -> dict:
+        return await self._run_llm_call(
+            partial(
+                get_slide_content_from_type_and_outline,
+                slide_layout,
+                outline,
+                self.language,
+                self.tone,
+                self.verbosity,
+                self.instructions,
+                self.use_cache,
+                self.use_batch_api,
+            )
+        )
+
+    async def generate_slide_group_contents(
+        self,
+        indices: List[int],
+        slide_layouts: List[SlideLayoutModel],
+        outlines: List[SlideOutlineModel],
+    ) -> Dict[int, dict]:
+        slide_contents = {}
+        if len(indices) > 1:
+            try:
+                slide_contents = await self._run_llm_call(
+                    partial(
+                        get_slide_contents_from_types_and_outlines,
+                        indices,
+                        slide_layouts,
+                        outlines,
+                        self.language,
+                        self.tone,
+                        self.verbosity,
+                        self.instructions,
+                        self.use_cache,
+                        self.use_batch_api,
+                    )
+                )
+            except Exception as e:
+                print(f"Multi slide generation failed for slides {indices}: {e}")
+
+        # Slides missing from the multi slide response are generated one by one
+        missing = [i for i, index in enumerate(indices) if index not in slide_contents]
+        missing_contents = await asyncio.gather(
+            *[
+                self.generate_slide_content(slide_layouts[i], outlines[i])
+                for i in missing
+            ]
+        )
+        for i, slide_content in zip(missing, missing_contents):
+            slide_contents[indices[i]] = slide_content
+        return slide_contents
+
+    def group_slides(self, indices: List[int]) -> List[List[int]]:
+        """Splits indices into runs of at most slides_per_call consecutive slides."""
+        groups = []
+        for index in indices:
+            if (
+                groups
+                and len(groups[-1]) < self.slides_per_call
+                and groups[-1][-1] == index - 1
+            ):
+                groups[-1].append(index)
+            else:
+                groups.append([index])
+        return groups
+
+    async def iterate_slide_contents(
+        self,
+        slide_layouts: List[SlideLayoutModel],
+        outlines: List[SlideOutlineModel],
+    ) -> AsyncGenerator[dict, None]:
+        """
+        Generates slide contents concurrently and yields them in slide order.
+        """
+        groups = self.group_slides(list(range(len(slide_layouts))))
+        group_funcs = [
+            partial(
+                self.generate_slide_group_contents,
+                group,
+                [slide_layouts[i] for i in group],
+                [outlines[i] for i in group],
+            )
+            for group in groups
+        ]
+        group_contents = iterate_concurrently_in_order(group_funcs, len(group_funcs))
+        try:
+            async for slide_contents in group_contents:
+                for index in sorted(slide_contents):
+                    yield slide_contents[index]
+        finally:
+            await group_contents.aclose()
+
+    def build_slide(
+        self, index: int, slide_layout: SlideLayoutModel, slide_content: dict
+    ) -> SlideModel:
+        return SlideModel(
+            presentation=self.presentation_id,
+            layout_group=self.layout.name,
+            layout=slide_layout.id,
+            index=index,
+            speaker_note=slide_content.get("__speaker_note__", ""),
+            content=slide_content,
+        )
+
+    async def _fetch_assets(self, slide: SlideModel) -> List[ImageAsset]:
+        assets = await self.budget.asset_limiter.run(
+            partial(
+                process_slide_and_fetch_assets, self.image_generation_service, slide
+            ),
+            key=self.presentation_id,
+        )
+        if self.checkpoint:
+            await self.checkpoint.save_slide_assets(slide.index, slide.content, assets)
+        self._report("assets", slide.index)
+        return assets
+
+    def fetch_assets(self, slide: SlideModel) -> asyncio.Task:
+        """Starts fetching assets for the slide. This will mutate slide content."""
+        task = asyncio.create_task(self._fetch_assets(slide))
+        self._asset_tasks.append(task)
+        return task
+
+    async def generate_slide(
+        self,
+        index: int,
+        slide_layout: SlideLayoutModel,
+        outline: SlideOutlineModel,
+        group: Optional[asyncio.Task] = None,
+    ) -> SlideModel:
+        slide_content = self.checkpoint and self.checkpoint.get_slide_content(index)
+        if slide_content:
+            slide = self.build_slide(index, slide_layout, slide_content)
+            assets = self.checkpoint.get_slide_assets(index)
+            self._report("slide", index)
+            if assets is not None:
+                self._restored_assets.extend(assets)
+                self._report("assets", index)
+            else:
+                self.fetch_assets(slide)
+            return slide
+
+        if group:
+            slide_content = (await group)[index]
+        else:
+            slide_content = await self.generate_slide_content(slide_layout, outline)
+        if self.checkpoint:
+            await self.checkpoint.save_slide_content(index, slide_content)
+        slide = self.build_slide(index, slide_layout, slide_content)
+        self._report("slide", index)
+        self.fetch_assets(slide)
+        return slide
+
+    def start_slide(
+        self,
+        index: int,
+        slide_layout: SlideLayoutModel,
+        outline: SlideOutlineModel,
+        group: Optional[asyncio.Task] = None,
+    ) -> asyncio.Task:
+        """Starts generating the slide, unless it was started already."""
+        if index not in self._slide_tasks:
+            self._slide_tasks[index] = asyncio.create_task(
+                self.generate_slide(index, slide_layout, outline, group)
+            )
+        return self._slide_tasks[index]
+
+    def start_slides(
+        self,
+        indices: List[int],
+        slide_layouts: List[SlideLayoutModel],
+        outlines: List[SlideOutlineModel],
+    ) -> List[asyncio.Task]:
+        """
+        Starts generating the slides that were not started already, consecutive
+        slides are generated together when slides_per_call is more than one.
+        """
+        slides = {
+            index: (slide_layout, outline)
+            for index, slide_layout, outline in zip(indices, slide_layouts, outlines)
+        }
+        pending = [
+            index
+            for index in indices
+            if index not in self._slide_tasks
+            and not (self.checkpoint and self.checkpoint.get_slide_content(index))
+        ]
+        for group in self.group_slides(pending):
+            group_task = None
+            if len(group) > 1:
+                group_task = asyncio.create_task(
+                    self.generate_slide_group_contents(
+                        group,
+                        [slides[index][0] for index in group],
+                        [slides[index][1] for index in group],
+                    )
+                )
+                self._group_tasks.append(group_task)
+            for index in group:
+                self.start_slide(index, *slides[index], group_task)
+
+        return [self.start_slide(index, *slides[index]) for index in indices]
+
+    async def generate_slides(
+        self,
+        slide_layouts: List[SlideLayoutModel],
+        outlines: List[SlideOutlineModel],
+    ) -> List[SlideModel]:
+        tasks = self.start_slides(
+            list(range(len(slide_layouts))), slide_layouts, outlines
+        )
+        try:
+            return await asyncio.gather(*tasks)
+        except BaseException:
+            self.cancel()
+            raise
+
+    async def wait_for_assets(self) -> List[ImageAsset]:
+        try:
+            assets_lists = await asyncio.gather(*self._asset_tasks)
+        except BaseException:
+            self.cancel()
+            raise
+
+        generated_assets = list(self._restored_assets)
+        for assets_list in assets_lists:
+            generated_assets.extend(assets_list)
+        return generated_assets
+
+    def cancel(self):
+        for task in [
+            *self._slide_tasks.values(),
+            *self._group_tasks,
+            *self._asset_tasks,
+        ]:
+            if not task.done():
+                task.cancel()
@@ -1,9 +1,9 @@
 import asyncio
-import aiohttp
 from sqlmodel import select
 from enums.webhook_event import WebhookEvent
 from models.sql.webhook_subscription import WebhookSubscription
 from services.database import get_async_session
+from services.http_client import HTTP_CLIENT
 
 
 class WebhookService:
@@ -42,13 +42,12 @@ class WebhookService:
             headers["Authorization"] = f"Bearer {subscription.secret}"
 
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    subscription.url,
-                    json=data,
-                    headers=headers,
-                ) as _:
-                    pass
+            async with HTTP_CLIENT.get_session().post(
+                subscription.url,
+                json=data,
+                headers=headers,
+            ) as _:
+                pass
 
         except Exception as e:
             print(f"Error sending request to webhook {subscription.id}: {e}")
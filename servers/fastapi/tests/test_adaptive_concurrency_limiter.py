@@ -0,0 +1,86 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from services.adaptive_concurrency_limiter import AdaptiveConcurrencyLimiter
+
+
+def test_keeps_limit_requests_in_flight():
+    limiter = AdaptiveConcurrencyLimiter(max_limit=4)
+    max_in_flight = 0
+
+    async def call():
+        nonlocal max_in_flight
+        max_in_flight = max(max_in_flight, limiter.in_flight)
+        await asyncio.sleep(0.01)
+        return True
+
+    async def run():
+        return await asyncio.gather(*[limiter.run(call) for _ in range(12)])
+
+    assert asyncio.run(run()) == [True] * 12
+    assert max_in_flight == 4
+
+
+def test_rate_limit_shrinks_limit_without_retrying():
+    limiter = AdaptiveConcurrencyLimiter(max_limit=8)
+    attempts = 0
+
+    async def call():
+        nonlocal attempts
+        attempts += 1
+        raise HTTPException(status_code=429, detail="Rate limited")
+
+    with pytest.raises(HTTPException):
+        asyncio.run(limiter.run(call))
+    assert attempts == 1
+    assert limiter.limit == 4
+
+
+def test_limit_grows_back_on_success():
+    limiter = AdaptiveConcurrencyLimiter(max_limit=4, initial_limit=1)
+
+    async def call():
+        return True
+
+    async def run():
+        for _ in range(20):
+            await limiter.run(call)
+
+    asyncio.run(run())
+    assert limiter.limit == 4
+
+
+def test_other_errors_do_not_shrink_limit():
+    limiter = AdaptiveConcurrencyLimiter(max_limit=4)
+    attempts = 0
+
+    async def call():
+        nonlocal attempts
+        attempts += 1
+        raise HTTPException(status_code=500, detail="Failed")
+
+    with pytest.raises(HTTPException):
+        asyncio.run(limiter.run(call))
+    assert attempts == 1
+    assert limiter.limit == 4
+
+
+def test_free_slots_are_shared_fairly_between_keys():
+    limiter = AdaptiveConcurrencyLimiter(max_limit=2)
+    order = []
+
+    async def call(key):
+        order.append(key)
+        await asyncio.sleep(0.01)
+
+    async def run():
+        # "large" queues all its calls before "small" asks for a slot
+        calls = [limiter.run(lambda: call("large"), key="large") for _ in range(6)]
+        calls += [limiter.run(lambda: call("small"), key="small") for _ in range(2)]
+        await asyncio.gather(*calls)
+
+    asyncio.run(run())
+    # Without fairness "small" would only run after all of "large"
+    assert order[:6].count("small") == 2
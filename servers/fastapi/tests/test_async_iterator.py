@@ -0,0 +1,65 @@
+import asyncio
+
+import pytest
+
+from utils.async_iterator import iterate_concurrently_in_order
+
+
+def test_results_are_yielded_in_input_order():
+    delays = [0.05, 0.01, 0.03, 0.0]
+
+    def make_func(index, delay):
+        async def func():
+            await asyncio.sleep(delay)
+            return index
+
+        return func
+
+    async def run():
+        funcs = [make_func(i, delay) for i, delay in enumerate(delays)]
+        return [each async for each in iterate_concurrently_in_order(funcs, 4)]
+
+    assert asyncio.run(run()) == [0, 1, 2, 3]
+
+
+def test_concurrency_is_bounded():
+    in_flight = 0
+    max_in_flight = 0
+
+    async def func():
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return True
+
+    async def run():
+        return [
+            each async for each in iterate_concurrently_in_order([func] * 10, 3)
+        ]
+
+    assert asyncio.run(run()) == [True] * 10
+    assert max_in_flight == 3
+
+
+def test_pending_work_is_cancelled_on_failure():
+    cancelled = []
+
+    async def fail():
+        raise ValueError("failed")
+
+    async def slow():
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    async def run():
+        async for _ in iterate_concurrently_in_order([fail, slow, slow], 3):
+            pass
+
+    with pytest.raises(ValueError):
+        asyncio.run(run())
+    assert len(cancelled) == 2
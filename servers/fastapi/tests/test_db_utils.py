@@ -0,0 +1,44 @@
+import asyncio
+
+from sqlalchemy import inspect, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from models.sql.async_presentation_generation_status import (
+    AsyncPresentationGenerationTaskModel,
+)
+from utils.db_utils import add_missing_columns, add_missing_indexes
+
+
+def get_columns_and_indexes(sync_conn):
+    inspector = inspect(sync_conn)
+    table_name = AsyncPresentationGenerationTaskModel.__tablename__
+    return (
+        {column["name"] for column in inspector.get_columns(table_name)},
+        {index["name"] for index in inspector.get_indexes(table_name)},
+    )
+
+
+def test_missing_columns_and_indexes_are_added_to_existing_tables():
+    table = AsyncPresentationGenerationTaskModel.__table__
+
+    async def run():
+        engine = create_async_engine("sqlite+aiosqlite://")
+        async with engine.begin() as conn:
+            await conn.execute(
+                text(
+                    f"CREATE TABLE {table.name} (id VARCHAR PRIMARY KEY, "
+                    "status VARCHAR, message VARCHAR, error JSON, "
+                    "created_at DATETIME, updated_at DATETIME, data JSON)"
+                )
+            )
+            for _ in range(2):
+                await conn.run_sync(add_missing_columns, [table])
+                await conn.run_sync(add_missing_indexes, [table])
+            columns, indexes = await conn.run_sync(get_columns_and_indexes)
+        await engine.dispose()
+        return columns, indexes
+
+    columns, indexes = asyncio.run(run())
+    assert {"worker_id", "checkpoint", "batch_id"} <= columns
+    assert f"ix_{table.name}_status" in indexes
+    assert f"ix_{table.name}_batch_id" in indexes
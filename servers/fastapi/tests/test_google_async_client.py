@@ -0,0 +1,66 @@
+import asyncio
+
+from google.genai.types import (
+    Candidate,
+    Content,
+    GenerateContentResponse,
+    GenerateContentResponseUsageMetadata,
+    Part,
+)
+
+from enums.llm_provider import LLMProvider
+from models.llm_message import LLMSystemMessage, LLMUserMessage
+from models.llm_usage import LLMUsage
+from services.llm_client import LLMClient
+
+
+def get_response(text: str, output_tokens: int = 0) -> GenerateContentResponse:
+    return GenerateContentResponse(
+        candidates=[Candidate(content=Content(role="model", parts=[Part(text=text)]))],
+        usage_metadata=GenerateContentResponseUsageMetadata(
+            prompt_token_count=10, candidates_token_count=output_tokens
+        ),
+    )
+
+
+class FakeAsyncModels:
+    async def generate_content(self, **kwargs):
+        return get_response("Hello world", output_tokens=2)
+
+    async def generate_content_stream(self, **kwargs):
+        async def stream():
+            yield get_response("Hello", output_tokens=1)
+            yield get_response(" world", output_tokens=2)
+
+        return stream()
+
+
+class FakeGoogleClient:
+    class aio:
+        models = FakeAsyncModels()
+
+    @property
+    def models(self):
+        raise AssertionError("Sync Google client must not be used")
+
+
+def test_google_calls_use_async_client():
+    client = LLMClient.__new__(LLMClient)
+    client.llm_provider = LLMProvider.GOOGLE
+    client.call_type = None
+    client.usage = LLMUsage()
+    client._client = FakeGoogleClient()
+    messages = [
+        LLMSystemMessage(content="Be brief"),
+        LLMUserMessage(content="Say hello"),
+    ]
+
+    async def run():
+        text = await client._generate_google("gemini", messages)
+        chunks = [chunk async for chunk in client._stream_google("gemini", messages)]
+        return text, chunks
+
+    text, chunks = asyncio.run(run())
+    assert text == "Hello world"
+    assert chunks == ["Hello", " world"]
+    assert client.usage == LLMUsage(input_tokens=20, output_tokens=4)
@@ -0,0 +1,67 @@
+import asyncio
+import threading
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from services.http_client import HTTP_CLIENT, HttpClient
+from utils.download_helpers import download_files
+
+
+def test_downloads_reuse_pooled_connections(tmp_path):
+    methods = []
+    connections = set()
+
+    async def get_image(request: web.Request):
+        methods.append(request.method)
+        connections.add(request.transport.get_extra_info("peername"))
+        return web.Response(body=b"image", content_type="image/png")
+
+    async def run():
+        app = web.Application()
+        app.router.add_get("/images/{name}", get_image)
+        async with TestServer(app) as server:
+            urls = [str(server.make_url(f"/images/{i}")) for i in range(40)]
+            try:
+                paths = await download_files(urls, str(tmp_path))
+            finally:
+                await HTTP_CLIENT.close()
+        return paths
+
+    paths = asyncio.run(run())
+    assert all(path and path.endswith(".png") for path in paths)
+    assert methods == ["GET"] * 40
+    assert len(connections) <= HTTP_CLIENT.max_connections_per_host
+
+
+def test_sessions_are_kept_per_loop_and_closed_together():
+    client = HttpClient()
+    other_loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=other_loop.run_forever)
+    thread.start()
+
+    async def get_session():
+        return client.get_session()
+
+    async def run():
+        session = client.get_session()
+        assert client.get_session() is session
+        await client.close()
+        return session
+
+    try:
+        other_session = asyncio.run_coroutine_threadsafe(
+            get_session(), other_loop
+        ).result()
+        session = asyncio.run(run())
+        # Waits for the close scheduled on the other loop
+        asyncio.run_coroutine_threadsafe(asyncio.sleep(0.05), other_loop).result()
+    finally:
+        other_loop.call_soon_threadsafe(other_loop.stop)
+        thread.join()
+        other_loop.close()
+
+    assert session is not other_session
+    assert session.closed
+    assert other_session.closed
+    assert client._sessions == {}
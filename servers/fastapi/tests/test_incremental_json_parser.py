@@ -0,0 +1,81 @@
+import json
+
+from models.presentation_outline_model import (
+    PresentationOutlineModel,
+    SlideOutlineModel,
+)
+from utils.incremental_json_parser import IncrementalJsonParser
+
+
+def feed_in_chunks(parser: IncrementalJsonParser, text: str, size: int = 3):
+    events = []
+    for i in range(0, len(text), size):
+        events.extend(parser.feed(text[i : i + size]))
+    return events
+
+
+def test_yields_array_elements_as_they_close():
+    parser = IncrementalJsonParser()
+    text = '{"slides": [{"content": "First"}, {"content": "Se'
+
+    events = feed_in_chunks(parser, text)
+    assert [(e.key, e.index, e.value) for e in events] == [
+        ("slides", 0, {"content": "First"})
+    ]
+
+    events = parser.feed('cond"}]}')
+    assert [(e.key, e.index, e.value) for e in events] == [
+        ("slides", 1, {"content": "Second"}),
+        ("slides", None, [{"content": "First"}, {"content": "Second"}]),
+    ]
+    assert parser.done
+
+
+def test_matches_json_loads_for_fields():
+    data = {
+        "title": 'Quotes " and brackets ]} inside, strings',
+        "slides": [{"content": "a\\n[b]"}, {"content": "{c}"}],
+        "count": 2,
+        "tags": ["x", 1, None],
+    }
+    parser = IncrementalJsonParser()
+
+    events = feed_in_chunks(parser, "```json\n" + json.dumps(data) + "\n```")
+
+    assert parser.fields == data
+    assert [e.value for e in events if e.key == "tags" and e.index is not None] == [
+        "x",
+        1,
+        None,
+    ]
+
+
+def test_repairs_elements_with_dirtyjson():
+    parser = IncrementalJsonParser()
+
+    events = parser.feed("{\"slides\": [{'content': 'First',}]}")
+
+    assert events[0].value == {"content": "First"}
+
+
+def test_validates_partial_results_with_response_model():
+    parser = IncrementalJsonParser(PresentationOutlineModel)
+
+    events = parser.feed('{"slides": [{"content": "First"}, {"title": "Second"}')
+    events += parser.feed(', {"content": "Third"}]}')
+
+    elements = [e for e in events if e.index is not None]
+    assert [e.index for e in elements] == [0, 2]
+    assert isinstance(elements[0].value, SlideOutlineModel)
+    assert elements[1].value.content == "Third"
+
+
+def test_get_result_repairs_malformed_output():
+    parser = IncrementalJsonParser(PresentationOutlineModel)
+
+    parser.feed("{slides: [{'content': 'First'}]}")
+
+    assert parser.malformed
+    assert parser.get_result() == PresentationOutlineModel(
+        slides=[SlideOutlineModel(content="First")]
+    )
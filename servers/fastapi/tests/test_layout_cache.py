@@ -0,0 +1,48 @@
+import asyncio
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from services.layout_cache import LayoutCache
+
+LAYOUT = {
+    "name": "general",
+    "ordered": False,
+    "slides": [{"id": "title", "json_schema": {"type": "object"}}],
+}
+
+
+def test_layouts_are_cached_revalidated_and_invalidated():
+    requests = []
+
+    async def get_template(request: web.Request):
+        requests.append(request.headers.get("If-None-Match"))
+        if request.headers.get("If-None-Match") == '"v1"':
+            return web.Response(status=304)
+        return web.json_response(LAYOUT, headers={"ETag": '"v1"'})
+
+    async def run():
+        app = web.Application()
+        app.router.add_get("/api/template", get_template)
+        async with TestServer(app) as server:
+            cache = LayoutCache(ttl=60)
+            cache.layout_url = str(server.make_url("/api/template?group={}"))
+
+            first, second = await asyncio.gather(
+                cache.get_layout("general"), cache.get_layout("general")
+            )
+            assert first is second
+            assert requests == [None]
+
+            # Expired entries are revalidated with their ETag
+            cache._ttl = 0.05
+            await asyncio.sleep(0.1)
+            assert await cache.get_layout("general") is first
+            assert requests == [None, '"v1"']
+
+            cache._ttl = 60
+            cache.invalidate("general")
+            assert await cache.get_layout("general") is not first
+            assert requests == [None, '"v1"', None]
+
+    asyncio.run(run())
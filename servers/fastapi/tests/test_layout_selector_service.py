@@ -0,0 +1,73 @@
+import re
+
+from models.presentation_layout import PresentationLayoutModel, SlideLayoutModel
+from models.presentation_outline_model import (
+    PresentationOutlineModel,
+    SlideOutlineModel,
+)
+from services.layout_selector_service import LayoutSelectorService
+
+VOCABULARY = ["title", "team", "chart", "metrics", "timeline", "steps"]
+
+
+def embed(texts):
+    # Bag of words over a tiny vocabulary instead of the ONNX model
+    embeddings = []
+    for text in texts:
+        words = re.findall(r"[a-z]+", text.lower())
+        embeddings.append([float(words.count(word)) for word in VOCABULARY])
+    return embeddings
+
+
+def get_layout():
+    return PresentationLayoutModel(
+        name="test",
+        slides=[
+            SlideLayoutModel(
+                id="title-slide",
+                description="Opening title",
+                json_schema={"properties": {"title": {"type": "string"}}},
+            ),
+            SlideLayoutModel(
+                id="chart-slide",
+                description="Metrics chart",
+                json_schema={"properties": {"chart": {"type": "object"}}},
+            ),
+            SlideLayoutModel(
+                id="timeline-slide",
+                description="Timeline of steps",
+                json_schema={
+                    "properties": {
+                        "steps": {"type": "array", "minItems": 3, "maxItems": 5}
+                    }
+                },
+            ),
+        ],
+    )
+
+
+def test_selects_most_similar_layout_per_outline():
+    selector = LayoutSelectorService(embedding_function=embed)
+    outline = PresentationOutlineModel(
+        slides=[
+            SlideOutlineModel(content="Title of the deck"),
+            SlideOutlineModel(content="Revenue metrics chart"),
+            SlideOutlineModel(content="Timeline\n- one\n- two\n- three"),
+        ]
+    )
+
+    structure = selector.select_layouts_sync(outline, get_layout())
+
+    assert structure.slides == [0, 1, 2]
+
+
+def test_returns_none_when_not_confident():
+    selector = LayoutSelectorService(embedding_function=embed)
+    outline = PresentationOutlineModel(
+        slides=[
+            SlideOutlineModel(content="Something unrelated"),
+            SlideOutlineModel(content="Also unrelated"),
+        ]
+    )
+
+    assert selector.select_layouts_sync(outline, get_layout()) is None
@@ -0,0 +1,116 @@
+import asyncio
+import json
+
+from fastapi import FastAPI, HTTPException, Request, UploadFile
+from fastapi.responses import PlainTextResponse
+import httpx
+from openai import AsyncOpenAI
+
+from models.llm_message import LLMSystemMessage, LLMUserMessage
+from services.llm_batch_service import LLMBatchService, OpenAIBatchBackend
+
+
+def get_openai_batch_stand_in() -> FastAPI:
+    """Mimics the files and batches endpoints of the OpenAI API."""
+    app = FastAPI()
+    app.state.files = {}
+    app.state.batches = {}
+
+    def get_batch(batch_id: str) -> dict:
+        return {
+            "id": batch_id,
+            "object": "batch",
+            "endpoint": "/v1/chat/completions",
+            "completion_window": "24h",
+            "created_at": 0,
+            **app.state.batches[batch_id],
+        }
+
+    @app.post("/v1/files")
+    async def create_file(file: UploadFile):
+        file_id = f"file-{len(app.state.files)}"
+        app.state.files[file_id] = (await file.read()).decode()
+        return {
+            "id": file_id,
+            "object": "file",
+            "bytes": 0,
+            "created_at": 0,
+            "filename": file.filename,
+            "purpose": "batch",
+        }
+
+    @app.get("/v1/files/{file_id}/content", response_class=PlainTextResponse)
+    async def get_file_content(file_id: str):
+        return app.state.files[file_id]
+
+    @app.post("/v1/batches")
+    async def create_batch(request: Request):
+        body = await request.json()
+        batch_id = f"batch-{len(app.state.batches)}"
+        app.state.batches[batch_id] = {
+            "input_file_id": body["input_file_id"],
+            "status": "in_progress",
+        }
+        return get_batch(batch_id)
+
+    @app.get("/v1/batches/{batch_id}")
+    async def retrieve_batch(batch_id: str):
+        batch = app.state.batches[batch_id]
+        if batch["status"] == "in_progress":
+            # Completes on the first poll
+            output = []
+            for line in app.state.files[batch["input_file_id"]].splitlines():
+                item = json.loads(line)
+                outline = item["body"]["messages"][-1]["content"]
+                if outline == "fail":
+                    response = {"status_code": 500, "body": {"error": "failed"}}
+                else:
+                    content = json.dumps({"title": outline})
+                    response = {
+                        "status_code": 200,
+                        "body": {"choices": [{"message": {"content": content}}]},
+                    }
+                output.append(
+                    json.dumps({"custom_id": item["custom_id"], "response": response})
+                )
+            output_file_id = f"file-{len(app.state.files)}"
+            app.state.files[output_file_id] = "\n".join(output)
+            batch["status"] = "completed"
+            batch["output_file_id"] = output_file_id
+        return get_batch(batch_id)
+
+    return app
+
+
+def test_requests_are_collected_into_one_openai_batch():
+    app = get_openai_batch_stand_in()
+    client = AsyncOpenAI(
+        api_key="test",
+        base_url="http://stand-in/v1",
+        http_client=httpx.AsyncClient(transport=httpx.ASGITransport(app=app)),
+    )
+    service = LLMBatchService(OpenAIBatchBackend(client))
+    service.collect_interval = 0.05
+    service.poll_interval = 0.05
+
+    async def generate(outline: str):
+        return await service.generate_structured(
+            "gpt-4.1",
+            [LLMSystemMessage(content="system"), LLMUserMessage(content=outline)],
+            {"type": "object"},
+        )
+
+    async def run():
+        return await asyncio.gather(
+            generate("First"),
+            generate("Second"),
+            generate("fail"),
+            return_exceptions=True,
+        )
+
+    first, second, failed = asyncio.run(run())
+
+    assert first == {"title": "First"}
+    assert second == {"title": "Second"}
+    assert isinstance(failed, HTTPException)
+    assert len(app.state.batches) == 1
@@ -0,0 +1,40 @@
+import asyncio
+
+from enums.llm_provider import LLMProvider
+from services.llm_client import LLMClient
+from services.llm_client_pool import LLM_CLIENT_POOL
+
+
+def test_provider_clients_are_reused_until_config_changes(monkeypatch):
+    monkeypatch.setenv("LLM", "openai")
+    monkeypatch.setenv("OPENAI_API_KEY", "first-key")
+    LLM_CLIENT_POOL.clear()
+
+    async def get_clients():
+        first = LLMClient()
+        second = LLMClient()
+        assert first._client is second._client
+        assert first.tool_calls_handler is not second.tool_calls_handler
+
+        monkeypatch.setenv("OPENAI_API_KEY", "second-key")
+        third = LLMClient()
+        assert third._client is not first._client
+        assert third._client.api_key == "second-key"
+
+        monkeypatch.setenv("LLM", "custom")
+        monkeypatch.setenv("CUSTOM_LLM_URL", "http://localhost:1234/v1")
+        custom = LLMClient()
+        assert custom.llm_provider == LLMProvider.CUSTOM
+        assert LLMClient()._client is custom._client
+        return custom._client
+
+    try:
+        custom_client = asyncio.run(get_clients())
+        # Clients are not shared with other event loops
+        assert asyncio.run(get_custom_client()) is not custom_client
+    finally:
+        LLM_CLIENT_POOL.clear()
+
+
+async def get_custom_client():
+    return LLMClient()._client
@@ -0,0 +1,158 @@
+import asyncio
+import json
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from enums.llm_provider import LLMProvider
+from models.llm_message import LLMUserMessage
+from services.llm_client import LLMClient
+from services.llm_client_pool import LLM_CLIENT_POOL
+from services.llm_failover import LLMFailover
+
+
+def get_completion(model: str, content: str) -> dict:
+    return {
+        "id": "completion",
+        "object": "chat.completion",
+        "created": 0,
+        "model": model,
+        "choices": [
+            {
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }
+        ],
+    }
+
+
+def get_chunk(model: str, content: str) -> str:
+    chunk = {
+        "id": "chunk",
+        "object": "chat.completion.chunk",
+        "created": 0,
+        "model": model,
+        "choices": [{"index": 0, "delta": {"content": content}}],
+    }
+    return f"data: {json.dumps(chunk)}\n\n"
+
+
+def get_stub_app(requests: list, healthy: bool) -> web.Application:
+    async def chat_completions(request: web.Request):
+        body = await request.json()
+        requests.append(body["model"])
+        if not healthy:
+            return web.json_response({"error": {"message": "down"}}, status=503)
+        if body.get("stream"):
+            response = web.StreamResponse(
+                headers={"Content-Type": "text/event-stream"}
+            )
+            await response.prepare(request)
+            for content in ('{"title": ', '"Hello"}'):
+                await response.write(get_chunk(body["model"], content).encode())
+            await response.write(b"data: [DONE]\n\n")
+            return response
+        return web.json_response(get_completion(body["model"], '{"title": "Hi"}'))
+
+    app = web.Application()
+    app.router.add_post("/v1/chat/completions", chat_completions)
+    return app
+
+
+def test_calls_fail_over_to_next_provider_and_breaker_skips_failing_one(
+    monkeypatch,
+):
+    custom_requests = []
+    ollama_requests = []
+    failover = LLMFailover(max_retries=1, retry_delay=0)
+    monkeypatch.setattr("services.llm_client.LLM_FAILOVER", failover)
+
+    async def run():
+        async with TestServer(
+            get_stub_app(custom_requests, healthy=False)
+        ) as custom_server, TestServer(
+            get_stub_app(ollama_requests, healthy=True)
+        ) as ollama_server:
+            monkeypatch.setenv("LLM", "custom")
+            monkeypatch.setenv("CUSTOM_LLM_URL", str(custom_server.make_url("/v1")))
+            monkeypatch.setenv("CUSTOM_MODEL", "custom-model")
+            monkeypatch.setenv("OLLAMA_URL", str(ollama_server.make_url("")))
+            monkeypatch.setenv("OLLAMA_MODEL", "ollama-model")
+            monkeypatch.setenv("LLM_FAILOVER_PROVIDERS", "ollama")
+            messages = [LLMUserMessage(content="Hi")]
+            schema = {"type": "object", "properties": {"title": {"type": "string"}}}
+
+            client = LLMClient()
+            response = await client.generate_structured(
+                "custom-model", messages, schema
+            )
+            assert response == {"title": "Hi"}
+            assert client.served_by == "ollama/ollama-model"
+
+            chunks = [
+                chunk
+                async for chunk in client.stream_structured(
+                    "custom-model", messages, schema
+                )
+            ]
+            assert "".join(chunks) == '{"title": "Hello"}'
+            assert custom_requests == ["custom-model"] * 4
+
+            # Enough failures open the breaker, the provider is skipped
+            breaker = failover.get_breaker(LLMProvider.CUSTOM)
+            breaker.max_failures = len(custom_requests)
+            breaker.record_failure()
+            assert await client.generate("custom-model", messages) == '{"title": "Hi"}'
+            assert len(custom_requests) == 4
+            assert ollama_requests == ["ollama-model"] * 3
+
+    try:
+        asyncio.run(run())
+    finally:
+        LLM_CLIENT_POOL.clear()
+
+
+def test_non_transient_errors_are_not_retried():
+    attempts = []
+    failover = LLMFailover(max_retries=3, retry_delay=0)
+
+    async def call(llm_provider: LLMProvider):
+        attempts.append(llm_provider)
+        if llm_provider == LLMProvider.OPENAI:
+            raise ValueError("invalid request")
+        return "ok"
+
+    result = asyncio.run(failover.run([LLMProvider.OPENAI, LLMProvider.OLLAMA], call))
+    assert result == "ok"
+    assert attempts == [LLMProvider.OPENAI, LLMProvider.OLLAMA]
+    assert not failover.get_breaker(LLMProvider.OPENAI).failures
+
+
+class RateLimitError(Exception):
+    status_code = 429
+
+
+def test_only_provider_is_tried_while_its_breaker_is_open():
+    attempts = []
+    failover = LLMFailover(max_retries=2, retry_delay=0)
+    failover.get_breaker(LLMProvider.OPENAI).max_failures = 2
+
+    async def call(llm_provider: LLMProvider):
+        attempts.append(llm_provider)
+        if len(attempts) <= 6:
+            raise RateLimitError("rate limited")
+        return "ok"
+
+    async def run():
+        for _ in range(2):
+            try:
+                await failover.run([LLMProvider.OPENAI], call)
+            except RateLimitError:
+                pass
+        assert failover.get_breaker(LLMProvider.OPENAI).is_open
+        return await failover.run([LLMProvider.OPENAI], call)
+
+    assert asyncio.run(run()) == "ok"
+    assert len(attempts) == 7
+    assert not failover.get_breaker(LLMProvider.OPENAI).is_open
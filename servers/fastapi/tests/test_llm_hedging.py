@@ -0,0 +1,155 @@
+import asyncio
+import gc
+
+from enums.llm_provider import LLMProvider
+from services.llm_client import LLMClient
+from services.llm_client_pool import LLM_CLIENT_POOL
+from services.llm_hedging import LLMHedging
+
+
+def get_hedging(**kwargs) -> LLMHedging:
+    hedging = LLMHedging(enabled=True, min_samples=5, **kwargs)
+    for _ in range(100):
+        hedging._latencies["slide_content"].append(0.01)
+    return hedging
+
+
+def test_slow_call_is_hedged_and_loser_cancelled():
+    hedging = get_hedging(max_percent=100)
+    cancelled = []
+
+    async def slow_call():
+        try:
+            await asyncio.sleep(1)
+            return {"title": "slow"}
+        except asyncio.CancelledError:
+            cancelled.append("slow")
+            raise
+
+    async def hedge():
+        await asyncio.sleep(0.01)
+        return {"title": "hedge"}
+
+    async def run():
+        result = await hedging.run("slide_content", slow_call, hedge)
+        await asyncio.sleep(0)
+        return result
+
+    assert asyncio.run(run()) == {"title": "hedge"}
+    assert cancelled == ["slow"]
+    assert hedging.hedged_calls == 1
+
+
+def test_invalid_response_waits_for_the_other_call():
+    hedging = get_hedging(max_percent=100)
+
+    async def call():
+        await asyncio.sleep(0.05)
+        return {"title": "valid"}
+
+    async def hedge():
+        return {}
+
+    result = asyncio.run(
+        hedging.run("slide_content", call, hedge, lambda result: "title" in result)
+    )
+    assert result == {"title": "valid"}
+
+
+def test_hedged_calls_are_capped():
+    hedging = get_hedging(max_percent=25)
+    hedges = []
+
+    async def call():
+        await asyncio.sleep(0.03)
+        return "call"
+
+    async def hedge():
+        hedges.append(1)
+        await asyncio.sleep(1)
+        return "hedge"
+
+    async def run():
+        for _ in range(8):
+            assert await hedging.run("slide_content", call, hedge) == "call"
+
+    asyncio.run(run())
+    assert len(hedges) == 2
+    assert hedging.hedged_calls == 2
+
+
+def test_cap_follows_recent_calls():
+    hedging = get_hedging(max_percent=25, window=8)
+    # Calls made before the window do not allow more hedges now
+    hedging.calls = 1000
+
+    async def call():
+        await asyncio.sleep(0.03)
+        return "call"
+
+    async def hedge():
+        await asyncio.sleep(1)
+        return "hedge"
+
+    async def run():
+        for _ in range(8):
+            await hedging.run("slide_content", call, hedge)
+
+    asyncio.run(run())
+    assert hedging.hedged_calls == 1
+    assert list(hedging._history).count(True) == 1
+
+
+def test_errors_of_losing_calls_are_retrieved():
+    hedging = get_hedging(max_percent=100)
+    unretrieved = []
+
+    async def call():
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            raise RuntimeError("Connection closed")
+
+    async def hedge():
+        return "hedge"
+
+    async def run():
+        asyncio.get_running_loop().set_exception_handler(
+            lambda _, context: unretrieved.append(context.get("exception"))
+        )
+        result = await hedging.run("slide_content", call, hedge)
+        await asyncio.sleep(0.01)
+        gc.collect()
+        return result
+
+    assert asyncio.run(run()) == "hedge"
+    # Other tests may leave tasks of closed loops behind
+    assert not any(str(error) == "Connection closed" for error in unretrieved)
+
+
+def test_hedge_without_fallback_provider_gets_its_own_client(monkeypatch):
+    monkeypatch.setenv("LLM", "ollama")
+    monkeypatch.setenv("OLLAMA_URL", "http://localhost:11434")
+    monkeypatch.delenv("LLM_FAILOVER_PROVIDERS", raising=False)
+    hedging = get_hedging(max_percent=100)
+    hedging._latencies["generate"] = hedging._latencies["slide_content"]
+    monkeypatch.setattr("services.llm_client.LLM_HEDGING", hedging)
+    client = LLMClient()
+    clients = []
+
+    async def call(call_client: LLMClient, model: str) -> str:
+        clients.append(call_client)
+        await asyncio.sleep(1 if len(clients) == 1 else 0.01)
+        return model
+
+    try:
+        result = asyncio.run(client._run_with_hedging("generate", "model", call))
+    finally:
+        LLM_CLIENT_POOL.clear()
+
+    assert result == "model"
+    assert clients[0] is client
+    assert clients[1] is not client
+    assert clients[1].llm_provider == LLMProvider.OLLAMA
+    assert clients[1].usage is client.usage
+    assert client.served_by == "ollama/model"
@@ -0,0 +1,73 @@
+import asyncio
+
+from aiohttp.test_utils import TestServer
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api.metrics import METRICS_ROUTER
+from models.llm_message import LLMUserMessage
+from models.llm_usage import LLMUsage
+from services.llm_client import LLMClient
+from services.llm_client_pool import LLM_CLIENT_POOL
+from services.llm_metrics import LLM_METRICS, LLMMetrics
+from tests.test_llm_failover import get_stub_app
+from utils.metrics import Histogram
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = Histogram("latency_seconds", "Latency", ("provider",), (1, 5))
+    for value in (0.5, 2, 10):
+        histogram.observe("openai", value=value)
+
+    assert histogram.render()[2:] == [
+        'latency_seconds_bucket{provider="openai",le="1"} 1',
+        'latency_seconds_bucket{provider="openai",le="5"} 2',
+        'latency_seconds_bucket{provider="openai",le="+Inf"} 3',
+        'latency_seconds_sum{provider="openai"} 12.5',
+        'latency_seconds_count{provider="openai"} 3',
+    ]
+
+
+def test_llm_calls_are_recorded_per_call_site(monkeypatch):
+    metrics = LLMMetrics()
+    monkeypatch.setattr("services.llm_client.LLM_METRICS", metrics)
+    requests = []
+
+    async def run():
+        async with TestServer(get_stub_app(requests, healthy=True)) as server:
+            monkeypatch.setenv("LLM", "custom")
+            monkeypatch.setenv("CUSTOM_LLM_URL", str(server.make_url("/v1")))
+            monkeypatch.delenv("LLM_FAILOVER_PROVIDERS", raising=False)
+            client = LLMClient(call_type="outline")
+            messages = [LLMUserMessage(content="Hi")]
+            async for _ in client.stream("custom-model", messages):
+                pass
+            await client.generate("custom-model", messages)
+            usage = LLMUsage(input_tokens=10, cached_input_tokens=4)
+            client._record_usage("custom-model", usage)
+
+    try:
+        asyncio.run(run())
+    finally:
+        LLM_CLIENT_POOL.clear()
+
+    labels = ("custom", "custom-model", "outline")
+    assert metrics.calls.get(*labels, "stream", "success") == 1
+    assert metrics.calls.get(*labels, "generate", "success") == 1
+    assert metrics.time_to_first_token.get_count(*labels) == 1
+    assert metrics.tool_call_depth.get_count(*labels) == 2
+    assert metrics.tokens.get(*labels, "cached_input") == 4
+
+
+def test_metrics_endpoint_serves_prometheus_text():
+    app = FastAPI()
+    app.include_router(METRICS_ROUTER)
+    LLM_METRICS.hedged_calls.inc("slide_content")
+
+    response = TestClient(app).get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert "# TYPE presenton_llm_call_duration_seconds histogram" in response.text
+    assert 'presenton_llm_hedged_calls_total{call_site="slide_content"}' in (
+        response.text
+    )
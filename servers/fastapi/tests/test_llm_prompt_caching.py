@@ -0,0 +1,69 @@
+from anthropic.types import Usage as AnthropicUsage
+from openai.types.completion_usage import CompletionUsage, PromptTokensDetails
+
+from enums.llm_provider import LLMProvider
+from models.llm_message import LLMSystemMessage, LLMUserMessage
+from models.llm_usage import LLMUsage
+from services.llm_client import LLMClient
+from utils.llm_calls.generate_slide_content import get_messages
+
+
+def get_client(provider: LLMProvider) -> LLMClient:
+    client = LLMClient.__new__(LLMClient)
+    client.llm_provider = provider
+    client.call_type = None
+    client.usage = LLMUsage()
+    return client
+
+
+def test_slide_prompts_share_a_static_prefix():
+    first = get_messages("First outline", "English", "casual", "concise", "Be brief")
+    second = get_messages("Second outline", "French", "funny", "text-heavy")
+
+    static_prefix = first[0].content.split("# User Instructions:")[0]
+    assert second[0].content.startswith(static_prefix)
+    assert "# Tone:" not in static_prefix
+    # Date is placed after the outline and does not change within a day
+    assert "## Current Date" in first[1].content.split("## Slide Outline")[1]
+    assert ":" not in first[1].content.split("## Current Date")[1]
+
+
+def test_anthropic_system_prompt_has_cache_breakpoint():
+    client = get_client(LLMProvider.ANTHROPIC)
+
+    system = client._get_anthropic_system_prompt(
+        [LLMSystemMessage(content="System"), LLMUserMessage(content="User")]
+    )
+
+    assert system == [
+        {"type": "text", "text": "System", "cache_control": {"type": "ephemeral"}}
+    ]
+    assert client._get_anthropic_system_prompt([LLMUserMessage(content="User")]) == ""
+
+
+def test_cached_tokens_are_reported():
+    client = get_client(LLMProvider.ANTHROPIC)
+    client._record_anthropic_usage(
+        "claude",
+        AnthropicUsage(
+            input_tokens=10,
+            output_tokens=5,
+            cache_read_input_tokens=1000,
+            cache_creation_input_tokens=0,
+        ),
+    )
+    client._record_openai_usage(
+        "gpt",
+        CompletionUsage(
+            prompt_tokens=2000,
+            completion_tokens=20,
+            total_tokens=2020,
+            prompt_tokens_details=PromptTokensDetails(cached_tokens=1024),
+        ),
+    )
+
+    assert client.usage == LLMUsage(
+        input_tokens=3010,
+        output_tokens=25,
+        cached_input_tokens=2024,
+    )
@@ -0,0 +1,123 @@
+import asyncio
+import time
+
+import pytest
+
+from enums.llm_request_priority import LLMRequestPriority
+from models.llm_message import LLMUserMessage
+from services.llm_rate_limiter import (
+    LLMRateLimiter,
+    estimate_tokens,
+    get_rate_limit,
+    parse_rate_limits,
+    record_llm_rate_limit_usage,
+)
+
+
+def test_rate_limits_are_parsed_per_provider_and_model():
+    limits = parse_rate_limits("100, openai=50,openai/GPT-4.1=10,google=invalid")
+    assert limits == {"": 100, "openai": 50, "openai/gpt-4.1": 10}
+    assert get_rate_limit(limits, "openai", "gpt-4.1") == 10
+    assert get_rate_limit(limits, "openai", "gpt-4o") == 50
+    assert get_rate_limit(limits, "anthropic", "claude") == 100
+    assert get_rate_limit({}, "openai", "gpt-4.1") is None
+
+
+def test_token_estimate_includes_expected_output():
+    messages = [LLMUserMessage(content="x" * 400)]
+    assert estimate_tokens(messages, max_tokens=50) > 150
+    assert estimate_tokens(messages, max_tokens=50) < estimate_tokens(messages)
+
+
+def test_calls_wait_for_requests_per_minute():
+    limiter = LLMRateLimiter(requests_per_minute={"openai": 600}, tokens_per_minute={})
+    limiter._get_buckets("openai", "gpt-4.1").requests.tokens = 1
+
+    async def call():
+        async with limiter.acquire("openai", "gpt-4.1", 100):
+            return time.monotonic()
+
+    async def run():
+        started_at = time.monotonic()
+        finished_at = await asyncio.gather(call(), call(), call())
+        return [value - started_at for value in finished_at]
+
+    first, second, third = asyncio.run(run())
+    # 600 requests per minute refill one request every 0.1 seconds
+    assert first < 0.05
+    assert second == pytest.approx(0.1, abs=0.05)
+    assert third == pytest.approx(0.2, abs=0.05)
+
+
+def test_interactive_calls_are_admitted_before_waiting_bulk_calls():
+    limiter = LLMRateLimiter(requests_per_minute={"openai": 1200}, tokens_per_minute={})
+    limiter._get_buckets("openai", "gpt-4.1").requests.tokens = 0
+    admitted = []
+
+    async def call(name: str, priority: LLMRequestPriority):
+        async with limiter.acquire("openai", "gpt-4.1", 100, priority):
+            admitted.append(name)
+
+    async def run():
+        bulk_calls = [
+            asyncio.create_task(call(f"bulk-{index}", LLMRequestPriority.BULK))
+            for index in range(3)
+        ]
+        await asyncio.sleep(0.01)
+        await call("interactive", LLMRequestPriority.INTERACTIVE)
+        await asyncio.gather(*bulk_calls)
+
+    asyncio.run(run())
+    assert admitted == ["interactive", "bulk-0", "bulk-1", "bulk-2"]
+
+
+def test_token_estimate_is_reconciled_with_usage():
+    limiter = LLMRateLimiter(requests_per_minute={}, tokens_per_minute={"": 10000})
+    token_bucket = limiter._get_buckets("google", "gemini").tokens
+
+    async def call():
+        async with limiter.acquire("google", "gemini", 3000):
+            assert token_bucket.tokens == pytest.approx(7000, abs=10)
+            record_llm_rate_limit_usage(500)
+
+    asyncio.run(call())
+    assert token_bucket.tokens == pytest.approx(9500, abs=10)
+
+
+def test_failed_calls_give_back_their_tokens():
+    limiter = LLMRateLimiter(requests_per_minute={}, tokens_per_minute={"": 10000})
+    token_bucket = limiter._get_buckets("google", "gemini").tokens
+
+    async def call():
+        async with limiter.acquire("google", "gemini", 3000):
+            raise RuntimeError("Connection error")
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(call())
+    assert token_bucket.tokens == pytest.approx(10000, abs=10)
+
+
+def test_given_back_tokens_do_not_overfill_the_bucket():
+    limiter = LLMRateLimiter(requests_per_minute={}, tokens_per_minute={"": 10000})
+    token_bucket = limiter._get_buckets("google", "gemini").tokens
+
+    async def call():
+        async with limiter.acquire("google", "gemini", 3000):
+            # Refilled while the call was running
+            token_bucket.tokens = 10000
+            raise RuntimeError("Connection error")
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(call())
+    assert token_bucket.tokens == 10000
+
+
+def test_unlimited_providers_are_not_tracked():
+    limiter = LLMRateLimiter(requests_per_minute={}, tokens_per_minute={})
+
+    async def call():
+        async with limiter.acquire("ollama", "llama3", 100000):
+            return True
+
+    assert asyncio.run(call())
+    assert limiter._buckets == {}
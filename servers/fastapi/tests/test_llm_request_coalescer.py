@@ -0,0 +1,185 @@
+import asyncio
+
+import pytest
+
+from models.llm_message import LLMSystemMessage, LLMUserMessage
+from models.llm_tools import SearchWebTool
+from models.llm_usage import LLMUsage
+from services.llm_client import LLMClient
+from services.llm_client_pool import LLM_CLIENT_POOL
+from services.llm_request_coalescer import LLMRequestCoalescer, get_llm_request_key
+
+
+def get_key(content: str, **options) -> str:
+    return get_llm_request_key(
+        "generate_structured",
+        "openai",
+        "gpt-4.1",
+        [LLMSystemMessage(content="system"), LLMUserMessage(content=content)],
+        {"type": "object"},
+        [SearchWebTool],
+        **options,
+    )
+
+
+def test_request_key_covers_messages_and_options():
+    assert get_key("text") == get_key("text")
+    assert get_key("text") != get_key("other text")
+    assert get_key("text", strict=True) != get_key("text", strict=False)
+    assert get_key("text", coalesce_key="variant-0") != get_key(
+        "text", coalesce_key="variant-1"
+    )
+
+
+def test_identical_calls_share_one_request():
+    coalescer = LLMRequestCoalescer(enabled=True)
+    calls = []
+
+    async def call():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return {"variants": ["a", "b"]}
+
+    async def run():
+        return await asyncio.gather(
+            coalescer.run("key", call),
+            coalescer.run("key", call),
+            coalescer.run("other", call),
+        )
+
+    first, second, other = asyncio.run(run())
+    assert len(calls) == 2
+    assert first == second == other
+    # Every caller gets its own copy of the response
+    assert first is not second
+    assert coalescer.coalesced_calls == 1
+    assert coalescer._calls == {}
+
+
+def test_errors_are_shared_and_not_cached():
+    coalescer = LLMRequestCoalescer(enabled=True)
+    calls = []
+
+    async def failing_call():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        raise RuntimeError("Connection error")
+
+    async def run():
+        results = await asyncio.gather(
+            coalescer.run("key", failing_call),
+            coalescer.run("key", failing_call),
+            return_exceptions=True,
+        )
+        assert all(isinstance(result, RuntimeError) for result in results)
+        with pytest.raises(RuntimeError):
+            await coalescer.run("key", failing_call)
+
+    asyncio.run(run())
+    assert len(calls) == 2
+
+
+def test_request_survives_cancelled_caller():
+    coalescer = LLMRequestCoalescer(enabled=True)
+    cancelled = []
+
+    async def call():
+        try:
+            await asyncio.sleep(0.05)
+            return "content"
+        except asyncio.CancelledError:
+            cancelled.append(1)
+            raise
+
+    async def run():
+        first = asyncio.ensure_future(coalescer.run("key", call))
+        second = asyncio.ensure_future(coalescer.run("key", call))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        assert await second == "content"
+
+        # Once nobody waits the request is cancelled
+        only = asyncio.ensure_future(coalescer.run("key", call))
+        await asyncio.sleep(0.01)
+        only.cancel()
+        await asyncio.sleep(0.01)
+
+    asyncio.run(run())
+    assert cancelled == [1]
+
+
+def test_streams_are_fanned_out_to_late_callers():
+    coalescer = LLMRequestCoalescer(enabled=True)
+    streams = []
+
+    async def open_stream():
+        streams.append(1)
+        for chunk in ["a", "b", "c"]:
+            await asyncio.sleep(0.01)
+            yield chunk
+
+    async def consume(delay: float):
+        await asyncio.sleep(delay)
+        return [chunk async for chunk in coalescer.stream("key", open_stream)]
+
+    async def run():
+        return await asyncio.gather(consume(0), consume(0.015))
+
+    assert asyncio.run(run()) == [["a", "b", "c"], ["a", "b", "c"]]
+    assert len(streams) == 1
+    assert coalescer._streams == {}
+
+
+def test_disabled_coalescer_sends_every_call():
+    coalescer = LLMRequestCoalescer(enabled=False)
+    calls = []
+
+    async def call():
+        calls.append(1)
+        return "content"
+
+    async def run():
+        return await asyncio.gather(
+            coalescer.run("key", call), coalescer.run("key", call)
+        )
+
+    assert asyncio.run(run()) == ["content", "content"]
+    assert len(calls) == 2
+
+
+def test_coalesced_clients_get_provider_and_usage(monkeypatch):
+    monkeypatch.setenv("LLM", "ollama")
+    monkeypatch.setenv("OLLAMA_URL", "http://localhost:11434")
+    monkeypatch.delenv("LLM_FAILOVER_PROVIDERS", raising=False)
+    monkeypatch.setattr(
+        "services.llm_client.LLM_REQUEST_COALESCER", LLMRequestCoalescer(enabled=True)
+    )
+    calls = []
+
+    async def generate(self, model, messages, max_tokens=None, tools=None):
+        calls.append(model)
+        await asyncio.sleep(0.01)
+        self._record_usage(model, LLMUsage(input_tokens=10, output_tokens=5))
+        return "content"
+
+    monkeypatch.setattr(LLMClient, "_generate", generate)
+    messages = [LLMUserMessage(content="Hi")]
+
+    async def run():
+        clients = [LLMClient(), LLMClient()]
+        results = await asyncio.gather(
+            *(client.generate("model", messages) for client in clients)
+        )
+        return clients, results
+
+    try:
+        clients, results = asyncio.run(run())
+    finally:
+        LLM_CLIENT_POOL.clear()
+
+    assert results == ["content", "content"]
+    assert calls == ["model"]
+    for client in clients:
+        assert client.served_by == "ollama/model"
+        assert client.usage.input_tokens == 10
+        assert client.usage.output_tokens == 5
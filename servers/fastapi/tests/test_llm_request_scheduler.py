@@ -0,0 +1,65 @@
+import asyncio
+
+from enums.llm_request_priority import LLMRequestPriority
+from services.llm_request_scheduler import (
+    LLMRequestScheduler,
+    get_llm_request_priority,
+    llm_request_priority,
+)
+
+
+def test_interactive_calls_are_served_before_waiting_bulk_calls():
+    scheduler = LLMRequestScheduler(max_concurrency=4)
+    order = []
+
+    async def call(name: str, priority: LLMRequestPriority):
+        async with scheduler.slot(priority):
+            order.append(name)
+            await asyncio.sleep(0.01)
+
+    async def run():
+        bulk = [
+            asyncio.create_task(call(f"bulk-{i}", LLMRequestPriority.BULK))
+            for i in range(6)
+        ]
+        await asyncio.sleep(0)
+        interactive = call("interactive", LLMRequestPriority.INTERACTIVE)
+        await asyncio.gather(*bulk, interactive)
+
+    asyncio.run(run())
+    # 3 bulk calls fill the bulk lane, the reserved slot serves the edit at once
+    assert order.index("interactive") == 3
+
+
+def test_bulk_calls_leave_reserved_capacity():
+    scheduler = LLMRequestScheduler(max_concurrency=4)
+    max_bulk_in_flight = 0
+    in_flight = 0
+
+    async def call():
+        nonlocal in_flight, max_bulk_in_flight
+        async with scheduler.slot(LLMRequestPriority.BULK):
+            in_flight += 1
+            max_bulk_in_flight = max(max_bulk_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+
+    async def run():
+        await asyncio.gather(*[call() for _ in range(10)])
+
+    asyncio.run(run())
+    assert max_bulk_in_flight == 3
+
+
+def test_priority_is_inherited_by_tasks():
+    async def read_priority():
+        return get_llm_request_priority()
+
+    async def run():
+        with llm_request_priority(LLMRequestPriority.BULK):
+            inner = await asyncio.create_task(read_priority())
+        return inner, get_llm_request_priority()
+
+    inner, outer = asyncio.run(run())
+    assert inner == LLMRequestPriority.BULK
+    assert outer == LLMRequestPriority.INTERACTIVE
@@ -0,0 +1,82 @@
+import asyncio
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlmodel import SQLModel
+
+from models.llm_message import LLMSystemMessage, LLMUserMessage
+from models.sql.llm_response_cache import LLMResponseCacheModel
+from services.llm_response_cache import LLMResponseCache, get_llm_response_cache_key
+
+
+def test_cache_key_depends_on_messages_schema_and_model():
+    messages = [LLMSystemMessage(content="system"), LLMUserMessage(content="user")]
+    schema = {"type": "object", "properties": {"title": {"type": "string"}}}
+
+    key = get_llm_response_cache_key("gpt-4.1", messages, schema)
+
+    assert key == get_llm_response_cache_key("gpt-4.1", list(messages), dict(schema))
+    assert key != get_llm_response_cache_key("gpt-4.1-mini", messages, schema)
+    assert key != get_llm_response_cache_key("gpt-4.1", messages[:1], schema)
+    assert key != get_llm_response_cache_key("gpt-4.1", messages, {"type": "object"})
+
+
+def test_cache_counts_hits_and_evicts_least_recently_used(tmp_path):
+    async def run():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/cache.db")
+        async with engine.begin() as conn:
+            await conn.run_sync(
+                SQLModel.metadata.create_all,
+                tables=[LLMResponseCacheModel.__table__],
+            )
+        cache = LLMResponseCache(
+            async_sessionmaker(engine, expire_on_commit=False),
+            ttl=60,
+            max_entries=2,
+        )
+
+        await cache.set("a", "model", {"title": "A"})
+        await cache.set("b", "model", {"title": "B"})
+        assert await cache.get("a") == {"title": "A"}
+        await cache.set("c", "model", {"title": "C"})
+
+        results = [await cache.get(key) for key in ["a", "b", "c"]]
+        await engine.dispose()
+        return cache, results
+
+    cache, results = asyncio.run(run())
+
+    assert results == [{"title": "A"}, None, {"title": "C"}]
+    assert (cache.hits, cache.misses) == (3, 1)
+
+
+def test_cache_evicts_least_recently_used_above_max_bytes(tmp_path):
+    async def run():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/cache.db")
+        async with engine.begin() as conn:
+            await conn.run_sync(
+                SQLModel.metadata.create_all,
+                tables=[LLMResponseCacheModel.__table__],
+            )
+        response = {"title": "x" * 100}
+        cache = LLMResponseCache(
+            async_sessionmaker(engine, expire_on_commit=False),
+            ttl=60,
+            max_entries=100,
+            max_bytes=250,
+        )
+
+        await cache.set("a", "model", response)
+        await cache.set("b", "model", response)
+        assert await cache.get("a") == response
+        await cache.set("c", "model", response)
+
+        results = [await cache.get(key) for key in ["a", "b", "c"]]
+        await engine.dispose()
+        return cache, results
+
+    cache, results = asyncio.run(run())
+
+    assert results == [{"title": "x" * 100}, None, {"title": "x" * 100}]
+    metrics = cache.render()
+    assert "presenton_llm_response_cache_hits_total 3" in metrics
+    assert "presenton_llm_response_cache_misses_total 1" in metrics
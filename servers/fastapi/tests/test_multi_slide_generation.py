@@ -0,0 +1,113 @@
+import asyncio
+from datetime import datetime
+
+from models.presentation_layout import SlideLayoutModel
+from models.presentation_outline_model import SlideOutlineModel
+from utils.llm_calls import generate_slide_content
+from utils.schema_utils import is_valid_for_schema
+
+SCHEMA = {
+    "type": "object",
+    "properties": {
+        "title": {"type": "string", "maxLength": 10},
+        "points": {
+            "type": "array",
+            "items": {"type": "string"},
+            "minItems": 1,
+            "maxItems": 2,
+        },
+    },
+    "required": ["title", "points"],
+}
+
+
+def test_is_valid_for_schema():
+    assert is_valid_for_schema({"title": "A long title", "points": ["a"]}, SCHEMA)
+    assert not is_valid_for_schema({"title": "A"}, SCHEMA)
+    assert not is_valid_for_schema({"title": "A", "points": []}, SCHEMA)
+    assert not is_valid_for_schema({"title": 1, "points": ["a"]}, SCHEMA)
+    assert not is_valid_for_schema(None, SCHEMA)
+
+
+def test_multi_slide_response_is_split_and_validated(monkeypatch):
+    calls = []
+
+    class FakeLLMClient:
+        served_by = "openai/gpt-4.1"
+
+        def __init__(self, call_type=None):
+            pass
+
+        async def generate_structured(self, model, messages, response_format, strict):
+            calls.append(response_format)
+            return {
+                "slide_3": {"title": "Third", "points": ["a"], "__speaker_note__": ""},
+                "slide_4": {"title": "Fourth", "points": []},
+            }
+
+    monkeypatch.setattr(generate_slide_content, "LLMClient", FakeLLMClient)
+    monkeypatch.setattr(generate_slide_content, "get_model", lambda: "model")
+
+    slide_layout = SlideLayoutModel(id="bullets", json_schema=SCHEMA)
+    slide_contents = asyncio.run(
+        generate_slide_content.get_slide_contents_from_types_and_outlines(
+            [3, 4],
+            [slide_layout, slide_layout],
+            [SlideOutlineModel(content="Third"), SlideOutlineModel(content="Fourth")],
+            "English",
+            use_cache=False,
+        )
+    )
+
+    assert list(calls[0]["properties"]) == ["slide_3", "slide_4"]
+    assert "__speaker_note__" in calls[0]["properties"]["slide_3"]["required"]
+    assert list(slide_contents) == [3]
+    assert slide_contents[3]["title"] == "Third"
+
+
+def test_cached_slide_is_found_on_another_day(monkeypatch):
+    cache = {}
+    prompts = []
+
+    class FakeLLMResponseCache:
+        async def get(self, key):
+            return cache.get(key)
+
+        async def set(self, key, model, response):
+            cache[key] = response
+
+    class FakeLLMClient:
+        served_by = "openai/gpt-4.1"
+
+        def __init__(self, call_type=None):
+            pass
+
+        async def generate_structured(self, model, messages, response_format, strict):
+            prompts.append(messages[1].content)
+            return {"title": "Slide", "points": ["a"]}
+
+    monkeypatch.setattr(generate_slide_content, "LLMClient", FakeLLMClient)
+    monkeypatch.setattr(
+        generate_slide_content, "LLM_RESPONSE_CACHE", FakeLLMResponseCache()
+    )
+    monkeypatch.setattr(generate_slide_content, "get_model", lambda: "model")
+
+    slide_layout = SlideLayoutModel(id="bullets", json_schema=SCHEMA)
+    for day in [1, 2]:
+
+        class FrozenDatetime(datetime):
+            @classmethod
+            def now(cls, tz=None):
+                return datetime(2025, 1, day, 12)
+
+        monkeypatch.setattr(generate_slide_content, "datetime", FrozenDatetime)
+        response = asyncio.run(
+            generate_slide_content.get_slide_content_from_type_and_outline(
+                slide_layout, SlideOutlineModel(content="Outline"), "English"
+            )
+        )
+        assert response["title"] == "Slide"
+
+    assert len(prompts) == 1
+    assert "2025-01-01" in prompts[0]
+    assert len(cache) == 1
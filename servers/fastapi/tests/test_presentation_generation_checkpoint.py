@@ -0,0 +1,113 @@
+import asyncio
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlmodel import SQLModel
+
+from models.presentation_outline_model import (
+    PresentationOutlineModel,
+    SlideOutlineModel,
+)
+from models.presentation_structure_model import PresentationStructureModel
+from models.sql.async_presentation_generation_status import (
+    AsyncPresentationGenerationTaskModel,
+)
+from models.sql.image_asset import ImageAsset
+from services.presentation_generation_checkpoint import (
+    PresentationGenerationCheckpoint,
+)
+
+
+def test_checkpoint_is_persisted_and_restored(tmp_path):
+    async def run():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/checkpoint.db")
+        async with engine.begin() as conn:
+            await conn.run_sync(
+                SQLModel.metadata.create_all,
+                tables=[AsyncPresentationGenerationTaskModel.__table__],
+            )
+        session_maker = async_sessionmaker(engine, expire_on_commit=False)
+
+        task = AsyncPresentationGenerationTaskModel(status="processing")
+        async with session_maker() as session:
+            session.add(task)
+            await session.commit()
+
+        checkpoint = PresentationGenerationCheckpoint(
+            task.id, session_maker=session_maker
+        )
+        outlines = PresentationOutlineModel(
+            slides=[
+                SlideOutlineModel(content="First"),
+                SlideOutlineModel(content="Second"),
+            ]
+        )
+        asset = ImageAsset(path="/app_data/images/first.png")
+        await asyncio.gather(
+            checkpoint.save_outlines(outlines, 2),
+            checkpoint.save_structure(
+                outlines, PresentationStructureModel(slides=[0, 1])
+            ),
+            checkpoint.save_slide_assets(0, {"title": "First"}, [asset]),
+            checkpoint.save_slide_content(1, {"title": "Second"}),
+        )
+        await checkpoint.flush()
+
+        async with session_maker() as session:
+            task = await session.get(AsyncPresentationGenerationTaskModel, task.id)
+        await engine.dispose()
+        return PresentationGenerationCheckpoint.from_task(task), asset
+
+    restored, asset = asyncio.run(run())
+
+    outlines, total_outlines = restored.get_outlines()
+    assert total_outlines == 2
+    assert outlines.slides[1].content == "Second"
+    assert restored.get_structure()[1].slides == [0, 1]
+
+    assert restored.get_slide_content(0) == {"title": "First"}
+    restored_assets = restored.get_slide_assets(0)
+    assert [(a.id, a.path) for a in restored_assets] == [(asset.id, asset.path)]
+
+    assert restored.get_slide_content(1) == {"title": "Second"}
+    assert restored.get_slide_assets(1) is None
+    assert restored.get_slide_content(2) is None
+
+
+def test_slides_are_saved_in_batches(tmp_path):
+    async def run():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/checkpoint.db")
+        async with engine.begin() as conn:
+            await conn.run_sync(
+                SQLModel.metadata.create_all,
+                tables=[AsyncPresentationGenerationTaskModel.__table__],
+            )
+        session_maker = async_sessionmaker(engine, expire_on_commit=False)
+        task = AsyncPresentationGenerationTaskModel(status="processing")
+        async with session_maker() as session:
+            session.add(task)
+            await session.commit()
+
+        sessions = []
+
+        def count_sessions():
+            sessions.append(1)
+            return session_maker()
+
+        checkpoint = PresentationGenerationCheckpoint(
+            task.id, session_maker=count_sessions, slides_per_save=5
+        )
+        for index in range(12):
+            await checkpoint.save_slide_content(index, {"title": str(index)})
+        saved_before_flush = len(sessions)
+        await checkpoint.flush()
+        await checkpoint.flush()
+
+        async with session_maker() as session:
+            task = await session.get(AsyncPresentationGenerationTaskModel, task.id)
+        await engine.dispose()
+        return saved_before_flush, len(sessions), task.checkpoint
+
+    saved_before_flush, saves, data = asyncio.run(run())
+    assert saved_before_flush == 2
+    assert saves == 3
+    assert len(data["slides"]) == 12
@@ -0,0 +1,112 @@
+import asyncio
+import uuid
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlmodel import SQLModel
+
+from models.presentation_generation_event import PresentationGenerationEvent
+from models.sql.async_presentation_generation_status import (
+    AsyncPresentationGenerationTaskModel,
+)
+from services.presentation_generation_events import PresentationGenerationEvents
+
+
+async def create_task(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/events.db")
+    async with engine.begin() as conn:
+        await conn.run_sync(
+            SQLModel.metadata.create_all,
+            tables=[AsyncPresentationGenerationTaskModel.__table__],
+        )
+    session_maker = async_sessionmaker(engine, expire_on_commit=False)
+    task = AsyncPresentationGenerationTaskModel(
+        status="processing",
+        message="Generating slides",
+        presentation_id=uuid.uuid4(),
+    )
+    async with session_maker() as session:
+        session.add(task)
+        await session.commit()
+    return engine, session_maker, task
+
+
+def test_events_are_streamed_until_the_task_ends(tmp_path):
+    async def run():
+        engine, session_maker, task = await create_task(tmp_path)
+        events = PresentationGenerationEvents(session_maker, keep_alive=5)
+        received = []
+
+        async def consume():
+            async for event in events.iterate(task.id):
+                received.append(event)
+
+        consumer = asyncio.create_task(consume())
+        await asyncio.sleep(0.1)
+        events.publish(task.id, PresentationGenerationEvent(type="slide", index=0))
+        events.publish("task-other", PresentationGenerationEvent(type="slide", index=1))
+        task.status = "completed"
+        task.message = "Presentation generation completed"
+        task.data = {"path": "/app_data/exports/test.pptx"}
+        events.publish_status(task)
+        await asyncio.wait_for(consumer, 1)
+        await engine.dispose()
+
+        assert [(event.type, event.status, event.index) for event in received] == [
+            ("status", "processing", None),
+            ("slide", None, 0),
+            ("status", "completed", None),
+        ]
+        assert received[-1].data == {"path": "/app_data/exports/test.pptx"}
+        assert events._subscribers == {}
+
+    asyncio.run(run())
+
+
+def test_status_row_is_followed_without_events(tmp_path):
+    async def run():
+        engine, session_maker, task = await create_task(tmp_path)
+        events = PresentationGenerationEvents(session_maker, keep_alive=0.05)
+        received = []
+
+        async def consume():
+            async for event in events.iterate(task.id):
+                received.append(event)
+
+        consumer = asyncio.create_task(consume())
+        await asyncio.sleep(0.2)
+        # Task finished by another process, only its row is updated
+        async with session_maker() as session:
+            row = await session.get(AsyncPresentationGenerationTaskModel, task.id)
+            row.status = "error"
+            row.message = "Presentation generation failed"
+            await session.commit()
+        await asyncio.wait_for(consumer, 1)
+        await engine.dispose()
+
+        assert received[0].status == "processing"
+        assert None in received
+        assert received[-1].status == "error"
+
+    asyncio.run(run())
+
+
+def test_unknown_task_has_no_events(tmp_path):
+    async def run():
+        engine, session_maker, _ = await create_task(tmp_path)
+        events = PresentationGenerationEvents(session_maker)
+        received = [event async for event in events.iterate("task-unknown")]
+        await engine.dispose()
+        return received
+
+    assert asyncio.run(run()) == []
+
+
+def test_final_status_event_is_rendered_as_sse():
+    event = PresentationGenerationEvent(
+        type="status", status="error", error={"detail": "failed"}
+    )
+    assert event.is_final
+    assert event.to_string() == (
+        'event: response\ndata: {"type":"status","status":"error",'
+        '"error":{"detail":"failed"}}\n\n'
+    )
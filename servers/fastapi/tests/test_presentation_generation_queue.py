@@ -0,0 +1,161 @@
+import asyncio
+from datetime import datetime, timedelta
+import uuid
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlmodel import SQLModel
+
+from models.generate_presentation_request import GeneratePresentationRequest
+from models.sql.async_presentation_generation_status import (
+    AsyncPresentationGenerationTaskModel,
+)
+from services.presentation_generation_queue import PresentationGenerationQueue
+
+
+async def create_session_maker(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/queue.db")
+    async with engine.begin() as conn:
+        await conn.run_sync(
+            SQLModel.metadata.create_all,
+            tables=[AsyncPresentationGenerationTaskModel.__table__],
+        )
+    return engine, async_sessionmaker(engine, expire_on_commit=False)
+
+
+def add_task(session_maker, **kwargs):
+    async def add():
+        task = AsyncPresentationGenerationTaskModel(
+            status=kwargs.pop("status", "pending"),
+            message="Queued for generation",
+            presentation_id=uuid.uuid4(),
+            request={"content": "test"},
+            **kwargs,
+        )
+        async with session_maker() as session:
+            session.add(task)
+            await session.commit()
+        return task.id
+
+    return add()
+
+
+def test_each_job_is_claimed_by_one_worker(tmp_path):
+    async def run():
+        engine, session_maker = await create_session_maker(tmp_path)
+        task_ids = [await add_task(session_maker) for _ in range(3)]
+
+        queues = [PresentationGenerationQueue(session_maker) for _ in range(4)]
+
+        async def claim(queue):
+            async with session_maker() as session:
+                task = await queue.claim_next_job(session)
+                return task.id if task else None
+
+        claimed = await asyncio.gather(*[claim(queue) for queue in queues])
+        await engine.dispose()
+        return task_ids, claimed
+
+    task_ids, claimed = asyncio.run(run())
+    claimed_ids = [task_id for task_id in claimed if task_id]
+    assert sorted(claimed_ids) == sorted(task_ids)
+    assert claimed.count(None) == 1
+
+
+def test_orphaned_jobs_are_requeued(tmp_path):
+    async def run():
+        engine, session_maker = await create_session_maker(tmp_path)
+        stale = datetime.now() - timedelta(hours=1)
+        orphaned_id = await add_task(
+            session_maker, status="processing", heartbeat_at=stale, attempts=1
+        )
+        exhausted_id = await add_task(
+            session_maker, status="processing", heartbeat_at=stale, attempts=3
+        )
+        running_id = await add_task(
+            session_maker,
+            status="processing",
+            heartbeat_at=datetime.now(),
+            attempts=1,
+        )
+
+        await PresentationGenerationQueue(session_maker).recover_orphaned_jobs()
+
+        async with session_maker() as session:
+            statuses = {
+                task_id: (
+                    await session.get(AsyncPresentationGenerationTaskModel, task_id)
+                ).status
+                for task_id in (orphaned_id, exhausted_id, running_id)
+            }
+        await engine.dispose()
+        return statuses, orphaned_id, exhausted_id, running_id
+
+    statuses, orphaned_id, exhausted_id, running_id = asyncio.run(run())
+    assert statuses[orphaned_id] == "pending"
+    assert statuses[exhausted_id] == "error"
+    assert statuses[running_id] == "processing"
+
+
+def test_batch_jobs_are_queued_for_workers_and_share_a_budget(tmp_path):
+    async def run():
+        engine, session_maker = await create_session_maker(tmp_path)
+        queue = PresentationGenerationQueue(session_maker)
+        requests = [
+            (GeneratePresentationRequest(content=f"Topic {i}"), uuid.uuid4())
+            for i in range(3)
+        ]
+        async with session_maker() as session:
+            batch_id, tasks = await queue.enqueue_batch(session, requests)
+        await engine.dispose()
+        return queue, batch_id, tasks
+
+    queue, batch_id, tasks = asyncio.run(run())
+    assert {task.status for task in tasks} == {"pending"}
+    assert {task.batch_id for task in tasks} == {batch_id}
+    assert {task.worker_id for task in tasks} == {None}
+
+    budget = queue.get_batch_budget(batch_id)
+    assert queue.get_batch_budget(batch_id) is budget
+    assert queue.get_batch_budget("batch-other") is not budget
+
+
+def test_heartbeat_cancels_job_handed_to_another_worker(tmp_path):
+    async def run():
+        engine, session_maker = await create_session_maker(tmp_path)
+        queue = PresentationGenerationQueue(session_maker)
+        queue.heartbeat_interval = 0.01
+        owned_id = await add_task(
+            session_maker, status="processing", worker_id=queue.worker_id
+        )
+        lost_id = await add_task(
+            session_maker, status="processing", worker_id="worker-other"
+        )
+
+        owned_job = asyncio.ensure_future(asyncio.sleep(10))
+        heartbeat = asyncio.create_task(queue._heartbeat(owned_id, owned_job))
+        lost_job = asyncio.ensure_future(asyncio.sleep(10))
+        await asyncio.wait_for(queue._heartbeat(lost_id, lost_job), 1)
+        await asyncio.sleep(0.05)
+
+        async with session_maker() as session:
+            owned = await session.get(AsyncPresentationGenerationTaskModel, owned_id)
+            lost = await session.get(AsyncPresentationGenerationTaskModel, lost_id)
+        results = (
+            owned_job.cancelled(),
+            lost_job.cancelled(),
+            owned.heartbeat_at,
+            lost.heartbeat_at,
+        )
+        heartbeat.cancel()
+        owned_job.cancel()
+        await asyncio.gather(heartbeat, owned_job, return_exceptions=True)
+        await engine.dispose()
+        return results
+
+    owned_cancelled, lost_cancelled, owned_heartbeat, lost_heartbeat = asyncio.run(
+        run()
+    )
+    assert not owned_cancelled
+    assert lost_cancelled
+    assert owned_heartbeat is not None
+    assert lost_heartbeat is None
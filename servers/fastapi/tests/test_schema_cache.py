@@ -0,0 +1,66 @@
+from models.presentation_layout import SlideLayoutModel
+from utils.get_dynamic_models import get_presentation_outline_schema_with_n_slides
+from utils import schema_cache
+from utils.schema_cache import get_slide_response_schema, get_strict_json_schema
+
+SCHEMA = {
+    "type": "object",
+    "properties": {
+        "title": {"type": "string"},
+        "image": {
+            "type": "object",
+            "properties": {
+                "__image_url__": {"type": "string"},
+                "__image_prompt__": {"type": "string"},
+            },
+            "required": ["__image_url__", "__image_prompt__"],
+        },
+    },
+    "required": ["title", "image"],
+}
+
+
+def test_slide_response_schema_is_compiled_once_per_layout_schema():
+    layout = SlideLayoutModel(id="title-image", json_schema=SCHEMA)
+
+    schema = get_slide_response_schema(layout)
+
+    assert "__image_url__" not in schema["properties"]["image"]["properties"]
+    assert schema["properties"]["image"]["required"] == ["__image_prompt__"]
+    assert "__speaker_note__" in schema["required"]
+    assert get_slide_response_schema(layout.model_copy(deep=True)) is schema
+
+    changed = layout.model_copy(deep=True)
+    changed.json_schema["properties"]["subtitle"] = {"type": "string"}
+    assert "subtitle" in get_slide_response_schema(changed)["properties"]
+
+
+def test_strict_schema_does_not_mutate_input():
+    schema = get_presentation_outline_schema_with_n_slides(5)
+    original = str(schema)
+
+    strict_schema = get_strict_json_schema(schema)
+
+    assert strict_schema["additionalProperties"] is False
+    assert str(schema) == original
+    assert get_strict_json_schema(schema) is strict_schema
+    assert get_presentation_outline_schema_with_n_slides(5) is schema
+
+
+def test_schema_is_hashed_once_per_schema_object(monkeypatch):
+    layout = SlideLayoutModel(id="title-only", json_schema={"type": "object"})
+    hashed = []
+    sha256 = schema_cache.hashlib.sha256
+
+    def counting_sha256(data):
+        hashed.append(data)
+        return sha256(data)
+
+    monkeypatch.setattr(schema_cache.hashlib, "sha256", counting_sha256)
+
+    schema = get_slide_response_schema(layout)
+    strict_schema = get_strict_json_schema(schema)
+    for _ in range(3):
+        assert get_slide_response_schema(layout) is schema
+        assert get_strict_json_schema(schema) is strict_schema
+    assert len(hashed) == 2
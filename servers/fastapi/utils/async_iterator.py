@@ -1,5 +1,5 @@
 import asyncio
-from typing import AsyncGenerator, Callable, Iterator, TypeVar
+from typing import Any, AsyncGenerator, Awaitable, Callable, Iterator, List, TypeVar
 
 T = TypeVar("T")
 
@@ -14,3 +14,29 @@ def iterator_to_async(
             await asyncio.sleep(0)
 
     return wrapper
+
+
+async def iterate_concurrently_in_order(
+    funcs: List[Callable[[], Awaitable[T]]],
+    concurrency: int,
+) -> AsyncGenerator[T, None]:
+    """
+    Runs at most `concurrency` of the given callables at a time and yields
+    their results in input order, each one as soon as it and every result
+    before it is available.
+    Pending work is cancelled if the consumer stops iterating or a call fails.
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def run(func: Callable[[], Awaitable[Any]]):
+        async with semaphore:
+            return await func()
+
+    tasks = [asyncio.create_task(run(func)) for func in funcs]
+    try:
+        for task in tasks:
+            yield await task
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
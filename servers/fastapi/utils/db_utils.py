@@ -1,4 +1,6 @@
 import os
+from typing import List
+from sqlalchemy import Connection, Table, inspect, text
 from utils.get_env import get_app_data_directory_env, get_database_url_env
 from urllib.parse import urlsplit, urlunsplit, parse_qsl
 import ssl
@@ -46,3 +48,47 @@ def get_database_url_and_connect_args() -> tuple[str, dict]:
         pass
 
     return database_url, connect_args
+
+
+def add_missing_columns(sync_conn: Connection, tables: List[Table]):
+    """
+    Adds columns that were introduced after a table was created.
+    create_all() only creates missing tables, so existing databases would
+    otherwise miss newly added nullable or defaulted columns.
+    """
+    inspector = inspect(sync_conn)
+    for table in tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing_columns = {
+            column["name"] for column in inspector.get_columns(table.name)
+        }
+        for column in table.columns:
+            if column.name in existing_columns:
+                continue
+            column_type = column.type.compile(dialect=sync_conn.dialect)
+            default = ""
+            if column.default is not None and column.default.is_scalar:
+                default = f" DEFAULT {column.default.arg!r}"
+            sync_conn.execute(
+                text(
+                    f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}{default}"
+                )
+            )
+
+
+def add_missing_indexes(sync_conn: Connection, tables: List[Table]):
+    """
+    Creates indexes that were introduced after a table was created, including
+    indexes of columns added by add_missing_columns.
+    """
+    inspector = inspect(sync_conn)
+    for table in tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing_indexes = {
+            index["name"] for index in inspector.get_indexes(table.name)
+        }
+        for index in table.indexes:
+            if index.name not in existing_indexes:
+                index.create(sync_conn)
@@ -6,9 +6,23 @@ from urllib.parse import urlparse
 
 import aiohttp
 
+from services.http_client import HTTP_CLIENT
 import uuid
 
 
+def get_filename_from_response(response: aiohttp.ClientResponse) -> Optional[str]:
+    content_disposition = response.headers.get("Content-Disposition", "")
+    if "filename=" in content_disposition:
+        return content_disposition.split("filename=")[1].strip("\"'")
+
+    content_type = response.headers.get("Content-Type", "")
+    if content_type:
+        extension = mimetypes.guess_extension(content_type.split(";")[0])
+        if extension:
+            return f"{uuid.uuid4()}{extension}"
+    return None
+
+
 async def download_file(
     url: str, save_directory: str, headers: Optional[dict] = None
 ) -> Optional[str]:
@@ -18,40 +32,22 @@ async def download_file(
         parsed_url = urlparse(url)
         filename = os.path.basename(parsed_url.path)
 
-        if not filename or "." not in filename:
-            async with aiohttp.ClientSession(trust_env=True) as session:
-                async with session.head(url, headers=headers) as response:
-                    if response.status == 200:
-                        content_disposition = response.headers.get(
-                            "Content-Disposition", ""
-                        )
-                        if "filename=" in content_disposition:
-                            filename = content_disposition.split("filename=")[1].strip(
-                                "\"'"
-                            )
-                        else:
-                            content_type = response.headers.get("Content-Type", "")
-                            if content_type:
-                                extension = mimetypes.guess_extension(
-                                    content_type.split(";")[0]
-                                )
-                                if extension:
-                                    filename = f"{uuid.uuid4()}{extension}"
-
-        filename = filename or str(uuid.uuid4())
-        save_path = os.path.join(save_directory, filename)
-
-        async with aiohttp.ClientSession(trust_env=True) as session:
-            async with session.get(url, headers=headers) as response:
-                if response.status == 200:
-                    with open(save_path, "wb") as file:
-                        async for chunk in response.content.iter_chunked(8192):
-                            file.write(chunk)
-                    print(f"File downloaded successfully: {save_path}")
-                    return save_path
-                else:
-                    print(f"Failed to download file. HTTP status: {response.status}")
-                    return None
+        session = HTTP_CLIENT.get_session(trust_env=True)
+        async with session.get(url, headers=headers) as response:
+            if response.status != 200:
+                print(f"Failed to download file. HTTP status: {response.status}")
+                return None
+
+            if not filename or "." not in filename:
+                filename = get_filename_from_response(response)
+            filename = filename or str(uuid.uuid4())
+            save_path = os.path.join(save_directory, filename)
+
+            with open(save_path, "wb") as file:
+                async for chunk in response.content.iter_chunked(8192):
+                    file.write(chunk)
+            print(f"File downloaded successfully: {save_path}")
+            return save_path
 
     except Exception as e:
         print(f"Error downloading file from {url}: {e}")
@@ -1,3 +1,4 @@
+from functools import lru_cache
 from typing import List
 from pydantic import Field
 from models.presentation_outline_model import (
@@ -7,6 +8,7 @@ from models.presentation_outline_model import (
 from models.presentation_structure_model import PresentationStructureModel
 
 
+@lru_cache(maxsize=64)
 def get_presentation_outline_model_with_n_slides(n_slides: int):
     class SlideOutlineModelWithNSlides(SlideOutlineModel):
         content: str = Field(
@@ -25,6 +27,7 @@ def get_presentation_outline_model_with_n_slides(n_slides: int):
     return PresentationOutlineModelWithNSlides
 
 
+@lru_cache(maxsize=64)
 def get_presentation_structure_model_with_n_slides(n_slides: int):
     class PresentationStructureModelWithNSlides(PresentationStructureModel):
         slides: List[int] = Field(
@@ -34,3 +37,14 @@ def get_presentation_structure_model_with_n_slides(n_slides: int):
         )
 
     return PresentationStructureModelWithNSlides
+
+
+# Schemas are shared between calls and must not be mutated
+@lru_cache(maxsize=64)
+def get_presentation_outline_schema_with_n_slides(n_slides: int) -> dict:
+    return get_presentation_outline_model_with_n_slides(n_slides).model_json_schema()
+
+
+@lru_cache(maxsize=64)
+def get_presentation_structure_schema_with_n_slides(n_slides: int) -> dict:
+    return get_presentation_structure_model_with_n_slides(n_slides).model_json_schema()
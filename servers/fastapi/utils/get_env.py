@@ -95,3 +95,75 @@ def get_extended_reasoning_env():
 
 def get_web_grounding_env():
     return os.getenv("WEB_GROUNDING")
+
+
+def get_slide_generation_concurrency_env():
+    return os.getenv("SLIDE_GENERATION_CONCURRENCY")
+
+
+def get_asset_fetch_concurrency_env():
+    return os.getenv("ASSET_FETCH_CONCURRENCY")
+
+
+def get_presentation_generation_workers_env():
+    return os.getenv("PRESENTATION_GENERATION_WORKERS")
+
+
+def get_llm_max_concurrency_env():
+    return os.getenv("LLM_MAX_CONCURRENCY")
+
+
+def get_local_layout_selector_env():
+    return os.getenv("LOCAL_LAYOUT_SELECTOR")
+
+
+def get_llm_response_cache_ttl_env():
+    return os.getenv("LLM_RESPONSE_CACHE_TTL")
+
+
+def get_llm_response_cache_max_entries_env():
+    return os.getenv("LLM_RESPONSE_CACHE_MAX_ENTRIES")
+
+
+def get_llm_response_cache_max_bytes_env():
+    return os.getenv("LLM_RESPONSE_CACHE_MAX_BYTES")
+
+
+def get_slides_per_llm_call_env():
+    return os.getenv("SLIDES_PER_LLM_CALL")
+
+
+def get_layout_cache_ttl_env():
+    return os.getenv("LAYOUT_CACHE_TTL")
+
+
+def get_http_max_connections_per_host_env():
+    return os.getenv("HTTP_MAX_CONNECTIONS_PER_HOST")
+
+
+def get_llm_failover_providers_env():
+    return os.getenv("LLM_FAILOVER_PROVIDERS")
+
+
+def get_llm_max_retries_env():
+    return os.getenv("LLM_MAX_RETRIES")
+
+
+def get_llm_hedging_env():
+    return os.getenv("LLM_HEDGING")
+
+
+def get_llm_hedging_max_percent_env():
+    return os.getenv("LLM_HEDGING_MAX_PERCENT")
+
+
+def get_llm_requests_per_minute_env():
+    return os.getenv("LLM_REQUESTS_PER_MINUTE")
+
+
+def get_llm_tokens_per_minute_env():
+    return os.getenv("LLM_TOKENS_PER_MINUTE")
+
+
+def get_llm_request_coalescing_env():
+    return os.getenv("LLM_REQUEST_COALESCING")
@@ -0,0 +1,208 @@
+import json
+from typing import Any, List, NamedTuple, Optional, get_args, get_origin
+
+import dirtyjson
+from pydantic import BaseModel, TypeAdapter, ValidationError
+
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+class JsonStreamEvent(NamedTuple):
+    # Top-level field of the streamed object
+    key: Optional[str]
+    # Index of the completed element if the field is an array, None once the
+    # whole field is complete
+    index: Optional[int]
+    value: Any
+
+
+def parse_json_value(text: str) -> Any:
+    try:
+        if ORJSON_AVAILABLE:
+            return orjson.loads(text)
+        return json.loads(text)
+    except ValueError:
+        # Only output that needs repair goes through the slower dirtyjson
+        return dirtyjson.loads(text)
+
+
+class IncrementalJsonParser:
+    """
+    Parses a JSON object streamed in chunks without re-parsing the text
+    received so far. Every element of a top-level array is returned as soon as
+    it is complete, and so is every top-level field.
+    Text before the opening brace (like a markdown code fence) is ignored.
+
+    If a response model is given, array elements and fields are validated
+    against its field types as they arrive and invalid ones are skipped.
+    """
+
+    def __init__(self, response_model: Optional[type[BaseModel]] = None):
+        self.response_model = response_model
+        self._type_adapters = {}
+        self._buffer = ""
+        self._pos = 0
+        self._stack: List[str] = []
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._last_string: Optional[str] = None
+        self._key: Optional[str] = None
+        self._value_start: Optional[int] = None
+        self._element_start: Optional[int] = None
+        self._index = 0
+        # Completed top-level fields
+        self.fields = {}
+        self.done = False
+        self.malformed = False
+
+    @property
+    def text(self) -> str:
+        return self._buffer
+
+    def feed(self, chunk: str) -> List[JsonStreamEvent]:
+        self._buffer += chunk
+        buffer = self._buffer
+        events = []
+
+        for pos in range(self._pos, len(buffer)):
+            if self.done or self.malformed:
+                break
+            char = buffer[pos]
+            depth = len(self._stack)
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if depth == 1:
+                        self._last_string = buffer[self._string_start : pos + 1]
+                continue
+
+            if depth == 0:
+                if char == "{":
+                    self._stack.append(char)
+                continue
+
+            if char == '"':
+                self._in_string = True
+                self._string_start = pos
+
+            elif char in "{[":
+                self._stack.append(char)
+                if depth == 1 and char == "[":
+                    self._element_start = pos + 1
+                    self._index = 0
+
+            elif char in "}]":
+                self._stack.pop()
+                if depth == 3 and self._stack[1] == "[":
+                    # Container element of a top-level array closed
+                    self._emit_element(events, self._element_start, pos + 1)
+                    self._element_start = None
+                elif depth == 2:
+                    if char == "]":
+                        self._emit_element(events, self._element_start, pos)
+                        self._element_start = None
+                    self._emit_field(events, pos + 1)
+                elif depth == 1:
+                    self._emit_field(events, pos)
+                    self.done = True
+
+            elif char == ":" and depth == 1:
+                if self._last_string is None:
+                    # Keys that are not double quoted, leave it to get_result
+                    self.malformed = True
+                    break
+                self._key = parse_json_value(self._last_string)
+                self._last_string = None
+                self._value_start = pos + 1
+
+            elif char == ",":
+                if depth == 1:
+                    self._emit_field(events, pos)
+                elif depth == 2 and self._stack[1] == "[":
+                    self._emit_element(events, self._element_start, pos)
+                    self._element_start = pos + 1
+
+        self._pos = len(buffer)
+        return events
+
+    def _emit_element(
+        self, events: List[JsonStreamEvent], start: Optional[int], end: int
+    ):
+        if start is None:
+            return
+        text = self._buffer[start:end].strip()
+        if not text:
+            return
+        index = self._index
+        self._index += 1
+        try:
+            value = self._validate(parse_json_value(text), element=True)
+        except Exception:
+            return
+        events.append(JsonStreamEvent(self._key, index, value))
+
+    def _emit_field(self, events: List[JsonStreamEvent], end: int):
+        if self._value_start is None:
+            return
+        text = self._buffer[self._value_start : end].strip()
+        self._value_start = None
+        if not text:
+            return
+        try:
+            value = parse_json_value(text)
+        except Exception:
+            return
+        # Raw values are kept so the whole response can be validated at the end
+        self.fields[self._key] = value
+        try:
+            value = self._validate(value, element=False)
+        except ValidationError:
+            return
+        events.append(JsonStreamEvent(self._key, None, value))
+
+    def _get_type_adapter(self, element: bool) -> Optional[TypeAdapter]:
+        field = self.response_model.model_fields.get(self._key)
+        if not field:
+            return None
+
+        cache_key = (self._key, element)
+        if cache_key not in self._type_adapters:
+            annotation = field.annotation
+            if element:
+                if get_origin(annotation) is not list:
+                    return None
+                annotation = get_args(annotation)[0]
+            self._type_adapters[cache_key] = TypeAdapter(annotation)
+        return self._type_adapters[cache_key]
+
+    def _validate(self, value: Any, element: bool) -> Any:
+        if not self.response_model:
+            return value
+        type_adapter = self._get_type_adapter(element)
+        if not type_adapter:
+            return value
+        return type_adapter.validate_python(value)
+
+    def get_result(self) -> Any:
+        """
+        Returns the whole parsed response, validated with the response model.
+        Incomplete or malformed output is repaired with dirtyjson.
+        """
+        if self.done and not self.malformed:
+            content = self.fields
+        else:
+            content = dict(dirtyjson.loads(self._buffer))
+        if self.response_model:
+            return self.response_model(**content)
+        return content
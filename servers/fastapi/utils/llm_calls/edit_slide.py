@@ -6,7 +6,7 @@ from models.sql.slide import SlideModel
 from services.llm_client import LLMClient
 from utils.llm_client_error_handler import handle_llm_client_exceptions
 from utils.llm_provider import get_model
-from utils.schema_utils import add_field_in_schema, remove_fields_from_schema
+from utils.schema_cache import get_slide_response_schema
 
 
 def get_system_prompt(
@@ -17,15 +17,6 @@ def get_system_prompt(
     return f"""
     Edit Slide data and speaker note based on provided prompt, follow mentioned steps and notes and provide structured output.
 
-    {"# User Instruction:" if instructions else ""}
-    {instructions or ""}
-
-    {"# Tone:" if tone else ""}
-    {tone or ""}
-
-    {"# Verbosity:" if verbosity else ""}
-    {verbosity or ""}
-
     # Notes
     - Provide output in language mentioned in **Input**.
     - The goal is to change Slide data based on the provided prompt.
@@ -36,6 +27,15 @@ def get_system_prompt(
     - Speaker note should be simple, clear, concise and to the point.
 
     **Go through all notes and steps and make sure they are followed, including mentioned constraints**
+
+    {"# User Instruction:" if instructions else ""}
+    {instructions or ""}
+
+    {"# Tone:" if tone else ""}
+    {tone or ""}
+
+    {"# Verbosity:" if verbosity else ""}
+    {verbosity or ""}
     """
 
 
@@ -44,9 +44,6 @@ def get_user_prompt(prompt: str, slide_data: dict, language: str):
         ## Icon Query And Image Prompt Language
         English
 
-        ## Current Date and Time
-        {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
-
         ## Slide Content Language
         {language}
 
@@ -55,6 +52,9 @@ def get_user_prompt(prompt: str, slide_data: dict, language: str):
 
         ## Slide data
         {slide_data}
+
+        ## Current Date
+        {datetime.now().strftime("%Y-%m-%d")}
     """
 
 
@@ -87,23 +87,9 @@ async def get_edited_slide_content(
 ):
     model = get_model()
 
-    response_schema = remove_fields_from_schema(
-        slide_layout.json_schema, ["__image_url__", "__icon_url__"]
-    )
-    response_schema = add_field_in_schema(
-        response_schema,
-        {
-            "__speaker_note__": {
-                "type": "string",
-                "minLength": 100,
-                "maxLength": 250,
-                "description": "Speaker note for the slide",
-            }
-        },
-        True,
-    )
-
-    client = LLMClient()
+    response_schema = get_slide_response_schema(slide_layout)
+
+    client = LLMClient(call_type="edit")
     try:
         response = await client.generate_structured(
             model=model,
@@ -50,7 +50,7 @@ def get_user_prompt(prompt: str, html: str):
 async def get_edited_slide_html(prompt: str, html: str):
     model = get_model()
 
-    client = LLMClient()
+    client = LLMClient(call_type="edit")
     try:
         response = await client.generate(
             model=model,
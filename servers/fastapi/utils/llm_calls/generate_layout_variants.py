@@ -525,7 +525,9 @@ async def generate_single_layout_variant(
         Single LayoutVariant object with title, description, and modified HTML
     """
     try:
-        llm_client = LLMClient()
+        llm_client = LLMClient(
+            call_type="variants", coalesce_key=f"variant-{variant_index}"
+        )
 
         # Build user message requesting a single variant
         if transformation_scope == 'slide':
@@ -628,7 +630,7 @@ async def generate_layout_variants(
 
     try:
         variant_count = max(1, min(variant_count, 3))
-        llm_client = LLMClient()
+        llm_client = LLMClient(call_type="variants")
 
         # Log input sizes
         print(f"[Layout Variants] Input sizes:")
@@ -1,10 +1,13 @@
 from datetime import datetime
 from typing import Optional
 
+from fastapi import HTTPException
+
 from models.llm_message import LLMSystemMessage, LLMUserMessage
 from models.llm_tools import SearchWebTool
+from models.presentation_outline_model import PresentationOutlineModel
 from services.llm_client import LLMClient
-from utils.get_dynamic_models import get_presentation_outline_model_with_n_slides
+from utils.get_dynamic_models import get_presentation_outline_schema_with_n_slides
 from utils.llm_client_error_handler import handle_llm_client_exceptions
 from utils.llm_provider import get_model
 
@@ -20,15 +23,6 @@ def get_system_prompt(
 
         Try to use available tools for better results.
 
-        {"# User Instruction:" if instructions else ""}
-        {instructions or ""}
-
-        {"# Tone:" if tone else ""}
-        {tone or ""}
-
-        {"# Verbosity:" if verbosity else ""}
-        {verbosity or ""}
-
         - Provide content for each slide in markdown format.
         - Make sure that flow of the presentation is logical and consistent.
         - Place greater emphasis on numerical data.
@@ -41,6 +35,15 @@ def get_system_prompt(
         {"- Always make first slide a title slide." if include_title_slide else "- Do not include title slide in the presentation."}
 
         **Search web to get latest information about the topic**
+
+        {"# User Instruction:" if instructions else ""}
+        {instructions or ""}
+
+        {"# Tone:" if tone else ""}
+        {tone or ""}
+
+        {"# Verbosity:" if verbosity else ""}
+        {verbosity or ""}
     """
 
 
@@ -55,8 +58,8 @@ def get_user_prompt(
         - User provided content: {content or "Create presentation"}
         - Output Language: {language}
         - Number of Slides: {n_slides}
-        - Current Date and Time: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
         - Additional Information: {additional_context or ""}
+        - Current Date: {datetime.now().strftime("%Y-%m-%d")}
     """
 
 
@@ -82,6 +85,38 @@ def get_messages(
     ]
 
 
+def get_outline_request_params(
+    client: LLMClient,
+    content: str,
+    n_slides: int,
+    language: Optional[str] = None,
+    additional_context: Optional[str] = None,
+    tone: Optional[str] = None,
+    verbosity: Optional[str] = None,
+    instructions: Optional[str] = None,
+    include_title_slide: bool = True,
+    web_search: bool = False,
+) -> dict:
+    return {
+        "model": get_model(),
+        "messages": get_messages(
+            content,
+            n_slides,
+            language,
+            additional_context,
+            tone,
+            verbosity,
+            instructions,
+            include_title_slide,
+        ),
+        "response_format": get_presentation_outline_schema_with_n_slides(n_slides),
+        "strict": True,
+        "tools": (
+            [SearchWebTool] if (client.enable_web_grounding() and web_search) else None
+        ),
+    }
+
+
 async def generate_ppt_outline(
     content: str,
     n_slides: int,
@@ -93,15 +128,12 @@ async def generate_ppt_outline(
     include_title_slide: bool = True,
     web_search: bool = False,
 ):
-    model = get_model()
-    response_model = get_presentation_outline_model_with_n_slides(n_slides)
-
-    client = LLMClient()
+    client = LLMClient(call_type="outline")
 
     try:
         async for chunk in client.stream_structured(
-            model,
-            get_messages(
+            **get_outline_request_params(
+                client,
                 content,
                 n_slides,
                 language,
@@ -110,15 +142,49 @@ async def generate_ppt_outline(
                 verbosity,
                 instructions,
                 include_title_slide,
-            ),
-            response_model.model_json_schema(),
-            strict=True,
-            tools=(
-                [SearchWebTool]
-                if (client.enable_web_grounding() and web_search)
-                else None
-            ),
+                web_search,
+            )
         ):
             yield chunk
     except Exception as e:
         yield handle_llm_client_exceptions(e)
+
+
+async def generate_ppt_outline_partial(
+    content: str,
+    n_slides: int,
+    language: Optional[str] = None,
+    additional_context: Optional[str] = None,
+    tone: Optional[str] = None,
+    verbosity: Optional[str] = None,
+    instructions: Optional[str] = None,
+    include_title_slide: bool = True,
+    web_search: bool = False,
+):
+    """
+    Yields each SlideOutlineModel as soon as it is complete and finally the whole
+    PresentationOutlineModel, as JsonStreamEvents.
+    """
+    client = LLMClient(call_type="outline")
+
+    try:
+        async for event in client.stream_structured_partial(
+            **get_outline_request_params(
+                client,
+                content,
+                n_slides,
+                language,
+                additional_context,
+                tone,
+                verbosity,
+                instructions,
+                include_title_slide,
+                web_search,
+            ),
+            response_model=PresentationOutlineModel,
+        ):
+            yield event
+    except HTTPException as e:
+        yield e
+    except Exception as e:
+        yield handle_llm_client_exceptions(e)
@@ -2,10 +2,14 @@ from typing import Optional
 from models.llm_message import LLMSystemMessage, LLMUserMessage
 from models.presentation_layout import PresentationLayoutModel
 from models.presentation_outline_model import PresentationOutlineModel
+from services.layout_selector_service import (
+    LAYOUT_SELECTOR_SERVICE,
+    use_local_layout_selector,
+)
 from services.llm_client import LLMClient
 from utils.llm_client_error_handler import handle_llm_client_exceptions
 from utils.llm_provider import get_model
-from utils.get_dynamic_models import get_presentation_structure_model_with_n_slides
+from utils.get_dynamic_models import get_presentation_structure_schema_with_n_slides
 from models.presentation_structure_model import PresentationStructureModel
 
 
@@ -102,11 +106,16 @@ async def generate_presentation_structure(
     using_slides_markdown: bool = False,
 ) -> PresentationStructureModel:
 
-    client = LLMClient()
+    # Local selection costs no tokens, the LLM is used when it is not confident
+    if use_local_layout_selector():
+        presentation_structure = await LAYOUT_SELECTOR_SERVICE.select_layouts(
+            presentation_outline, presentation_layout
+        )
+        if presentation_structure:
+            return presentation_structure
+
+    client = LLMClient(call_type="structure")
     model = get_model()
-    response_model = get_presentation_structure_model_with_n_slides(
-        len(presentation_outline.slides)
-    )
 
     try:
         response = await client.generate_structured(
@@ -126,7 +135,9 @@ async def generate_presentation_structure(
                     instructions,
                 )
             ),
-            response_format=response_model.model_json_schema(),
+            response_format=get_presentation_structure_schema_with_n_slides(
+                len(presentation_outline.slides)
+            ),
             strict=True,
         )
         return PresentationStructureModel(**response)
@@ -1,12 +1,40 @@
 from datetime import datetime
-from typing import Optional
-from models.llm_message import LLMSystemMessage, LLMUserMessage
+from typing import Dict, List, Optional
+from models.llm_message import LLMMessage, LLMSystemMessage, LLMUserMessage
 from models.presentation_layout import SlideLayoutModel
 from models.presentation_outline_model import SlideOutlineModel
+from services.llm_batch_service import LLM_BATCH_SERVICE
 from services.llm_client import LLMClient
+from services.llm_response_cache import (
+    LLM_RESPONSE_CACHE,
+    get_llm_response_cache_key,
+)
 from utils.llm_client_error_handler import handle_llm_client_exceptions
 from utils.llm_provider import get_model
-from utils.schema_utils import add_field_in_schema, remove_fields_from_schema
+from utils.schema_cache import get_slide_response_schema
+from utils.schema_utils import is_valid_for_schema
+
+# Cache keys are computed with this in place of the date, so cached responses
+# are still found on the following days
+CURRENT_DATE_PLACEHOLDER = "{current_date}"
+
+
+def get_current_date() -> str:
+    return datetime.now().strftime("%Y-%m-%d")
+
+
+def fill_current_date(messages: List[LLMMessage]) -> List[LLMMessage]:
+    current_date = get_current_date()
+    return [
+        message.model_copy(
+            update={
+                "content": message.content.replace(
+                    CURRENT_DATE_PLACEHOLDER, current_date
+                )
+            }
+        )
+        for message in messages
+    ]
 
 
 def get_system_prompt(
@@ -17,15 +45,6 @@ def get_system_prompt(
     return f"""
         Generate structured slide based on provided outline, follow mentioned steps and notes and provide structured output.
 
-        {"# User Instructions:" if instructions else ""}
-        {instructions or ""}
-
-        {"# Tone:" if tone else ""}
-        {tone or ""}
-
-        {"# Verbosity:" if verbosity else ""}
-        {verbosity or ""}
-
         # Steps
         1. Analyze the outline.
         2. Generate structured slide based on the outline.
@@ -61,14 +80,20 @@ def get_system_prompt(
             __icon_query__: string,
         }}
 
+        {"# User Instructions:" if instructions else ""}
+        {instructions or ""}
+
+        {"# Tone:" if tone else ""}
+        {tone or ""}
+
+        {"# Verbosity:" if verbosity else ""}
+        {verbosity or ""}
+
     """
 
 
-def get_user_prompt(outline: str, language: str):
+def get_user_prompt(outline: str, language: str, current_date: Optional[str] = None):
     return f"""
-        ## Current Date and Time
-        {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
-
         ## Icon Query And Image Prompt Language
         English
 
@@ -77,15 +102,66 @@ def get_user_prompt(outline: str, language: str):
 
         ## Slide Outline
         {outline}
+
+        ## Current Date
+        {current_date or get_current_date()}
+    """
+
+
+def get_multi_slide_user_prompt(
+    outlines: Dict[str, str], language: str, current_date: Optional[str] = None
+):
+    slide_outlines = "\n\n".join(
+        f"### {key}\n{outline}" for key, outline in outlines.items()
+    )
+    return f"""
+        ## Icon Query And Image Prompt Language
+        English
+
+        ## Slide Content Language
+        {language}
+
+        ## Slide Outlines
+        Generate a separate structured slide for each outline below.
+        Provide each slide under the key of its outline.
+
+        {slide_outlines}
+
+        ## Current Date
+        {current_date or get_current_date()}
     """
 
 
+def get_slide_key(index: int) -> str:
+    return f"slide_{index}"
+
+
+async def generate_structured(
+    client: LLMClient,
+    model: str,
+    messages: list,
+    response_schema: dict,
+    use_batch_api: bool = False,
+) -> dict:
+    if use_batch_api:
+        return await LLM_BATCH_SERVICE.generate_structured(
+            model, messages, response_schema
+        )
+    return await client.generate_structured(
+        model=model,
+        messages=messages,
+        response_format=response_schema,
+        strict=False,
+    )
+
+
 def get_messages(
     outline: str,
     language: str,
     tone: Optional[str] = None,
     verbosity: Optional[str] = None,
     instructions: Optional[str] = None,
+    current_date: Optional[str] = None,
 ):
 
     return [
@@ -93,7 +169,7 @@ def get_messages(
             content=get_system_prompt(tone, verbosity, instructions),
         ),
         LLMUserMessage(
-            content=get_user_prompt(outline, language),
+            content=get_user_prompt(outline, language, current_date),
         ),
     ]
 
@@ -105,40 +181,109 @@ async def get_slide_content_from_type_and_outline(
     tone: Optional[str] = None,
     verbosity: Optional[str] = None,
     instructions: Optional[str] = None,
+    use_cache: bool = True,
+    use_batch_api: bool = False,
 ):
-    client = LLMClient()
+    client = LLMClient(call_type="slide_content")
     model = get_model()
 
-    response_schema = remove_fields_from_schema(
-        slide_layout.json_schema, ["__image_url__", "__icon_url__"]
-    )
-    response_schema = add_field_in_schema(
-        response_schema,
-        {
-            "__speaker_note__": {
-                "type": "string",
-                "minLength": 100,
-                "maxLength": 250,
-                "description": "Speaker note for the slide",
-            }
-        },
-        True,
+    response_schema = get_slide_response_schema(slide_layout)
+
+    messages = get_messages(
+        outline.content,
+        language,
+        tone,
+        verbosity,
+        instructions,
+        CURRENT_DATE_PLACEHOLDER,
     )
 
+    cache_key = get_llm_response_cache_key(model, messages, response_schema)
+    messages = fill_current_date(messages)
+    if use_cache:
+        cached_response = await LLM_RESPONSE_CACHE.get(cache_key)
+        if cached_response:
+            return cached_response
+
     try:
-        response = await client.generate_structured(
-            model=model,
-            messages=get_messages(
-                outline.content,
-                language,
-                tone,
-                verbosity,
-                instructions,
-            ),
-            response_format=response_schema,
-            strict=False,
+        response = await generate_structured(
+            client, model, messages, response_schema, use_batch_api
         )
-        return response
-
     except Exception as e:
         raise handle_llm_client_exceptions(e)
+
+    await LLM_RESPONSE_CACHE.set(cache_key, model, response)
+    return response
+
+
+async def get_slide_contents_from_types_and_outlines(
+    indices: List[int],
+    slide_layouts: List[SlideLayoutModel],
+    outlines: List[SlideOutlineModel],
+    language: str,
+    tone: Optional[str] = None,
+    verbosity: Optional[str] = None,
+    instructions: Optional[str] = None,
+    use_cache: bool = True,
+    use_batch_api: bool = False,
+) -> Dict[int, dict]:
+    """
+    Generates content of multiple slides in a single call.
+    Slides are keyed by their index in the response schema and validated
+    individually. Only valid slides are returned, so callers can generate the
+    missing ones with the single slide call.
+    """
+    client = LLMClient(call_type="slide_contents")
+    model = get_model()
+
+    slide_schemas = {
+        get_slide_key(index): get_slide_response_schema(slide_layout, flatten=True)
+        for index, slide_layout in zip(indices, slide_layouts)
+    }
+    response_schema = {
+        "type": "object",
+        "properties": slide_schemas,
+        "required": list(slide_schemas.keys()),
+    }
+
+    messages = [
+        LLMSystemMessage(
+            content=get_system_prompt(tone, verbosity, instructions),
+        ),
+        LLMUserMessage(
+            content=get_multi_slide_user_prompt(
+                {
+                    get_slide_key(index): outline.content
+                    for index, outline in zip(indices, outlines)
+                },
+                language,
+                CURRENT_DATE_PLACEHOLDER,
+            ),
+        ),
+    ]
+
+    cache_key = get_llm_response_cache_key(model, messages, response_schema)
+    messages = fill_current_date(messages)
+    cached_response = await LLM_RESPONSE_CACHE.get(cache_key) if use_cache else None
+
+    response = cached_response
+    if not response:
+        try:
+            response = await generate_structured(
+                client, model, messages, response_schema, use_batch_api
+            )
+        except Exception as e:
+            raise handle_llm_client_exceptions(e)
+
+    slide_contents = {}
+    for index in indices:
+        key = get_slide_key(index)
+        slide_content = response.get(key)
+        if is_valid_for_schema(slide_content, slide_schemas[key]):
+            slide_contents[index] = slide_content
+        else:
+            print(f"Slide {index} of multi slide response is not valid")
+
+    if not cached_response and len(slide_contents) == len(indices):
+        await LLM_RESPONSE_CACHE.set(cache_key, model, response)
+    return slide_contents
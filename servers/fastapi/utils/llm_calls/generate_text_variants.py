@@ -67,7 +67,9 @@ async def generate_single_text_variant(
         Single text variant string
     """
     try:
-        llm_client = LLMClient()
+        llm_client = LLMClient(
+            call_type="variants", coalesce_key=f"variant-{variant_index}"
+        )
 
         # Simplified prompt for single variant
         system_prompt = """
@@ -139,7 +141,7 @@ async def generate_text_variants(
         # Ensure variant_count is within bounds
         variant_count = max(1, min(variant_count, 5))
 
-        llm_client = LLMClient()
+        llm_client = LLMClient(call_type="variants")
 
         messages = [
             LLMSystemMessage(content=get_system_prompt()),
@@ -42,7 +42,7 @@ async def get_slide_layout_from_prompt(
     slide: SlideModel,
 ) -> SlideLayoutModel:
 
-    client = LLMClient()
+    client = LLMClient(call_type="edit")
     model = get_model()
 
     slide_layout_index = layout.get_slide_layout_index(slide.layout)
@@ -1,18 +1,72 @@
+import asyncio
 from fastapi import HTTPException
+from anthropic import APIConnectionError as AnthropicAPIConnectionError
 from anthropic import APIError as AnthropicAPIError
+from anthropic import APITimeoutError as AnthropicAPITimeoutError
+from openai import APIConnectionError as OpenAIAPIConnectionError
 from openai import APIError as OpenAIAPIError
+from openai import APITimeoutError as OpenAIAPITimeoutError
 from google.genai.errors import APIError as GoogleAPIError
 import traceback
 
 
+def get_llm_client_error_status_code(e: Exception) -> int:
+    """
+    Maps provider errors to the status code surfaced to API callers.
+    Rate limits become 429 and timeouts become 504 so schedulers can back off,
+    everything else stays a 500.
+    """
+    if isinstance(
+        e, (OpenAIAPITimeoutError, AnthropicAPITimeoutError, asyncio.TimeoutError)
+    ):
+        return 504
+    if isinstance(e, GoogleAPIError):
+        status_code = e.code
+    else:
+        status_code = getattr(e, "status_code", None)
+    # Anthropic reports overload with 529
+    if status_code in (429, 529):
+        return 429
+    return 500
+
+
+def is_transient_llm_error(e: Exception) -> bool:
+    """
+    Returns whether the error is likely to go away on retry, such as timeouts,
+    connection errors, rate limits and server errors.
+    """
+    if isinstance(
+        e,
+        (
+            OpenAIAPIConnectionError,
+            AnthropicAPIConnectionError,
+            asyncio.TimeoutError,
+            ConnectionError,
+        ),
+    ):
+        return True
+    if isinstance(e, GoogleAPIError):
+        status_code = e.code
+    else:
+        status_code = getattr(e, "status_code", None)
+    if not isinstance(status_code, int):
+        return False
+    return status_code in (408, 429) or status_code >= 500
+
+
 def handle_llm_client_exceptions(e: Exception) -> HTTPException:
     traceback.print_exc()
+    status_code = get_llm_client_error_status_code(e)
     if isinstance(e, OpenAIAPIError):
-        return HTTPException(status_code=500, detail=f"OpenAI API error: {e.message}")
+        return HTTPException(
+            status_code=status_code, detail=f"OpenAI API error: {e.message}"
+        )
     if isinstance(e, GoogleAPIError):
-        return HTTPException(status_code=500, detail=f"Google API error: {e.message}")
+        return HTTPException(
+            status_code=status_code, detail=f"Google API error: {e.message}"
+        )
     if isinstance(e, AnthropicAPIError):
         return HTTPException(
-            status_code=500, detail=f"Anthropic API error: {e.message}"
+            status_code=status_code, detail=f"Anthropic API error: {e.message}"
         )
-    return HTTPException(status_code=500, detail=f"LLM API error: {e}")
+    return HTTPException(status_code=status_code, detail=f"LLM API error: {e}")
@@ -1,3 +1,5 @@
+from typing import List
+
 from fastapi import HTTPException
 
 from constants.llm import (
@@ -10,6 +12,7 @@ from utils.get_env import (
     get_anthropic_model_env,
     get_custom_model_env,
     get_google_model_env,
+    get_llm_failover_providers_env,
     get_llm_provider_env,
     get_ollama_model_env,
     get_openai_model_env,
@@ -46,20 +49,40 @@ def is_custom_llm_selected():
     return get_llm_provider() == LLMProvider.CUSTOM
 
 
-def get_model():
-    selected_llm = get_llm_provider()
-    if selected_llm == LLMProvider.OPENAI:
+def get_model_for_provider(llm_provider: LLMProvider):
+    if llm_provider == LLMProvider.OPENAI:
         return get_openai_model_env() or DEFAULT_OPENAI_MODEL
-    elif selected_llm == LLMProvider.GOOGLE:
+    elif llm_provider == LLMProvider.GOOGLE:
         return get_google_model_env() or DEFAULT_GOOGLE_MODEL
-    elif selected_llm == LLMProvider.ANTHROPIC:
+    elif llm_provider == LLMProvider.ANTHROPIC:
         return get_anthropic_model_env() or DEFAULT_ANTHROPIC_MODEL
-    elif selected_llm == LLMProvider.OLLAMA:
+    elif llm_provider == LLMProvider.OLLAMA:
         return get_ollama_model_env()
-    elif selected_llm == LLMProvider.CUSTOM:
+    elif llm_provider == LLMProvider.CUSTOM:
         return get_custom_model_env()
     else:
         raise HTTPException(
             status_code=500,
             detail=f"Invalid LLM provider. Please select one of: openai, google, anthropic, ollama, custom",
         )
+
+
+def get_model():
+    return get_model_for_provider(get_llm_provider())
+
+
+def get_llm_failover_providers() -> List[LLMProvider]:
+    """Returns the selected provider followed by the configured fallbacks."""
+    llm_providers = [get_llm_provider()]
+    for value in (get_llm_failover_providers_env() or "").split(","):
+        value = value.strip().lower()
+        if not value:
+            continue
+        try:
+            llm_provider = LLMProvider(value)
+        except ValueError:
+            print(f"Ignoring invalid failover LLM provider: {value}")
+            continue
+        if llm_provider not in llm_providers:
+            llm_providers.append(llm_provider)
+    return llm_providers
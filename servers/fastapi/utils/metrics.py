@@ -0,0 +1,105 @@
+import bisect
+import math
+from typing import Dict, List, Sequence, Tuple
+
+LabelValues = Tuple[str, ...]
+
+
+def escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def format_labels(names: Sequence[str], values: Sequence[str], **extra) -> str:
+    pairs = list(zip(names, values)) + list(extra.items())
+    if not pairs:
+        return ""
+    labels = ",".join(f'{name}="{escape_label_value(value)}"' for name, value in pairs)
+    return "{" + labels + "}"
+
+
+def format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Counter:
+    """Monotonic counter with labels, rendered in Prometheus text format."""
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str]):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, *label_values: str, amount: float = 1):
+        key = tuple(label_values)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def get(self, *label_values: str) -> float:
+        return self._values.get(tuple(label_values), 0)
+
+    def render(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} counter",
+        ]
+        for label_values, value in sorted(self._values.items()):
+            labels = format_labels(self.label_names, label_values)
+            lines.append(f"{self.name}{labels} {format_value(value)}")
+        return lines
+
+
+class Histogram:
+    """Histogram with labels and fixed buckets, rendered in Prometheus text format."""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        label_names: Sequence[str],
+        buckets: Sequence[float],
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self.buckets = sorted(buckets)
+        # Label values -> (count per bucket, sum, count)
+        self._values: Dict[LabelValues, Tuple[List[int], float, int]] = {}
+
+    def observe(self, *label_values: str, value: float):
+        key = tuple(label_values)
+        bucket_counts, total, count = self._values.get(
+            key, ([0] * len(self.buckets), 0.0, 0)
+        )
+        index = bisect.bisect_left(self.buckets, value)
+        if index < len(bucket_counts):
+            bucket_counts[index] += 1
+        self._values[key] = (bucket_counts, total + value, count + 1)
+
+    def get_count(self, *label_values: str) -> int:
+        return self._values.get(tuple(label_values), ([], 0.0, 0))[2]
+
+    def render(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} histogram",
+        ]
+        for label_values, (bucket_counts, total, count) in sorted(
+            self._values.items()
+        ):
+            cumulative = 0
+            for bucket, bucket_count in zip(self.buckets, bucket_counts):
+                cumulative += bucket_count
+                labels = format_labels(
+                    self.label_names, label_values, le=format_value(bucket)
+                )
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = format_labels(self.label_names, label_values, le="+Inf")
+            lines.append(f"{self.name}_bucket{labels} {count}")
+            labels = format_labels(self.label_names, label_values)
+            lines.append(f"{self.name}_sum{labels} {format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
@@ -1,9 +1,20 @@
+from constants.presentation import (
+    DEFAULT_ASSET_FETCH_CONCURRENCY,
+    DEFAULT_SLIDE_GENERATION_CONCURRENCY,
+    DEFAULT_SLIDES_PER_LLM_CALL,
+)
 from models.presentation_layout import PresentationLayoutModel
 from models.presentation_outline_model import PresentationOutlineModel
 import re
 from typing import List
 
 from models.presentation_structure_model import PresentationStructureModel
+from utils.get_env import (
+    get_asset_fetch_concurrency_env,
+    get_slide_generation_concurrency_env,
+    get_slides_per_llm_call_env,
+)
+from utils.parsers import parse_int_or_none
 
 
 def get_presentation_title_from_outlines(
@@ -80,3 +91,24 @@ def select_toc_or_list_slide_layout_index(
         return toc_index
 
     return find_slide_layout_index_by_regex(layout, list_patterns)
+
+
+def get_slide_generation_concurrency() -> int:
+    concurrency = parse_int_or_none(get_slide_generation_concurrency_env())
+    if not concurrency or concurrency < 1:
+        return DEFAULT_SLIDE_GENERATION_CONCURRENCY
+    return concurrency
+
+
+def get_asset_fetch_concurrency() -> int:
+    concurrency = parse_int_or_none(get_asset_fetch_concurrency_env())
+    if not concurrency or concurrency < 1:
+        return DEFAULT_ASSET_FETCH_CONCURRENCY
+    return concurrency
+
+
+def get_slides_per_llm_call() -> int:
+    slides_per_call = parse_int_or_none(get_slides_per_llm_call_env())
+    if not slides_per_call or slides_per_call < 1:
+        return DEFAULT_SLIDES_PER_LLM_CALL
+    return slides_per_call
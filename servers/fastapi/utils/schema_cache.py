@@ -0,0 +1,98 @@
+import hashlib
+import json
+from copy import deepcopy
+from typing import Callable, Dict, Tuple
+
+from models.presentation_layout import SlideLayoutModel
+from utils.schema_utils import (
+    add_field_in_schema,
+    ensure_strict_json_schema,
+    flatten_json_schema,
+    remove_fields_from_schema,
+)
+
+# Compiled schemas are shared between calls and must not be mutated
+MAX_COMPILED_SCHEMAS = 1024
+_compiled_schemas: Dict[Tuple, dict] = {}
+# Schema object id -> (schema, hash), the schema is kept so its id is not reused
+_schema_hashes: Dict[int, Tuple[dict, str]] = {}
+
+
+def get_schema_hash(schema: dict) -> str:
+    """
+    Returns the content hash of the schema, computed once per schema object,
+    so schemas must not be mutated once they are hashed.
+    """
+    entry = _schema_hashes.get(id(schema))
+    if entry is None or entry[0] is not schema:
+        if len(_schema_hashes) >= MAX_COMPILED_SCHEMAS:
+            _schema_hashes.clear()
+        schema_hash = hashlib.sha256(
+            json.dumps(schema, sort_keys=True).encode()
+        ).hexdigest()
+        entry = (schema, schema_hash)
+        _schema_hashes[id(schema)] = entry
+    return entry[1]
+
+
+def _get_or_compile(key: Tuple, compile: Callable[[], dict]) -> dict:
+    schema = _compiled_schemas.get(key)
+    if schema is None:
+        if len(_compiled_schemas) >= MAX_COMPILED_SCHEMAS:
+            _compiled_schemas.clear()
+        schema = compile()
+        _compiled_schemas[key] = schema
+    return schema
+
+
+def _compile_slide_response_schema(slide_layout: SlideLayoutModel) -> dict:
+    response_schema = remove_fields_from_schema(
+        slide_layout.json_schema, ["__image_url__", "__icon_url__"]
+    )
+    return add_field_in_schema(
+        response_schema,
+        {
+            "__speaker_note__": {
+                "type": "string",
+                "minLength": 100,
+                "maxLength": 250,
+                "description": "Speaker note for the slide",
+            }
+        },
+        True,
+    )
+
+
+def get_slide_response_schema(
+    slide_layout: SlideLayoutModel, flatten: bool = False
+) -> dict:
+    """
+    Returns the response schema of the slide layout, without asset urls and with
+    a required speaker note. Cached by layout id and schema hash, which is only
+    computed once per layout schema object.
+    """
+    key = (
+        "slide",
+        slide_layout.id,
+        get_schema_hash(slide_layout.json_schema),
+        flatten,
+    )
+    if flatten:
+        return _get_or_compile(
+            key,
+            lambda: flatten_json_schema(get_slide_response_schema(slide_layout)),
+        )
+    return _get_or_compile(key, lambda: _compile_slide_response_schema(slide_layout))
+
+
+def get_strict_json_schema(schema: dict) -> dict:
+    """
+    Returns the strict version of the schema. Inputs are usually schemas cached
+    already, which are looked up by identity before their content is hashed.
+    """
+
+    def compile():
+        strict_schema = deepcopy(schema)
+        return ensure_strict_json_schema(strict_schema, path=(), root=strict_schema)
+
+    return _get_or_compile(("strict", get_schema_hash(schema)), compile)
@@ -281,6 +281,64 @@ def flatten_json_schema(schema: dict) -> dict:
     return result
 
 
+_json_schema_types = {
+    "object": dict,
+    "array": list,
+    "string": str,
+    "integer": int,
+    "number": (int, float),
+    "boolean": bool,
+    "null": type(None),
+}
+
+
+# Checks types, required properties, item counts and enums of a flattened schema
+# String lengths are not checked, as models often go slightly over them
+def is_valid_for_schema(data: Any, schema: dict) -> bool:
+    if not isinstance(schema, dict):
+        return True
+
+    for key in ("anyOf", "oneOf"):
+        if key in schema:
+            return any(is_valid_for_schema(data, each) for each in schema[key])
+    if "allOf" in schema:
+        return all(is_valid_for_schema(data, each) for each in schema["allOf"])
+
+    if "enum" in schema and data not in schema["enum"]:
+        return False
+
+    schema_type = schema.get("type")
+    if schema_type:
+        types = schema_type if isinstance(schema_type, list) else [schema_type]
+        if not any(
+            isinstance(data, _json_schema_types[each])
+            and not (each in ("integer", "number") and isinstance(data, bool))
+            for each in types
+            if each in _json_schema_types
+        ):
+            return False
+
+    if isinstance(data, dict):
+        if any(field not in data for field in schema.get("required", [])):
+            return False
+        properties = schema.get("properties", {})
+        return all(
+            is_valid_for_schema(value, properties[key])
+            for key, value in data.items()
+            if key in properties
+        )
+
+    if isinstance(data, list):
+        if len(data) < schema.get("minItems", 0):
+            return False
+        if "maxItems" in schema and len(data) > schema["maxItems"]:
+            return False
+        items = schema.get("items")
+        return all(is_valid_for_schema(each, items) for each in data)
+
+    return True
+
+
 def remove_titles_from_schema(schema: dict) -> dict[str, Any]:
 
     def _strip_titles(node: Any) -> Any: